@@ -0,0 +1,52 @@
+"""Composite indexes for run history and downstream trigger lookups
+
+Revision ID: 041_pipeline_runs_composite_index
+Revises: 040_add_user_last_login
+Create Date: 2026-10-17
+
+- pipeline_runs: (pipeline_name, started_at DESC) deckt den Einzelindex auf
+  pipeline_name als Präfix ab; der Einzelindex (aus create_all) entfällt.
+  Der Composite-Index existiert bereits, wenn Migration 014 gelaufen ist.
+- downstream_triggers: (upstream_pipeline, enabled) ersetzt den Einzelindex
+  auf upstream_pipeline.
+"""
+from alembic import op
+
+revision = "041_pipeline_runs_composite_index"
+down_revision = "040_add_user_last_login"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_pipeline_runs_pipeline_name_started_at",
+        "pipeline_runs",
+        ["pipeline_name", "started_at"],
+        postgresql_ops={"started_at": "DESC"},
+        if_not_exists=True,
+    )
+    op.drop_index("ix_pipeline_runs_pipeline_name", table_name="pipeline_runs", if_exists=True)
+    op.create_index(
+        "ix_downstream_triggers_upstream_pipeline_enabled",
+        "downstream_triggers",
+        ["upstream_pipeline", "enabled"],
+    )
+    op.drop_index(
+        "ix_downstream_triggers_upstream_pipeline",
+        table_name="downstream_triggers",
+        if_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_downstream_triggers_upstream_pipeline",
+        "downstream_triggers",
+        ["upstream_pipeline"],
+    )
+    op.drop_index(
+        "ix_downstream_triggers_upstream_pipeline_enabled",
+        table_name="downstream_triggers",
+    )
+    op.create_index("ix_pipeline_runs_pipeline_name", "pipeline_runs", ["pipeline_name"])
@@ -0,0 +1,33 @@
+"""Drop redundant index on pipeline_daily_stats
+
+Revision ID: 042_drop_redundant_daily_stats_index
+Revises: 041_pipeline_runs_composite_index
+Create Date: 2026-10-17
+
+ix_pipeline_daily_stats_pipeline_name_date (Migration 025) deckt exakt dieselben
+Spalten wie der Primärschlüssel (pipeline_name, day) ab und wird bei jedem
+Run-Ende nur zusätzlich mitgeschrieben.
+"""
+from alembic import op
+
+revision = "042_drop_redundant_daily_stats_index"
+down_revision = "041_pipeline_runs_composite_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index(
+        "ix_pipeline_daily_stats_pipeline_name_date",
+        table_name="pipeline_daily_stats",
+        if_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_pipeline_daily_stats_pipeline_name_date",
+        "pipeline_daily_stats",
+        ["pipeline_name", "day"],
+        unique=False,
+    )
@@ -0,0 +1,28 @@
+"""Add expires_at indexes on sessions and ephemeral_tokens
+
+Revision ID: 043_add_expires_at_indexes
+Revises: 042_drop_redundant_daily_stats_index
+Create Date: 2026-10-17
+
+cleanup_expired_sessions / cleanup_expired_ephemeral_tokens filtern auf
+expires_at <= now; ohne Index ist das ein Full-Table-Scan über alle Sessions.
+expires_at ist NOT NULL, ein Partial-Index brächte daher nichts.
+"""
+from alembic import op
+
+revision = "043_add_expires_at_indexes"
+down_revision = "042_drop_redundant_daily_stats_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_sessions_expires_at", "sessions", ["expires_at"], if_not_exists=True)
+    op.create_index(
+        "ix_ephemeral_tokens_expires_at", "ephemeral_tokens", ["expires_at"], if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ephemeral_tokens_expires_at", table_name="ephemeral_tokens")
+    op.drop_index("ix_sessions_expires_at", table_name="sessions")
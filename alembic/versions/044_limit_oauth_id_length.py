@@ -0,0 +1,47 @@
+"""Limit OAuth ID columns on users to VARCHAR(255)
+
+Revision ID: 044_limit_oauth_id_length
+Revises: 043_add_expires_at_indexes
+Create Date: 2026-10-17
+
+microsoft_id, github_id, google_id und custom_oauth_id sind Login-Lookup-Spalten
+mit Unique-Index. OIDC begrenzt "sub" auf 255 Zeichen. SQLite ignoriert
+VARCHAR-Längen; dort wird nichts geändert.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "044_limit_oauth_id_length"
+down_revision = "043_add_expires_at_indexes"
+branch_labels = None
+depends_on = None
+
+_OAUTH_ID_COLUMNS = ("microsoft_id", "github_id", "google_id", "custom_oauth_id")
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name == "sqlite":
+        return
+    for column in _OAUTH_ID_COLUMNS:
+        op.alter_column(
+            "users",
+            column,
+            existing_type=sa.String(),
+            type_=sa.String(255),
+            existing_nullable=True,
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name == "sqlite":
+        return
+    for column in _OAUTH_ID_COLUMNS:
+        op.alter_column(
+            "users",
+            column,
+            existing_type=sa.String(255),
+            type_=sa.String(),
+            existing_nullable=True,
+        )
@@ -0,0 +1,54 @@
+"""Store SHA-256 digest of session JWTs instead of the raw token
+
+Revision ID: 045_hash_session_tokens
+Revises: 044_limit_oauth_id_length
+Create Date: 2026-10-17
+
+sessions.token (volles JWT, mehrere hundert Zeichen) wird durch token_hash
+(SHA-256 hex, 64 Zeichen) ersetzt. Bestehende Sessions werden umgerechnet und
+bleiben gültig. Downgrade kann die Tokens nicht wiederherstellen und löscht
+daher alle Sessions (Nutzer melden sich neu an).
+"""
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "045_hash_session_tokens"
+down_revision = "044_limit_oauth_id_length"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("sessions", sa.Column("token_hash", sa.String(64), nullable=True))
+
+    conn = op.get_bind()
+    sessions = sa.table(
+        "sessions",
+        sa.column("id", sa.String()),
+        sa.column("token", sa.String()),
+        sa.column("token_hash", sa.String()),
+    )
+    rows = conn.execute(sa.select(sessions.c.id, sessions.c.token)).fetchall()
+    for row in rows:
+        conn.execute(
+            sessions.update()
+            .where(sessions.c.id == row.id)
+            .values(token_hash=hashlib.sha256(row.token.encode("utf-8")).hexdigest())
+        )
+
+    op.drop_index("ix_sessions_token", table_name="sessions", if_exists=True)
+    with op.batch_alter_table("sessions", schema=None) as batch_op:
+        batch_op.drop_column("token")
+        batch_op.alter_column("token_hash", existing_type=sa.String(64), nullable=False)
+        batch_op.create_index("ix_sessions_token_hash", ["token_hash"], unique=True)
+
+
+def downgrade() -> None:
+    op.execute(sa.text("DELETE FROM sessions"))
+    with op.batch_alter_table("sessions", schema=None) as batch_op:
+        batch_op.drop_index("ix_sessions_token_hash")
+        batch_op.drop_column("token_hash")
+        batch_op.add_column(sa.Column("token", sa.String(), nullable=False))
+        batch_op.create_index("ix_sessions_token", ["token"], unique=True)
@@ -0,0 +1,32 @@
+"""Enforce id = 1 on the settings singleton tables
+
+Revision ID: 046_singleton_check_constraints
+Revises: 045_hash_session_tokens
+Create Date: 2026-10-17
+
+system_settings und orchestrator_settings sind Singletons (id=1), bisher nur
+per Konvention. Der CHECK-Constraint verhindert zusätzliche Zeilen auf DB-Ebene.
+Eventuell vorhandene Zeilen mit id != 1 werden vorher entfernt (die Anwendung
+liest ausschließlich id=1).
+"""
+from alembic import op
+
+revision = "046_singleton_check_constraints"
+down_revision = "045_hash_session_tokens"
+branch_labels = None
+depends_on = None
+
+_TABLES = ("system_settings", "orchestrator_settings")
+
+
+def upgrade() -> None:
+    for table in _TABLES:
+        op.execute(f"DELETE FROM {table} WHERE id <> 1")
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.create_check_constraint(f"ck_{table}_singleton", "id = 1")
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_constraint(f"ck_{table}_singleton", type_="check")
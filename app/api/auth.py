@@ -50,7 +50,7 @@ from app.core.config import config
 from app.core.database import get_session
 from app.core.timeutils import to_utc_iso
 from app.services.audit import log_audit
-from app.services.system_settings import get_system_settings
+from app.services.system_settings import get_system_settings_cached
 from app.middleware.rate_limiting import limiter
 from app.models import User
 
@@ -256,7 +256,7 @@ def _auth_providers_public(session: Session) -> dict[str, Any]:
     db_logo = None
     show_unconfigured_oauth_on_login = True
     try:
-        ss = get_system_settings(session)
+        ss = get_system_settings_cached(session)
         db_logo = _safe_public_url(getattr(ss, "login_branding_logo_url", None))
         show_unconfigured_oauth_on_login = bool(
             getattr(ss, "show_unconfigured_oauth_on_login", True)
@@ -733,7 +733,7 @@ async def get_current_user_info(
     role_val = current_user.role.value if hasattr(current_user, "role") and current_user.role else "readonly"
     is_setup_completed = False
     try:
-        ss = get_system_settings(session)
+        ss = get_system_settings_cached(session)
         is_setup_completed = ss.is_setup_completed
     except Exception:
         pass
@@ -539,9 +539,21 @@ async def get_pipeline_runs(
             detail=f"Pipeline nicht gefunden: {name}"
         )
     
-    # Runs aus DB abrufen
+    # Nur die benötigten Spalten als Row-Tupel laden (keine ORM-Instanzen,
+    # keine JSON-Spalten)
     stmt = (
-        select(PipelineRun)
+        select(
+            PipelineRun.id,
+            PipelineRun.pipeline_name,
+            PipelineRun.status,
+            PipelineRun.started_at,
+            PipelineRun.finished_at,
+            PipelineRun.exit_code,
+            PipelineRun.log_file,
+            PipelineRun.metrics_file,
+            PipelineRun.git_sha,
+            PipelineRun.git_branch,
+        )
         .where(PipelineRun.pipeline_name == name)
         .order_by(PipelineRun.started_at.desc())
         .limit(limit)
@@ -19,6 +19,7 @@ from app.executor import cancel_run, check_container_health, run_pipeline
 from app.auth import get_current_user, require_write
 from app.schemas.runs import RunsResponse
 from app.services.audit import log_audit
+from app.services.cell_outputs import inline_cell_outputs
 from app.middleware.rate_limiting import limiter
 
 _SAFE_ENV_PREFIX = "_fastflow_"
@@ -157,7 +158,26 @@ async def get_runs(
     if end_dt is not None:
         filters.append(PipelineRun.started_at <= end_dt)
 
-    base_stmt = select(PipelineRun).where(*filters) if filters else select(PipelineRun)
+    # Nur die benötigten Spalten als Row-Tupel laden (keine ORM-Instanzen;
+    # parameters wird in der Liste nicht ausgegeben)
+    base_stmt = select(
+        PipelineRun.id,
+        PipelineRun.pipeline_name,
+        PipelineRun.status,
+        PipelineRun.started_at,
+        PipelineRun.finished_at,
+        PipelineRun.exit_code,
+        PipelineRun.log_file,
+        PipelineRun.metrics_file,
+        PipelineRun.uv_version,
+        PipelineRun.setup_duration,
+        PipelineRun.env_vars,
+        PipelineRun.git_sha,
+        PipelineRun.git_branch,
+        PipelineRun.git_commit_message,
+    )
+    if filters:
+        base_stmt = base_stmt.where(*filters)
     total = session.exec(select(func.count(PipelineRun.id)).where(*filters) if filters else select(func.count(PipelineRun.id))).one()
     
     # Query für Runs mit Pagination
@@ -249,7 +269,7 @@ async def get_run_details(
             "status": c.status,
             "stdout": c.stdout or "",
             "stderr": c.stderr or "",
-            "outputs": c.outputs,
+            "outputs": inline_cell_outputs(c.outputs),
         }
         for c in cell_logs
     ]
@@ -306,7 +326,7 @@ async def get_run_cells(
             "status": c.status,
             "stdout": c.stdout or "",
             "stderr": c.stderr or "",
-            "outputs": c.outputs,
+            "outputs": inline_cell_outputs(c.outputs),
         }
         for c in cells
     ]
@@ -33,7 +33,11 @@ from app.services.notifications import send_email_notification, send_teams_notif
 from app.executor import _get_docker_client
 from app.executor.kubernetes_backend import get_kubernetes_system_metrics
 from app.auth import require_admin, require_write, get_current_user
-from app.services.system_settings import get_system_settings
+from app.services.system_settings import (
+    get_system_settings,
+    get_system_settings_cached,
+    invalidate_system_settings_cache,
+)
 from app.core.errors import get_500_detail
 from app.services.orchestrator_settings import (
     get_orchestrator_settings_or_default,
@@ -390,7 +394,7 @@ async def get_ui_display_settings(
     damit Login- und Fehlerseiten dieselben Werte wie die eingeloggte App nutzen.
     """
     try:
-        ss = get_system_settings(session)
+        ss = get_system_settings_cached(session)
         tz1 = getattr(ss, "ui_header_timezone_1", None) or "UTC"
         tz2 = getattr(ss, "ui_header_timezone_2", None) or "Europe/Berlin"
         if tz1 not in ALLOWED_UI_HEADER_TIMEZONES:
@@ -752,7 +756,7 @@ async def get_system_settings_endpoint(
     Gibt System-Konfiguration zurück.
     Nur für Admins.
     """
-    ss = get_system_settings(session)
+    ss = get_system_settings_cached(session)
     return SystemSettingsResponse(
         is_setup_completed=ss.is_setup_completed,
         dependency_audit_enabled=getattr(ss, "dependency_audit_enabled", True),
@@ -839,6 +843,7 @@ async def update_system_settings_endpoint(
     session.add(ss)
     session.commit()
     session.refresh(ss)
+    invalidate_system_settings_cache()
     system_after = _system_settings_audit_snapshot(ss)
     system_audit_details = _build_system_settings_audit_details(system_before, system_after)
     if system_audit_details:
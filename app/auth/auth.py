@@ -11,6 +11,7 @@ Docker-Socket-Missbrauch (Docker-Socket = Root-Zugriff auf Host).
 UI darf NIEMALS ohne Login erreichbar sein.
 """
 
+import hashlib
 import logging
 import secrets
 from datetime import datetime, timedelta, timezone
@@ -207,6 +208,18 @@ def verify_token(token: str) -> Optional[str]:
         return None
 
 
+def digest_session_token(token: str) -> str:
+    """
+    Digest eines Session-JWT für sessions.token_hash.
+
+    Das JWT ist signiert und hochentropisch; ein einfacher SHA-256 genügt als
+    nicht umkehrbarer Lookup-Schlüssel (wie bei NotificationApiKey.key_hash).
+    Fixe 64 Zeichen statt mehrerer hundert halten den Unique-Index schmal, und
+    ein Datenbank-Leak enthält keine verwendbaren Tokens.
+    """
+    return hashlib.sha256(token.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
 def create_session(session: Session, user: User, token: str) -> SessionModel:
     """
     Erstellt eine Session in der Datenbank.
@@ -222,7 +235,7 @@ def create_session(session: Session, user: User, token: str) -> SessionModel:
     expires_at = datetime.now(timezone.utc) + timedelta(hours=config.JWT_EXPIRATION_HOURS)
     
     db_session = SessionModel(
-        token=token,
+        token_hash=digest_session_token(token),
         user_id=user.id,
         expires_at=expires_at
     )
@@ -284,7 +297,7 @@ def get_session_by_token(session: Session, token: str) -> Optional[SessionModel]
         Optional[SessionModel]: Session wenn gefunden und gültig, sonst None
     """
     statement = select(SessionModel).where(
-        SessionModel.token == token,
+        SessionModel.token_hash == digest_session_token(token),
         SessionModel.expires_at > datetime.now(timezone.utc)
     )
     return retry_on_sqlite_io(
@@ -300,7 +313,7 @@ def delete_session(session: Session, token: str) -> None:
         session: Datenbank-Session
         token: JWT-Token
     """
-    statement = select(SessionModel).where(SessionModel.token == token)
+    statement = select(SessionModel).where(SessionModel.token_hash == digest_session_token(token))
     db_session = retry_on_sqlite_io(
         lambda: session.exec(statement).first(), session=session
     )
@@ -383,7 +396,7 @@ def cleanup_expired_ephemeral_tokens(session: Session) -> None:
         logger.info(f"{len(expired_tokens)} abgelaufene Ephemeral-Tokens bereinigt")
 
 
-async def get_current_user(
+def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     db_session: Session = Depends(get_session)
 ) -> User:
@@ -393,6 +406,10 @@ async def get_current_user(
     Verifiziert JWT-Token und gibt den aktuellen Benutzer zurück.
     Muss als Dependency in Protected Routes verwendet werden.
 
+    Bewusst synchron: Session- und User-Lookup sind blockierende DB-Zugriffe
+    (inkl. time.sleep in retry_on_sqlite_io). FastAPI führt sync-Dependencies im
+    Threadpool aus, sodass der Event-Loop bei jedem API-Request frei bleibt.
+
     Das Token wird ausschließlich über den Authorization-Header übergeben. Der früher
     unterstützte Query-Parameter "token" wurde entfernt, da volle Session-JWTs in URLs
     in Server-/Proxy-Logs, Browser-History und Referrer landen. Flows ohne
@@ -532,6 +532,14 @@ class Config:
     Beispiel: "admin@example.com,team@example.com"
     """
     
+    EMAIL_HTML_ENABLED: bool = os.getenv("EMAIL_HTML_ENABLED", "true").lower() == "true"
+    """
+    Run-Fehler-E-Mails zusätzlich als HTML (multipart/alternative) versenden.
+    
+    Wenn False: nur der Text-Teil als einfache text/plain-Mail (kleiner,
+    kein HTML-Rendering). Standard: true.
+    """
+    
     # Microsoft Teams-Benachrichtigungen
     TEAMS_ENABLED: bool = os.getenv("TEAMS_ENABLED", "false").lower() == "true"
     """
@@ -619,6 +627,41 @@ class Config:
     Standard: 5.0. Requests über diesem Wert werden mit WARNING-Level geloggt.
     """
 
+    METRICS_LOG_SCAN_INTERVAL_SECONDS: float = float(
+        os.getenv("METRICS_LOG_SCAN_INTERVAL_SECONDS", "60")
+    )
+    """
+    Mindestabstand in Sekunden zwischen zwei Verzeichnis-Scans von LOGS_DIR für
+    die Prometheus-Log-Metriken. Dazwischen liefert /metrics die zuletzt ermittelten
+    Werte (der Walk ist O(Anzahl Dateien)). 0 = bei jedem Scrape neu scannen.
+    Standard: 60.
+    """
+
+    METRICS_DOCKER_ERROR_BACKOFF_SECONDS: float = float(
+        os.getenv("METRICS_DOCKER_ERROR_BACKOFF_SECONDS", "30")
+    )
+    """
+    Wartezeit in Sekunden, bevor /metrics nach einem fehlgeschlagenen Docker-Ping erneut
+    den Daemon abfragt. Verdoppelt sich bei jedem weiteren Fehler (max. 5 Minuten),
+    bis Docker wieder erreichbar ist. 0 = bei jedem Scrape erneut versuchen. Standard: 30.
+    """
+
+    METRICS_MAX_PIPELINE_LABELS: int = int(os.getenv("METRICS_MAX_PIPELINE_LABELS", "500"))
+    """
+    Maximale Anzahl unterschiedlicher pipeline_name-Labelwerte in den Prometheus-Metriken
+    für Pipeline-Runs. Weitere Pipelines werden unter pipeline_name="_other" zusammengefasst,
+    damit /metrics bei vielen (oder generierten) Pipeline-Namen nicht unbegrenzt wächst.
+    Standard: 500.
+    """
+
+    METRICS_CACHE_TTL_SECONDS: float = float(os.getenv("METRICS_CACHE_TTL_SECONDS", "0"))
+    """
+    Wenn > 0: /metrics serialisiert die Registry höchstens einmal pro TTL und liefert
+    dazwischen die gecachte Ausgabe mit ETag (If-None-Match -> 304 Not Modified).
+    Sinnvoll, wenn mehrere Prometheus-Instanzen oder kurze Scrape-Intervalle dieselben
+    Werte abfragen. 0 = bei jedem Scrape neu erzeugen und streamen. Standard: 0.
+    """
+
     MAX_REQUEST_BODY_MB: Optional[int] = (
         int(os.getenv("MAX_REQUEST_BODY_MB"))
         if os.getenv("MAX_REQUEST_BODY_MB")
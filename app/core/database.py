@@ -22,6 +22,7 @@ import sqlalchemy.exc
 from sqlalchemy import event
 from sqlmodel import SQLModel, Session, create_engine, text
 
+from app.core import json_codec
 from app.core.config import config
 from app.models import (
     Invitation,
@@ -55,12 +56,20 @@ if database_url.startswith("sqlite"):
         database_url,
         connect_args=connect_args,
         echo=False,
+        json_serializer=json_codec.dumps,
+        json_deserializer=json_codec.loads,
     )
 
     @event.listens_for(engine, "connect")
     def _set_sqlite_pragma(dbapi_conn: Any, connection_record: Any) -> None:
         cursor = dbapi_conn.cursor()
         cursor.execute("PRAGMA busy_timeout=5000")
+        # Im WAL-Mode (siehe init_db) ist synchronous=NORMAL sicher gegen Korruption
+        # und spart das fsync pro Commit (nur der Checkpoint synct)
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        # Temporäre Tabellen/Sortierungen im RAM, 32 MB Page-Cache pro Connection
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-32768")
         cursor.close()
 else:
     engine = create_engine(
@@ -70,6 +79,8 @@ else:
         max_overflow=20,
         pool_pre_ping=True,
         pool_recycle=300,
+        json_serializer=json_codec.dumps,
+        json_deserializer=json_codec.loads,
     )
 
 
@@ -0,0 +1,47 @@
+"""
+JSON-Codec für Datenbank-Spalten und Payloads.
+
+Nutzt orjson (deutlich schneller als die Standardbibliothek, v.a. bei großen
+env_vars/parameters-Dicts und Notebook-Outputs mit Base64-Bildern). Ist orjson
+nicht installiert, wird auf das json-Modul der Standardbibliothek zurückgefallen.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ist in requirements.txt gepinnt
+    orjson = None
+
+# Nicht-String-Keys wie die Standardbibliothek zu Strings machen (json.dumps({1: "a"}))
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+
+def dumps(value: Any) -> str:
+    """
+    Serialisiert einen Wert als kompakten JSON-String.
+
+    Args:
+        value: JSON-serialisierbarer Wert
+
+    Returns:
+        str: JSON-Text (SQLAlchemy erwartet vom json_serializer einen str)
+    """
+    if orjson is not None:
+        return orjson.dumps(value, option=_ORJSON_OPTIONS).decode("utf-8")
+    return json.dumps(value, separators=(",", ":"))
+
+
+def dumps_bytes(value: Any) -> bytes:
+    """Wie dumps, liefert aber direkt UTF-8-Bytes (z.B. für HTTP-Request-Bodies)."""
+    if orjson is not None:
+        return orjson.dumps(value, option=_ORJSON_OPTIONS)
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def loads(value: Union[str, bytes, bytearray]) -> Any:
+    """Deserialisiert JSON-Text oder -Bytes."""
+    if orjson is not None:
+        return orjson.loads(value)
+    return json.loads(value)
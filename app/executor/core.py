@@ -31,7 +31,7 @@ import time
 from datetime import date, datetime, timezone
 from pathlib import Path
 from typing import Dict, Optional, List, Any, AsyncGenerator
-from uuid import UUID, uuid4
+from uuid import UUID
 from concurrent.futures import ThreadPoolExecutor
 
 import docker
@@ -42,7 +42,8 @@ from sqlmodel import Session, select, update
 from app.core.config import config
 from app.metrics_prometheus import track_run_started, track_run_finished
 from app.resilience import circuit_docker, CircuitBreakerOpenError
-from app.models import Pipeline, PipelineDailyStat, PipelineRun, RunStatus, RunCellLog
+from app.models import Pipeline, PipelineDailyStat, PipelineRun, RunStatus, RunCellLog, uuid7
+from app.services.cell_outputs import store_cell_image
 from app.services.pipeline_discovery import DiscoveredPipeline, get_pipeline
 from app.services.downstream_triggers import get_downstream_pipelines_to_trigger
 from app.resilience.retry_strategy import wait_for_retry
@@ -380,7 +381,7 @@ async def run_pipeline(
     
     # Concurrency-Limit prüfen (Docker: laufende Container; K8s: RUNNING-Runs in DB)
     # Für Docker: Platzhalter sofort registrieren, um Race Conditions zu verhindern.
-    run_id = uuid4()
+    run_id = uuid7()
     _placeholder_registered = False
     async with _concurrency_lock:
         if config.PIPELINE_EXECUTOR == "kubernetes":
@@ -748,7 +749,7 @@ async def _run_container_task(
         
         # Prometheus-Metriken: Run gestartet
         try:
-            track_run_started(pipeline.name)
+            track_run_started(pipeline.name, run_id)
         except Exception as e:
             logger.debug(f"Prometheus track_run_started fehlgeschlagen: {e}")
         
@@ -952,13 +953,13 @@ async def _run_container_task(
         if exit_code_value == 0:
             # Prometheus-Metriken: Run erfolgreich beendet
             try:
-                track_run_finished(pipeline.name, "completed", duration_seconds)
+                track_run_finished(pipeline.name, "completed", duration_seconds, run_id)
             except Exception as e:
                 logger.debug(f"Prometheus track_run_finished fehlgeschlagen: {e}")
         else:
             # Prometheus-Metriken: Run fehlgeschlagen
             try:
-                track_run_finished(pipeline.name, "failed", duration_seconds)
+                track_run_finished(pipeline.name, "failed", duration_seconds, run_id)
             except Exception as e:
                 logger.debug(f"Prometheus track_run_finished fehlgeschlagen: {e}")
         
@@ -1052,7 +1053,7 @@ async def _run_container_task(
             # Prometheus-Metriken: Run fehlgeschlagen (Docker-Fehler)
             duration_seconds = (run.finished_at - run.started_at).total_seconds() if run.finished_at and run.started_at else 0.0
             try:
-                track_run_finished(pipeline.name, "failed", duration_seconds)
+                track_run_finished(pipeline.name, "failed", duration_seconds, run_id)
             except Exception as prom_err:
                 logger.debug(f"Prometheus track_run_finished fehlgeschlagen: {prom_err}")
             # Benachrichtigungen und Dauerläufer-Restart
@@ -1085,7 +1086,7 @@ async def _run_container_task(
             # Prometheus-Metriken: Run fehlgeschlagen (Exception)
             duration_seconds = (run.finished_at - run.started_at).total_seconds() if run.finished_at and run.started_at else 0.0
             try:
-                track_run_finished(run.pipeline_name, "failed", duration_seconds)
+                track_run_finished(run.pipeline_name, "failed", duration_seconds, run_id)
             except Exception as prom_err:
                 logger.debug(f"Prometheus track_run_finished fehlgeschlagen: {prom_err}")
             
@@ -1306,82 +1307,44 @@ def _parse_and_persist_cell_line(run_id: UUID, line: str) -> None:
     Parst eine FASTFLOW_CELL_*-Zeile vom Notebook-Runner und schreibt in RunCellLog.
     Wird synchron im ThreadPool ausgeführt (DB-Zugriff).
     """
-    import base64
+    _persist_cell_lines(run_id, [line])
+
+
+def _persist_cell_lines(run_id: UUID, lines: List[str]) -> None:
+    """
+    Persistiert mehrere FASTFLOW_CELL_*-Zeilen in einer Session und einem Commit.
+
+    Zeilen aus demselben Log-Chunk (z. B. viele stdout-Zeilen einer Zelle) kosten
+    so nur eine Transaktion statt einer pro Zeile; session.get trifft nach der
+    ersten Zeile die Identity-Map. Schlägt der Batch-Commit fehl (z. B.
+    OperationalError), werden die Zeilen einzeln nachgezogen, damit eine
+    fehlerhafte Zeile nicht den ganzen Batch verwirft. Wird synchron ausgeführt
+    (ThreadPool bzw. beim Abbruch des Log-Streamings direkt).
+    """
     session_gen = get_session()
     try:
         session = next(session_gen)
     except StopIteration:
         return
     try:
-        if line.startswith(PREFIX_CELL_START):
-            cell_index = int(line[len(PREFIX_CELL_START) :].strip())
-            existing = session.get(RunCellLog, (run_id, cell_index))
-            if existing:
-                existing.status = "RUNNING"
-            else:
-                session.add(
-                    RunCellLog(run_id=run_id, cell_index=cell_index, status="RUNNING")
-                )
-            session.commit()
-            return
-        if line.startswith(PREFIX_CELL_END):
-            rest = line[len(PREFIX_CELL_END) :].strip()
-            parts = rest.split("\t", 2)
-            if len(parts) < 2:
-                return
-            cell_index = int(parts[0])
-            status = parts[1].upper()
-            msg = parts[2].strip() if len(parts) > 2 else ""
-            existing = session.get(RunCellLog, (run_id, cell_index))
-            if not existing:
-                existing = RunCellLog(run_id=run_id, cell_index=cell_index, status=status)
-                session.add(existing)
-                session.flush()
-            else:
-                existing.status = status
-            # Alle Versuche in stderr sammeln (Retries + Final), damit sie in der UI sichtbar sind
-            if status == "RETRYING" and msg:
-                attempt_part = msg.split("\t", 1)
-                attempt_num = attempt_part[0] if attempt_part else "?"
-                err_text = attempt_part[1].strip() if len(attempt_part) > 1 else ""
-                existing.stderr = (existing.stderr or "") + f"--- Retry-Versuch {attempt_num} fehlgeschlagen ---\n{err_text}\n\n"
-            elif status == "FAILED":
-                existing.stderr = (existing.stderr or "") + "--- Endgültig fehlgeschlagen ---\n"
+        try:
+            for line in lines:
+                try:
+                    _apply_cell_line(session, run_id, line)
+                except (ValueError, IndexError) as e:
+                    logger.warning("Fehler beim Parsen einer Zellen-Log-Zeile: %s", e)
             session.commit()
             return
-        if line.startswith(PREFIX_CELL_OUTPUT):
-            rest = line[len(PREFIX_CELL_OUTPUT) :]
-            parts = rest.split("\t", 3)
-            if len(parts) < 3:
-                return
-            cell_index = int(parts[0])
-            stream = parts[1]
-            third = parts[2]
-            payload = parts[3] if len(parts) > 3 else ""
-            existing = session.get(RunCellLog, (run_id, cell_index))
-            if not existing:
-                existing = RunCellLog(run_id=run_id, cell_index=cell_index, status="RUNNING")
-                session.add(existing)
-                session.flush()
-            if stream in ("stdout", "stderr"):
-                encoding = third
-                if encoding == "base64":
-                    try:
-                        payload = base64.b64decode(payload).decode("utf-8")
-                    except Exception:
-                        payload = ""
-                if stream == "stdout":
-                    existing.stdout = (existing.stdout or "") + payload + "\n"
-                else:
-                    existing.stderr = (existing.stderr or "") + payload + "\n"
-            elif stream == "image":
-                mime = third
-                if existing.outputs is None:
-                    existing.outputs = {"images": []}
-                existing.outputs.setdefault("images", []).append({"mime": mime, "data": payload})
-            session.commit()
-    except Exception as e:
-        logger.warning("Fehler beim Parsen/Persistieren einer Zellen-Log-Zeile: %s", e)
+        except Exception as e:
+            session.rollback()
+            logger.warning("Batch-Persistierung der Zellen-Log-Zeilen fehlgeschlagen, einzeln: %s", e)
+        for line in lines:
+            try:
+                _apply_cell_line(session, run_id, line)
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                logger.warning("Fehler beim Parsen/Persistieren einer Zellen-Log-Zeile: %s", e)
     finally:
         try:
             next(session_gen)
@@ -1389,6 +1352,72 @@ def _parse_and_persist_cell_line(run_id: UUID, line: str) -> None:
             pass
 
 
+def _get_or_add_cell_log(session: Session, run_id: UUID, cell_index: int, status: str) -> RunCellLog:
+    existing = session.get(RunCellLog, (run_id, cell_index))
+    if existing is None:
+        existing = RunCellLog(run_id=run_id, cell_index=cell_index, status=status)
+        session.add(existing)
+        session.flush()
+    return existing
+
+
+def _apply_cell_line(session: Session, run_id: UUID, line: str) -> None:
+    """Wendet eine FASTFLOW_CELL_*-Zeile auf RunCellLog an (ohne Commit)."""
+    import base64
+    if line.startswith(PREFIX_CELL_START):
+        cell_index = int(line[len(PREFIX_CELL_START) :].strip())
+        _get_or_add_cell_log(session, run_id, cell_index, "RUNNING").status = "RUNNING"
+        return
+    if line.startswith(PREFIX_CELL_END):
+        rest = line[len(PREFIX_CELL_END) :].strip()
+        parts = rest.split("\t", 2)
+        if len(parts) < 2:
+            return
+        cell_index = int(parts[0])
+        status = parts[1].upper()
+        msg = parts[2].strip() if len(parts) > 2 else ""
+        existing = _get_or_add_cell_log(session, run_id, cell_index, status)
+        existing.status = status
+        # Alle Versuche in stderr sammeln (Retries + Final), damit sie in der UI sichtbar sind
+        if status == "RETRYING" and msg:
+            attempt_part = msg.split("\t", 1)
+            attempt_num = attempt_part[0] if attempt_part else "?"
+            err_text = attempt_part[1].strip() if len(attempt_part) > 1 else ""
+            existing.stderr = (existing.stderr or "") + f"--- Retry-Versuch {attempt_num} fehlgeschlagen ---\n{err_text}\n\n"
+        elif status == "FAILED":
+            existing.stderr = (existing.stderr or "") + "--- Endgültig fehlgeschlagen ---\n"
+        return
+    if line.startswith(PREFIX_CELL_OUTPUT):
+        rest = line[len(PREFIX_CELL_OUTPUT) :]
+        parts = rest.split("\t", 3)
+        if len(parts) < 3:
+            return
+        cell_index = int(parts[0])
+        stream = parts[1]
+        third = parts[2]
+        payload = parts[3] if len(parts) > 3 else ""
+        existing = _get_or_add_cell_log(session, run_id, cell_index, "RUNNING")
+        if stream in ("stdout", "stderr"):
+            encoding = third
+            if encoding == "base64":
+                try:
+                    payload = base64.b64decode(payload).decode("utf-8")
+                except Exception:
+                    payload = ""
+            if stream == "stdout":
+                existing.stdout = (existing.stdout or "") + payload + "\n"
+            else:
+                existing.stderr = (existing.stderr or "") + payload + "\n"
+        elif stream == "image":
+            mime = third
+            images = list((existing.outputs or {}).get("images", []))
+            # Bild als Datei ablegen, in der DB nur das Manifest speichern
+            entry = store_cell_image(run_id, cell_index, len(images), mime, payload)
+            if entry is not None:
+                # Neues Dict zuweisen: In-Place-Änderungen an JSON-Spalten erkennt SQLAlchemy nicht
+                existing.outputs = {**(existing.outputs or {}), "images": images + [entry]}
+
+
 async def _stream_logs(
     container: docker.models.containers.Container,
     log_file_path: Path,
@@ -1408,6 +1437,9 @@ async def _stream_logs(
     """
     import aiofiles
     
+    # Zellen-Protokollzeilen des aktuellen Chunks (Batch-Persistierung); beim Abbruch
+    # mitten im Chunk im finally nachgezogen, damit keine CELL_*-Zeile verloren geht
+    pending_cell_lines: List[str] = []
     try:
         logger.info(f"Starte Log-Streaming für Run {run_id}, Container: {container.id}")
         
@@ -1474,10 +1506,8 @@ async def _stream_logs(
                             or log_line.startswith(PREFIX_CELL_OUTPUT)
                         )
                         if is_cell_protocol:
-                            await asyncio.get_running_loop().run_in_executor(
-                                _executor,
-                                lambda l=log_line: _parse_and_persist_cell_line(run_id, l),
-                            )
+                            # Gesammelt und pro Chunk in einer Transaktion persistiert
+                            pending_cell_lines.append(log_line)
                             # Lesbare Zeile für Log/SSE (Retries etc.); OUTPUT nicht doppelt ausgeben
                             line_to_write = _cell_line_to_readable_log(log_line)
                             if line_to_write is None:
@@ -1522,6 +1552,14 @@ async def _stream_logs(
                                     # Stream kappen (keine weiteren Logs schreiben)
                                     should_break = True
                                     break
+                
+                # Zellen-Zeilen dieses Chunks in einer Transaktion persistieren
+                if pending_cell_lines:
+                    batch, pending_cell_lines = pending_cell_lines, []
+                    await asyncio.get_running_loop().run_in_executor(
+                        _executor,
+                        lambda b=batch: _persist_cell_lines(run_id, b),
+                    )
             
             # Verarbeite verbleibenden Buffer am Ende (letzte unvollständige Zeile)
             if line_buffer and not should_break:
@@ -1556,6 +1594,8 @@ async def _stream_logs(
     except Exception as e:
         logger.error(f"Fehler beim Log-Streaming für Run {run_id}: {e}", exc_info=True)
     finally:
+        if pending_cell_lines:
+            _persist_cell_lines(run_id, pending_cell_lines)
         # Stream explizit schließen
         try:
             if hasattr(log_stream, 'close'):
@@ -1929,27 +1969,25 @@ async def _update_pipeline_stats(
         run_date: Datum des Runs (für persistente Daily-Stats; Kalender bleibt nach Cleanup erhalten)
     """
     try:
-        # Atomare Updates (verhindert Race-Conditions)
-        pipeline = session.get(Pipeline, pipeline_name)
-        if pipeline:
-            # Atomare Zähler-Updates
-            # Wenn triggered_by == "webhook", auch webhook_runs erhöhen
-            update_values = {
-                "total_runs": Pipeline.total_runs + 1,
-                "successful_runs": Pipeline.successful_runs + (1 if success else 0),
-                "failed_runs": Pipeline.failed_runs + (1 if not success else 0)
-            }
-            
-            # Webhook-Statistik aktualisieren
-            if triggered_by == "webhook":
-                update_values["webhook_runs"] = Pipeline.webhook_runs + 1
-            
-            stmt = (
-                update(Pipeline)
-                .where(Pipeline.pipeline_name == pipeline_name)
-                .values(**update_values)
-            )
-            session.execute(stmt)
+        # Atomare Zähler-Updates (verhindert Race-Conditions); ohne vorheriges SELECT:
+        # existiert die Pipeline-Zeile nicht, trifft das UPDATE einfach keine Zeile
+        # Wenn triggered_by == "webhook", auch webhook_runs erhöhen
+        update_values = {
+            "total_runs": Pipeline.total_runs + 1,
+            "successful_runs": Pipeline.successful_runs + (1 if success else 0),
+            "failed_runs": Pipeline.failed_runs + (1 if not success else 0)
+        }
+        
+        # Webhook-Statistik aktualisieren
+        if triggered_by == "webhook":
+            update_values["webhook_runs"] = Pipeline.webhook_runs + 1
+        
+        stmt = (
+            update(Pipeline)
+            .where(Pipeline.pipeline_name == pipeline_name)
+            .values(**update_values)
+        )
+        session.execute(stmt)
 
         # Persistente Daily-Stats (Kalender bleibt nach Log/Run-Cleanup erhalten)
         # Atomares Upsert: verhindert Race-Conditions bei parallelen Runs
@@ -360,7 +360,7 @@ async def run_container_task(
 
         setup_start = time.time()
         try:
-            track_run_started(pipeline.name)
+            track_run_started(pipeline.name, run_id)
         except Exception:
             pass
 
@@ -442,12 +442,12 @@ async def run_container_task(
         duration_seconds = (run.finished_at - run.started_at).total_seconds() if run.finished_at and run.started_at else 0.0
         if exit_code_value == 0:
             try:
-                track_run_finished(pipeline.name, "completed", duration_seconds)
+                track_run_finished(pipeline.name, "completed", duration_seconds, run_id)
             except Exception:
                 pass
         else:
             try:
-                track_run_finished(pipeline.name, "failed", duration_seconds)
+                track_run_finished(pipeline.name, "failed", duration_seconds, run_id)
             except Exception:
                 pass
 
@@ -14,20 +14,31 @@ Metriken:
 Endpunkt: GET /metrics (Prometheus-Scraping-Format)
 """
 
+import hashlib
 import logging
+import os
+import re
+import threading
 import time
-from typing import Callable, Optional
+from functools import lru_cache
+from typing import Callable, Hashable, Iterator, Optional
 
-from prometheus_client import Counter, Gauge, Histogram, Info
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, Info
+from prometheus_client.exposition import generate_latest
 from prometheus_fastapi_instrumentator import Instrumentator, metrics
 from prometheus_fastapi_instrumentator.metrics import Info as MetricsInfo
 from fastapi import FastAPI
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.responses import Response, StreamingResponse
 
 from app.core.config import config
 from app.middleware.rate_limiting import limiter
 
+try:
+    import psutil
+except ImportError:  # pragma: no cover - psutil ist in requirements.txt gepinnt
+    psutil = None
+
 logger = logging.getLogger(__name__)
 
 # ============================================================================
@@ -112,7 +123,7 @@ system_disk_total_bytes = Gauge(
 
 database_size_bytes = Gauge(
     "fastflow_database_size_bytes",
-    "Größe der Datenbank-Datei in Bytes (nur SQLite)",
+    "Größe der Datenbank-Datei inkl. WAL in Bytes (nur SQLite)",
 )
 
 database_connections_active = Gauge(
@@ -162,15 +173,14 @@ def update_system_metrics() -> None:
     Aktualisiert System-Metriken (CPU, RAM, Disk).
     Wird bei jedem /metrics-Request aufgerufen.
     """
+    if psutil is None:
+        logger.warning("psutil nicht verfügbar für System-Metriken")
+        return
     try:
-        import psutil
-
-        # CPU
-        cpu_percent = psutil.cpu_percent(interval=None)  # Non-blocking
-        system_cpu_percent.set(cpu_percent)
-
-        # RAM
+        # CPU (non-blocking) und RAM
+        cpu_percent = psutil.cpu_percent(interval=None)
         mem = psutil.virtual_memory()
+        system_cpu_percent.set(cpu_percent)
         system_memory_percent.set(mem.percent)
         system_memory_used_bytes.set(mem.used)
         system_memory_total_bytes.set(mem.total)
@@ -183,81 +193,218 @@ def update_system_metrics() -> None:
         except Exception as e:
             logger.debug(f"Disk-Metriken nicht verfügbar: {e}")
 
-    except ImportError:
-        logger.warning("psutil nicht verfügbar für System-Metriken")
     except Exception as e:
         logger.warning(f"Fehler beim Aktualisieren der System-Metriken: {e}")
 
 
+# Letzter Stand (mtime_ns, Größe) von fastflow.db und fastflow.db-wal;
+# unverändert -> Gauge wird nicht neu gesetzt
+_db_stat_key: Optional[tuple[int, int, int, int]] = None
+
+
 def update_database_metrics() -> None:
     """
     Aktualisiert Datenbank-Metriken.
+
+    SQLite: Größe von fastflow.db plus WAL-Datei (tatsächlicher Platzbedarf im WAL-Mode),
+    je ein os.stat; die Gauge wird nur bei geänderter mtime/Größe neu gesetzt.
     """
+    global _db_stat_key
     try:
         # SQLite: Dateigröße
         if config.DATABASE_URL is None:  # SQLite
-            db_path = config.DATA_DIR / "fastflow.db"
-            if db_path.exists():
-                database_size_bytes.set(db_path.stat().st_size)
+            db_path = os.path.join(config.DATA_DIR, "fastflow.db")
+            try:
+                db_stat = os.stat(db_path)
+            except FileNotFoundError:
+                return
+            try:
+                wal_stat = os.stat(db_path + "-wal")
+                wal_mtime_ns, wal_size = wal_stat.st_mtime_ns, wal_stat.st_size
+            except FileNotFoundError:
+                wal_mtime_ns, wal_size = 0, 0
+
+            key = (db_stat.st_mtime_ns, db_stat.st_size, wal_mtime_ns, wal_size)
+            if key == _db_stat_key:
+                return
+            _db_stat_key = key
+            database_size_bytes.set(db_stat.st_size + wal_size)
     except Exception as e:
         logger.debug(f"Datenbank-Metriken nicht verfügbar: {e}")
 
 
+# Zeitpunkt (time.monotonic) des letzten LOGS_DIR-Scans; 0.0 = noch nie gescannt
+_log_metrics_scanned_at: float = 0.0
+_log_metrics_lock = threading.Lock()
+
+
+def _scan_log_files(root: str) -> tuple[int, int]:
+    """
+    Zählt *.log-Dateien unterhalb von root und summiert ihre Größe.
+
+    Nutzt os.scandir (stat-Daten aus dem Verzeichniseintrag, keine Path-Objekte).
+    Symlinks werden wie bei Path.rglob nicht verfolgt.
+
+    Returns:
+        Tuple (Anzahl Dateien, Gesamtgröße in Bytes)
+    """
+    total_count = 0
+    total_size = 0
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name.endswith(".log") and entry.is_file(follow_symlinks=False):
+                            total_count += 1
+                            total_size += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+    return total_count, total_size
+
+
 def update_log_metrics() -> None:
     """
     Aktualisiert Log-Storage-Metriken.
+
+    Der Verzeichnis-Walk läuft höchstens alle METRICS_LOG_SCAN_INTERVAL_SECONDS;
+    dazwischen behalten die Gauges ihre zuletzt gesetzten Werte.
     """
+    global _log_metrics_scanned_at
     try:
-        total_count = 0
-        total_size = 0
-
-        if config.LOGS_DIR.exists():
-            for log_file in config.LOGS_DIR.rglob("*.log"):
-                total_count += 1
-                try:
-                    total_size += log_file.stat().st_size
-                except OSError:
-                    pass
-
-        log_files_count.set(total_count)
-        log_files_size_bytes.set(total_size)
+        with _log_metrics_lock:
+            now = time.monotonic()
+            if (
+                _log_metrics_scanned_at
+                and now - _log_metrics_scanned_at < config.METRICS_LOG_SCAN_INTERVAL_SECONDS
+            ):
+                return
+            _log_metrics_scanned_at = now
+
+            total_count, total_size = _scan_log_files(str(config.LOGS_DIR))
+            log_files_count.set(total_count)
+            log_files_size_bytes.set(total_size)
     except Exception as e:
         logger.debug(f"Log-Metriken nicht verfügbar: {e}")
 
 
+def invalidate_log_metrics() -> None:
+    """Erzwingt beim nächsten Scrape einen neuen LOGS_DIR-Scan (z.B. nach Cleanup)."""
+    global _log_metrics_scanned_at
+    with _log_metrics_lock:
+        _log_metrics_scanned_at = 0.0
+
+
 def update_pipeline_metrics() -> None:
     """
     Aktualisiert Pipeline-Run-Metriken.
+
+    Die Anzahl aktiver Runs kommt aus dem Zähler, den track_run_started/
+    track_run_finished zum Event-Zeitpunkt pflegen (gilt für Docker und Kubernetes).
     """
     try:
-        from app.executor import _running_containers, _concurrency_lock
-        import asyncio
-
-        # Aktive Runs zählen (synchron, da wir nicht im async context sind)
-        active_count = len(_running_containers)
-
         # Concurrency-Limit setzen
         concurrency_limit.set(config.MAX_CONCURRENT_RUNS)
 
         # Utilization berechnen
         if config.MAX_CONCURRENT_RUNS > 0:
-            utilization = active_count / config.MAX_CONCURRENT_RUNS
+            utilization = len(_active_runs) / config.MAX_CONCURRENT_RUNS
             concurrency_utilization.set(utilization)
 
     except Exception as e:
         logger.debug(f"Pipeline-Metriken nicht verfügbar: {e}")
 
 
+# Negativ-Cache für Docker: nach einem Fehler wird bis _docker_unavailable_until
+# (time.monotonic) nicht erneut gepingt; der Backoff verdoppelt sich pro Fehler.
+_DOCKER_BACKOFF_MAX_SECONDS = 300.0
+_docker_unavailable_until: float = 0.0
+_docker_backoff_seconds: float = 0.0
+
+
+# app.executor importiert dieses Modul; der Docker-Client-Getter wird daher erst
+# beim ersten Scrape aufgelöst und danach wiederverwendet.
+_docker_client_getter: Optional[Callable[[], object]] = None
+
+
+def _get_docker_client():
+    """Liefert den Docker-Client des Executors (Import nur beim ersten Aufruf)."""
+    global _docker_client_getter
+    if _docker_client_getter is None:
+        from app.executor import _get_docker_client as getter
+
+        _docker_client_getter = getter
+    return _docker_client_getter()
+
+
+# Exportierte Container-Status -> Anzahl aufeinanderfolgender Scrapes ohne Container.
+# Fehlende Status werden auf 0 gesetzt und nach _DOCKER_STATUS_STALE_SCRAPES entfernt.
+_DOCKER_STATUS_STALE_SCRAPES = 10
+_docker_status_misses: dict[str, int] = {}
+
+
+@lru_cache(maxsize=32)
+def _docker_status_child(status: str):
+    return docker_containers_total.labels(status=status)
+
+
+def _reset_missing_docker_statuses(current: dict[str, int]) -> None:
+    """
+    Setzt exportierte Status, die im aktuellen Scrape fehlen, auf 0 und entfernt
+    sie nach _DOCKER_STATUS_STALE_SCRAPES aufeinanderfolgenden Fehl-Scrapes ganz.
+    """
+    stale = []
+    for status in _docker_status_misses.keys() - current.keys():
+        misses = _docker_status_misses[status] + 1
+        if misses >= _DOCKER_STATUS_STALE_SCRAPES:
+            stale.append(status)
+        else:
+            _docker_status_misses[status] = misses
+            _docker_status_child(status).set(0)
+    if stale:
+        for status in stale:
+            del _docker_status_misses[status]
+            try:
+                docker_containers_total.remove(status)
+            except KeyError:
+                pass
+        _docker_status_child.cache_clear()
+
+
+def _mark_docker_unavailable() -> None:
+    """Setzt docker_available=0 und verlängert den Backoff bis zum nächsten Versuch."""
+    global _docker_unavailable_until, _docker_backoff_seconds
+    docker_available.set(0)
+    base = config.METRICS_DOCKER_ERROR_BACKOFF_SECONDS
+    if base <= 0:
+        return
+    _docker_backoff_seconds = min(
+        _docker_backoff_seconds * 2 if _docker_backoff_seconds else base,
+        _DOCKER_BACKOFF_MAX_SECONDS,
+    )
+    _docker_unavailable_until = time.monotonic() + _docker_backoff_seconds
+
+
 def update_docker_metrics() -> None:
     """
     Aktualisiert Docker-Container-Metriken.
+
+    War Docker beim letzten Scrape nicht erreichbar, wird bis zum Ablauf des
+    Backoffs (METRICS_DOCKER_ERROR_BACKOFF_SECONDS) kein Ping/List versucht.
     """
-    try:
-        from app.executor import _get_docker_client
+    global _docker_unavailable_until, _docker_backoff_seconds
+    if time.monotonic() < _docker_unavailable_until:
+        return
 
+    try:
         client = _get_docker_client()
         if client is None:
-            docker_available.set(0)
+            _mark_docker_unavailable()
             return
 
         # Docker erreichbar
@@ -265,7 +412,7 @@ def update_docker_metrics() -> None:
             client.ping()
             docker_available.set(1)
         except Exception:
-            docker_available.set(0)
+            _mark_docker_unavailable()
             return
 
         # Container nach Status zählen
@@ -275,13 +422,19 @@ def update_docker_metrics() -> None:
             status = container.status or "unknown"
             status_counts[status] = status_counts.get(status, 0) + 1
 
-        # Metriken setzen
+        # Metriken setzen; Status ohne Container mehr (z.B. letzter "exited"
+        # Container entfernt) explizit auf 0 statt den alten Wert stehen zu lassen
         for status, count in status_counts.items():
-            docker_containers_total.labels(status=status).set(count)
+            _docker_status_child(status).set(count)
+            _docker_status_misses[status] = 0
+        _reset_missing_docker_statuses(status_counts)
+
+        _docker_unavailable_until = 0.0
+        _docker_backoff_seconds = 0.0
 
     except Exception as e:
         logger.debug(f"Docker-Metriken nicht verfügbar: {e}")
-        docker_available.set(0)
+        _mark_docker_unavailable()
 
 
 def update_all_metrics() -> None:
@@ -301,31 +454,177 @@ def update_all_metrics() -> None:
 # Helper-Funktionen für Pipeline-Tracking
 # ============================================================================
 
-def track_run_started(pipeline_name: str) -> None:
+# Per track_run_started gestartete, noch nicht beendete Runs (Summe von
+# pipeline_runs_active), gepflegt zum Event-Zeitpunkt statt beim Scrape gezählt.
+# Über die Run-IDs bleiben Start und Ende balanciert: Fehler vor dem Container-Start
+# melden "failed", ohne dass der Run je als aktiv gezählt wurde.
+_active_runs: set[Hashable] = set()
+_active_runs_lock = threading.Lock()
+
+
+def get_active_run_count() -> int:
+    """Anzahl der Runs, die per track_run_started gestartet und noch nicht beendet wurden."""
+    return len(_active_runs)
+
+
+# Label-Kardinalität: pipeline_name wird bereinigt und auf METRICS_MAX_PIPELINE_LABELS
+# unterschiedliche Werte begrenzt. Die Zuordnung ist stabil (kein LRU-Verdrängen), damit
+# inc()/dec() von pipeline_runs_active für denselben Run immer dasselbe Label treffen.
+_UNSAFE_LABEL_CHARS = re.compile(r"[^a-zA-Z0-9_\-]")
+_MAX_LABEL_LENGTH = 64
+OTHER_PIPELINE_LABEL = "_other"
+_pipeline_labels: dict[str, str] = {}
+_pipeline_labels_lock = threading.Lock()
+
+
+def _pipeline_label(pipeline_name: str) -> str:
+    """
+    Liefert den Prometheus-Labelwert für eine Pipeline.
+
+    Unzulässige Zeichen werden durch "_" ersetzt und der Wert auf 64 Zeichen gekürzt.
+    Ist das Limit METRICS_MAX_PIPELINE_LABELS erreicht, werden neue Pipelines unter
+    OTHER_PIPELINE_LABEL zusammengefasst.
+    """
+    label = _pipeline_labels.get(pipeline_name)
+    if label is not None:
+        return label
+    with _pipeline_labels_lock:
+        label = _pipeline_labels.get(pipeline_name)
+        if label is None:
+            if len(_pipeline_labels) >= config.METRICS_MAX_PIPELINE_LABELS:
+                return OTHER_PIPELINE_LABEL
+            label = _UNSAFE_LABEL_CHARS.sub("_", pipeline_name)[:_MAX_LABEL_LENGTH]
+            _pipeline_labels[pipeline_name] = label
+    return label
+
+
+# Gebundene Label-Children: spart pro Tracking-Aufruf den labels()-Lookup
+# (Label-Validierung + Dict-Zugriff unter Lock). Größe ist durch
+# METRICS_MAX_PIPELINE_LABELS x Anzahl Status begrenzt.
+@lru_cache(maxsize=1024)
+def _active_child(label: str):
+    return pipeline_runs_active.labels(pipeline_name=label)
+
+
+@lru_cache(maxsize=4096)
+def _total_child(label: str, status: str):
+    return pipeline_runs_total.labels(pipeline_name=label, status=status)
+
+
+@lru_cache(maxsize=4096)
+def _duration_child(label: str, status: str):
+    return pipeline_run_duration_seconds.labels(pipeline_name=label, status=status)
+
+
+def track_run_started(pipeline_name: str, run_id: Hashable) -> None:
     """
     Wird aufgerufen, wenn ein Pipeline-Run startet.
     
     Args:
         pipeline_name: Name der Pipeline
+        run_id: ID des Runs (für das passende track_run_finished)
     """
-    pipeline_runs_active.labels(pipeline_name=pipeline_name).inc()
-    pipeline_runs_total.labels(pipeline_name=pipeline_name, status="started").inc()
+    label = _pipeline_label(pipeline_name)
+    with _active_runs_lock:
+        if run_id in _active_runs:
+            return
+        _active_runs.add(run_id)
+    _active_child(label).inc()
+    _total_child(label, "started").inc()
 
 
-def track_run_finished(pipeline_name: str, status: str, duration_seconds: float) -> None:
+def track_run_finished(pipeline_name: str, status: str, duration_seconds: float, run_id: Hashable) -> None:
     """
     Wird aufgerufen, wenn ein Pipeline-Run endet.
     
+    Aktive Runs werden nur für vorher gestartete Runs verringert; Fehler vor dem
+    Container-Start zählen nur in Total und Dauer.
+    
     Args:
         pipeline_name: Name der Pipeline
         status: End-Status (completed, failed, cancelled)
         duration_seconds: Dauer in Sekunden
+        run_id: ID des Runs (wie bei track_run_started)
     """
-    pipeline_runs_active.labels(pipeline_name=pipeline_name).dec()
-    pipeline_runs_total.labels(pipeline_name=pipeline_name, status=status).inc()
-    pipeline_run_duration_seconds.labels(
-        pipeline_name=pipeline_name, status=status
-    ).observe(duration_seconds)
+    label = _pipeline_label(pipeline_name)
+    with _active_runs_lock:
+        was_started = run_id in _active_runs
+        _active_runs.discard(run_id)
+    if was_started:
+        _active_child(label).dec()
+    _total_child(label, status).inc()
+    _duration_child(label, status).observe(duration_seconds)
+
+
+# ============================================================================
+# Exposition
+# ============================================================================
+
+class _SingleFamilyCollector:
+    """Adapter, der eine einzelne MetricFamily als Collector für generate_latest bereitstellt."""
+
+    __slots__ = ("_family",)
+
+    def __init__(self, family) -> None:
+        self._family = family
+
+    def collect(self):
+        return (self._family,)
+
+
+def iter_metrics(registry: CollectorRegistry = REGISTRY) -> Iterator[bytes]:
+    """
+    Serialisiert die Registry Metrik-Familie für Metrik-Familie im Prometheus-Textformat.
+
+    Liefert dieselben Bytes wie generate_latest(registry), aber in Chunks, sodass
+    /metrics gestreamt werden kann, statt die komplette Antwort im Speicher aufzubauen.
+
+    Args:
+        registry: Prometheus-Registry (Standard: globale REGISTRY)
+
+    Yields:
+        UTF-8-kodierte Textblöcke, je einer pro Metrik-Familie
+    """
+    for family in registry.collect():
+        yield generate_latest(_SingleFamilyCollector(family))
+
+
+# Gecachte /metrics-Ausgabe bei METRICS_CACHE_TTL_SECONDS > 0:
+# (Zeitpunkt time.monotonic, Ausgabe, ETag)
+_metrics_cache: Optional[tuple[float, bytes, str]] = None
+_metrics_cache_lock = threading.Lock()
+
+
+def get_cached_metrics() -> tuple[bytes, str]:
+    """
+    Liefert die serialisierten Metriken samt ETag, höchstens einmal pro
+    METRICS_CACHE_TTL_SECONDS neu erzeugt (inkl. update_all_metrics).
+
+    Returns:
+        Tuple (Prometheus-Textformat, ETag in Anführungszeichen)
+    """
+    global _metrics_cache
+    with _metrics_cache_lock:
+        now = time.monotonic()
+        cached = _metrics_cache
+        if cached is not None and now - cached[0] < config.METRICS_CACHE_TTL_SECONDS:
+            return cached[1], cached[2]
+        update_all_metrics()
+        output = b"".join(iter_metrics())
+        etag = f'"{hashlib.blake2b(output, digest_size=16).hexdigest()}"'
+        _metrics_cache = (now, output, etag)
+        return output, etag
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Prüft, ob der If-None-Match-Header den ETag enthält (Liste oder '*')."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
 
 
 # ============================================================================
@@ -394,8 +693,7 @@ def setup_prometheus_metrics(app: FastAPI) -> None:
     Args:
         app: FastAPI-App-Instanz
     """
-    from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
-    from starlette.responses import Response as StarletteResponse
+    from prometheus_client import CONTENT_TYPE_LATEST
     
     # App-Info setzen
     app_info.info({
@@ -416,21 +714,28 @@ def setup_prometheus_metrics(app: FastAPI) -> None:
     # Manueller /metrics Endpoint (zuverlässiger als instrumentator.expose())
     @app.get("/metrics", tags=["monitoring"], include_in_schema=True)
     @limiter.exempt
-    async def metrics_endpoint() -> StarletteResponse:
+    async def metrics_endpoint(request: Request) -> Response:
         """
         Prometheus-Metriken-Endpoint.
         
         Gibt alle registrierten Metriken im Prometheus-Format zurück.
         Benutzerdefinierte Metriken werden vor dem Abruf aktualisiert.
+        Die Ausgabe wird pro Metrik-Familie gestreamt (geringerer Peak-Speicher, frühes erstes Byte).
+        Mit METRICS_CACHE_TTL_SECONDS > 0 wird stattdessen die gecachte Ausgabe mit ETag
+        geliefert (304 Not Modified bei passendem If-None-Match).
         """
+        if config.METRICS_CACHE_TTL_SECONDS > 0:
+            output, etag = get_cached_metrics()
+            headers = {"ETag": etag}
+            if _etag_matches(request.headers.get("if-none-match"), etag):
+                return Response(status_code=304, headers=headers)
+            return Response(content=output, media_type=CONTENT_TYPE_LATEST, headers=headers)
+
         # Benutzerdefinierte Metriken aktualisieren
         update_all_metrics()
         
-        # Prometheus-Metriken generieren
-        metrics_output = generate_latest()
-        
-        return StarletteResponse(
-            content=metrics_output,
+        return StreamingResponse(
+            iter_metrics(),
             media_type=CONTENT_TYPE_LATEST,
         )
 
@@ -6,63 +6,93 @@ das konfigurierte Limit überschreitet (413 Payload Too Large).
 """
 
 import logging
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.datastructures import Headers
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import config
 
 logger = logging.getLogger(__name__)
 
-_MUTATION_METHODS = {"POST", "PUT", "PATCH"}
+_MUTATION_METHODS = frozenset({"POST", "PUT", "PATCH"})
 
 
-class BodyLimitMiddleware(BaseHTTPMiddleware):
+class BodyLimitMiddleware:
     """
     Middleware für maximale Request-Body-Größe.
 
     Prüft Content-Length wenn vorhanden; für Chunked-Requests auf
     mutierenden Methoden (POST/PUT/PATCH) wird der Body-Stream
     mit Byte-Zähler gelesen und bei Überschreitung abgebrochen.
+    Der gepufferte Body wird der App anschließend erneut übergeben.
     """
 
-    async def dispatch(self, request: Request, call_next):
-        if config.MAX_REQUEST_BODY_MB is None:
-            return await call_next(request)
-        limit_bytes = config.MAX_REQUEST_BODY_MB * 1024 * 1024
-        content_length = request.headers.get("content-length")
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        # Limit einmalig berechnen (None = unbegrenzt)
+        self._limit_mb = config.MAX_REQUEST_BODY_MB
+        self._limit_bytes = None if self._limit_mb is None else self._limit_mb * 1024 * 1024
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limit_bytes = self._limit_bytes
+        if limit_bytes is None or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        content_length = Headers(scope=scope).get("content-length")
 
         if content_length:
-            try:
+            if content_length.isascii() and content_length.isdigit():
                 size_bytes = int(content_length)
-            except ValueError:
-                return await call_next(request)
-            if size_bytes > limit_bytes:
-                logger.warning(
-                    "Request body too large: %s bytes (limit %s MB)",
-                    size_bytes,
-                    config.MAX_REQUEST_BODY_MB,
-                )
-                return _too_large_response()
-        elif request.method in _MUTATION_METHODS:
-            body = b""
-            async for chunk in request.stream():
-                body += chunk
-                if len(body) > limit_bytes:
+                if size_bytes > limit_bytes:
+                    logger.warning(
+                        "Request body too large: %s bytes (limit %s MB)",
+                        size_bytes,
+                        self._limit_mb,
+                    )
+                    await _too_large_response(self._limit_mb)(scope, receive, send)
+                    return
+        elif scope["method"] in _MUTATION_METHODS:
+            chunks: list[bytes] = []
+            received = 0
+            more_body = True
+            while more_body:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    return
+                chunk = message.get("body", b"")
+                received += len(chunk)
+                if received > limit_bytes:
                     logger.warning(
                         "Chunked request body exceeds limit (%s MB)",
-                        config.MAX_REQUEST_BODY_MB,
+                        self._limit_mb,
                     )
-                    return _too_large_response()
-            request._body = body
+                    await _too_large_response(self._limit_mb)(scope, receive, send)
+                    return
+                chunks.append(chunk)
+                more_body = message.get("more_body", False)
+            receive = _replay_body(b"".join(chunks), receive)
+
+        await self.app(scope, receive, send)
+
+
+def _replay_body(body: bytes, receive: Receive) -> Receive:
+    """Liefert den bereits gelesenen Body als erste Nachricht, danach den Original-Receive."""
+    replayed = False
+
+    async def replay() -> Message:
+        nonlocal replayed
+        if not replayed:
+            replayed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
 
-        return await call_next(request)
+    return replay
 
 
-def _too_large_response() -> JSONResponse:
+def _too_large_response(limit_mb: int) -> JSONResponse:
     return JSONResponse(
         status_code=413,
         content={
-            "detail": f"Request body exceeds maximum size of {config.MAX_REQUEST_BODY_MB} MB",
+            "detail": f"Request body exceeds maximum size of {limit_mb} MB",
         },
     )
@@ -7,18 +7,15 @@ und markiert langsame Requests (konfigurierbar via SLOW_REQUEST_THRESHOLD_SECOND
 
 import logging
 import time
-from typing import Callable
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import config
 
 logger = logging.getLogger(__name__)
 
 
-class PerformanceTrackingMiddleware(BaseHTTPMiddleware):
+class PerformanceTrackingMiddleware:
     """
     Middleware für Request-Performance-Tracking.
     
@@ -26,33 +23,58 @@ class PerformanceTrackingMiddleware(BaseHTTPMiddleware):
     - Loggt method, path, status_code, duration_ms, request_id
     - Slow-Request-Detection: WARNING wenn Dauer > SLOW_REQUEST_THRESHOLD_SECONDS
     - Strukturiertes Logging wenn LOG_JSON aktiv
+
+    Gemessen wird bis zum Senden der Response-Header (wie bisher bei call_next),
+    damit Streaming-Responses (SSE) nicht als langsame Requests gelten.
     """
 
-    # Pfade die nicht geloggt werden (z.B. Health-Checks, Metrics)
-    SKIP_PATHS = frozenset({
-        "/health", "/healthz", "/api/health", "/ready", "/api/ready",
-        "/metrics",  # Metrics-Endpoint selbst, sonst Feedback-Loop
-    })
+    # Pfade die nicht geloggt werden (z.B. Health-Checks, Metrics);
+    # jeweils mit und ohne abschließenden Slash, damit ein Set-Lookup reicht
+    SKIP_PATHS = frozenset(
+        variant
+        for skip_path in (
+            "/health", "/healthz", "/api/health", "/ready", "/api/ready",
+            "/metrics",  # Metrics-Endpoint selbst, sonst Feedback-Loop
+        )
+        for variant in (skip_path, skip_path + "/")
+    )
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        # Config-Werte ändern sich zur Laufzeit nicht: einmalig übernehmen
+        self._slow_threshold_seconds = config.SLOW_REQUEST_THRESHOLD_SECONDS
+        self._slow_threshold_ns = int(config.SLOW_REQUEST_THRESHOLD_SECONDS * 1_000_000_000)
+        self._log_json = config.LOG_JSON
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        path = request.url.path
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"]
 
         # Skips für häufige, wenig aussagekräftige Requests
-        if path in self.SKIP_PATHS or path.rstrip("/") in self.SKIP_PATHS:
-            return await call_next(request)
+        if path in self.SKIP_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        start_ns = time.monotonic_ns()
 
-        start = time.perf_counter()
-        response = await call_next(request)
-        duration_seconds = time.perf_counter() - start
-        duration_ms = round(duration_seconds * 1000, 2)
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                elapsed_ns = time.monotonic_ns() - start_ns
+                self._log_request(scope, path, message["status"], elapsed_ns)
+            await send(message)
 
-        method = request.method
-        status_code = response.status_code
-        request_id = getattr(request.state, "request_id", None)
+        await self.app(scope, receive, send_with_timing)
+
+    def _log_request(self, scope: Scope, path: str, status_code: int, elapsed_ns: int) -> None:
+        duration_ms = elapsed_ns // 1_000_000
+        method = scope["method"]
+        request_id = scope.get("state", {}).get("request_id")
 
         # Slow-Request-Detection
-        if duration_seconds >= config.SLOW_REQUEST_THRESHOLD_SECONDS:
-            if config.LOG_JSON:
+        if elapsed_ns >= self._slow_threshold_ns:
+            if self._log_json:
                 logger.warning(
                     "Slow request",
                     extra={
@@ -61,8 +83,8 @@ class PerformanceTrackingMiddleware(BaseHTTPMiddleware):
                         "path": path,
                         "status_code": status_code,
                         "duration_ms": duration_ms,
-                        "duration_seconds": round(duration_seconds, 3),
-                        "threshold_seconds": config.SLOW_REQUEST_THRESHOLD_SECONDS,
+                        "duration_seconds": round(elapsed_ns / 1_000_000_000, 3),
+                        "threshold_seconds": self._slow_threshold_seconds,
                         "request_id": request_id,
                     },
                 )
@@ -70,11 +92,11 @@ class PerformanceTrackingMiddleware(BaseHTTPMiddleware):
                 logger.warning(
                     "Slow request: %s %s -> %d in %dms (threshold: %.1fs) request_id=%s",
                     method, path, status_code, duration_ms,
-                    config.SLOW_REQUEST_THRESHOLD_SECONDS, request_id,
+                    self._slow_threshold_seconds, request_id,
                 )
         else:
             # Normales Request-Logging (INFO)
-            if config.LOG_JSON:
+            if self._log_json:
                 logger.info(
                     "Request",
                     extra={
@@ -91,5 +113,3 @@ class PerformanceTrackingMiddleware(BaseHTTPMiddleware):
                     "%s %s -> %d %dms request_id=%s",
                     method, path, status_code, duration_ms, request_id,
                 )
-
-        return response
@@ -23,6 +23,9 @@ from app.core.config import config
 
 logger = logging.getLogger(__name__)
 
+# PROXY_HEADERS_TRUSTED wird nur beim Start aus der Umgebung gelesen
+_PROXY_TRUSTED = bool(config.PROXY_HEADERS_TRUSTED)
+
 
 def get_client_identifier(request: Request) -> str:
     """
@@ -37,11 +40,12 @@ def get_client_identifier(request: Request) -> str:
     Returns:
         str: Client-Identifier (IP-Adresse)
     """
-    if config.PROXY_HEADERS_TRUSTED:
-        forwarded_for = request.headers.get("X-Forwarded-For")
+    if _PROXY_TRUSTED:
+        forwarded_for = request.headers.get("x-forwarded-for")
         if forwarded_for:
-            client_ip = forwarded_for.split(",")[0].strip()
-            return client_ip
+            # Nur der erste Hop ist relevant: find + Slice statt split() über alle Hops
+            comma = forwarded_for.find(",")
+            return (forwarded_for[:comma] if comma >= 0 else forwarded_for).strip()
     return get_remote_address(request)
 
 
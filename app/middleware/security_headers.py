@@ -14,118 +14,129 @@ Security Headers:
 """
 
 import logging
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import config
 
 logger = logging.getLogger(__name__)
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+# Content-Security-Policy
+# Bewusste Ausnahmen (werden von ZAP als WARN gemeldet, akzeptiertes Risiko):
+# - style-src 'unsafe-inline': React/Recharts setzen Inline-Styles
+# - img-src https:: Branding-Logo und Custom-OAuth-Icon sind Admin-konfigurierbare
+#   URLs auf beliebigen HTTPS-Hosts; data: für Zell-Output-Bilder (base64)
+# OAuth-Provider für Login (connect-src für Fetch, falls nötig)
+_OAUTH_CONNECT = "https://github.com https://api.github.com https://accounts.google.com https://oauth2.googleapis.com https://login.microsoftonline.com https://graph.microsoft.com"
+
+# Produktion: Restriktive CSP
+# script-src ohne 'unsafe-inline'/'unsafe-eval': Der Vite-Build nutzt
+# weder eval noch Inline-Scripts (index.html hat keine).
+# style-src: fonts.googleapis.com für Google Fonts CSS; font-src: fonts.gstatic.com für Font-Dateien (.woff2)
+_CSP_PRODUCTION = (
+    "default-src 'self'; "
+    "script-src 'self'; "
+    "style-src 'self' 'unsafe-inline' https://fonts.googleapis.com; "
+    "img-src 'self' data: https:; "
+    "font-src 'self' data: https://fonts.gstatic.com; "
+    f"connect-src 'self' {_OAUTH_CONNECT}; "
+    "frame-ancestors 'none'; "
+    "form-action 'self'; "
+    "base-uri 'self'; "
+    "object-src 'none';"
+)
+
+# Development: Weniger restriktiv für Dev-Tools
+# (Vite Dev-Server/HMR braucht eval, Inline-Scripts und WebSockets)
+_CSP_DEVELOPMENT = (
+    "default-src 'self'; "
+    "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
+    "style-src 'self' 'unsafe-inline' https://fonts.googleapis.com; "
+    "img-src 'self' data: https:; "
+    "font-src 'self' data: https://fonts.gstatic.com; "
+    f"connect-src 'self' ws: wss: {_OAUTH_CONNECT}; "
+    "frame-ancestors 'none'; "
+    "form-action 'self'; "
+    "base-uri 'self'; "
+    "object-src 'none';"
+)
+
+# HSTS: 1 Jahr
+_HSTS_MAX_AGE = 31536000
+
+
+def _build_security_headers(production: bool) -> dict[str, str]:
     """
-    Middleware für HTTP Security Headers.
-    
-    Fügt wichtige Security Headers zu allen HTTP-Responses hinzu:
-    - Content-Security-Policy: Schutz vor XSS
-    - X-Frame-Options: Schutz vor Clickjacking
-    - X-Content-Type-Options: Verhindert MIME-Sniffing
-    - Strict-Transport-Security: Erzwingt HTTPS (nur in Produktion mit HTTPS)
-    - Referrer-Policy: Kontrolliert Referer-Informationen
+    Baut die (statischen) Security Headers einmalig auf.
+
+    Args:
+        production: True für ENVIRONMENT=production (restriktive CSP + HSTS)
+
+    Returns:
+        Dict Header-Name -> Wert
     """
-    
-    async def dispatch(self, request: Request, call_next):
-        """
-        Fügt Security Headers zur Response hinzu.
-        
-        Args:
-            request: FastAPI Request
-            call_next: Next middleware/handler
-            
-        Returns:
-            Response mit Security Headers
-        """
-        response = await call_next(request)
-        
-        # Content-Security-Policy
-        # Bewusste Ausnahmen (werden von ZAP als WARN gemeldet, akzeptiertes Risiko):
-        # - style-src 'unsafe-inline': React/Recharts setzen Inline-Styles
-        # - img-src https:: Branding-Logo und Custom-OAuth-Icon sind Admin-konfigurierbare
-        #   URLs auf beliebigen HTTPS-Hosts; data: für Zell-Output-Bilder (base64)
-        # OAuth-Provider für Login (connect-src für Fetch, falls nötig)
-        oauth_connect = "https://github.com https://api.github.com https://accounts.google.com https://oauth2.googleapis.com https://login.microsoftonline.com https://graph.microsoft.com"
-        if config.ENVIRONMENT == "production":
-            # Produktion: Restriktive CSP
-            # script-src ohne 'unsafe-inline'/'unsafe-eval': Der Vite-Build nutzt
-            # weder eval noch Inline-Scripts (index.html hat keine).
-            # style-src: fonts.googleapis.com für Google Fonts CSS; font-src: fonts.gstatic.com für Font-Dateien (.woff2)
-            csp = (
-                "default-src 'self'; "
-                "script-src 'self'; "
-                "style-src 'self' 'unsafe-inline' https://fonts.googleapis.com; "
-                "img-src 'self' data: https:; "
-                "font-src 'self' data: https://fonts.gstatic.com; "
-                f"connect-src 'self' {oauth_connect}; "
-                "frame-ancestors 'none'; "
-                "form-action 'self'; "
-                "base-uri 'self'; "
-                "object-src 'none';"
-            )
-        else:
-            # Development: Weniger restriktiv für Dev-Tools
-            # (Vite Dev-Server/HMR braucht eval, Inline-Scripts und WebSockets)
-            csp = (
-                "default-src 'self'; "
-                "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
-                "style-src 'self' 'unsafe-inline' https://fonts.googleapis.com; "
-                "img-src 'self' data: https:; "
-                "font-src 'self' data: https://fonts.gstatic.com; "
-                f"connect-src 'self' ws: wss: {oauth_connect}; "
-                "frame-ancestors 'none'; "
-                "form-action 'self'; "
-                "base-uri 'self'; "
-                "object-src 'none';"
-            )
-
-        response.headers["Content-Security-Policy"] = csp
-        
+    headers = {
+        "Content-Security-Policy": _CSP_PRODUCTION if production else _CSP_DEVELOPMENT,
         # X-Frame-Options: Verhindert Einbettung in Frames (Clickjacking-Schutz)
-        response.headers["X-Frame-Options"] = "DENY"
-        
+        "X-Frame-Options": "DENY",
         # X-Content-Type-Options: Verhindert MIME-Sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        
+        "X-Content-Type-Options": "nosniff",
         # Referrer-Policy: Begrenzt Referer-Informationen
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        
+        "Referrer-Policy": "strict-origin-when-cross-origin",
         # X-XSS-Protection: Zusätzlicher XSS-Schutz (veraltet, aber für Kompatibilität)
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-
+        "X-XSS-Protection": "1; mode=block",
         # Permissions-Policy: Deaktiviert mächtige Browser-Features, die die App nicht nutzt
-        response.headers["Permissions-Policy"] = (
-            "camera=(), microphone=(), geolocation=(), payment=(), usb=()"
-        )
-
+        "Permissions-Policy": "camera=(), microphone=(), geolocation=(), payment=(), usb=()",
         # Cross-Origin-Isolation-Header (Spectre-/XS-Leak-Schutz)
         # COOP: eigener Browsing-Context, kein window.opener-Zugriff von fremden Origins
-        response.headers["Cross-Origin-Opener-Policy"] = "same-origin"
+        "Cross-Origin-Opener-Policy": "same-origin",
         # CORP: eigene Ressourcen (Assets, API) nicht von fremden Origins einbettbar
-        response.headers["Cross-Origin-Resource-Policy"] = "same-origin"
+        "Cross-Origin-Resource-Policy": "same-origin",
         # COEP: 'credentialless' statt 'require-corp', damit Google Fonts und
         # Admin-konfigurierte Branding-Bilder (fremde Hosts ohne CORP-Header)
         # weiter laden; Browser ohne Support ignorieren den Wert einfach
-        response.headers["Cross-Origin-Embedder-Policy"] = "credentialless"
-        
-        # Strict-Transport-Security: Erzwingt HTTPS (nur wenn HTTPS aktiviert ist)
-        # Prüfe ob Request über HTTPS kam
-        # In Produktion sollte HTTPS verwendet werden
-        if config.ENVIRONMENT == "production":
-            # HSTS nur setzen wenn wir sicher sind, dass HTTPS verwendet wird
-            # In Produktion sollte hinter einem Reverse-Proxy mit HTTPS sein
-            # Der Reverse-Proxy sollte diesen Header setzen, aber wir setzen ihn auch
-            # als Fallback
-            hsts_max_age = 31536000  # 1 Jahr
-            response.headers["Strict-Transport-Security"] = f"max-age={hsts_max_age}; includeSubDomains"
-        
-        return response
+        "Cross-Origin-Embedder-Policy": "credentialless",
+    }
+    if production:
+        # Strict-Transport-Security: Erzwingt HTTPS
+        # In Produktion sollte die App hinter einem Reverse-Proxy mit HTTPS sein.
+        # Der Reverse-Proxy sollte diesen Header setzen, aber wir setzen ihn auch
+        # als Fallback
+        headers["Strict-Transport-Security"] = f"max-age={_HSTS_MAX_AGE}; includeSubDomains"
+    return headers
+
+
+class SecurityHeadersMiddleware:
+    """
+    Middleware für HTTP Security Headers.
+    
+    Fügt wichtige Security Headers zu allen HTTP-Responses hinzu:
+    - Content-Security-Policy: Schutz vor XSS
+    - X-Frame-Options: Schutz vor Clickjacking
+    - X-Content-Type-Options: Verhindert MIME-Sniffing
+    - Strict-Transport-Security: Erzwingt HTTPS (nur in Produktion mit HTTPS)
+    - Referrer-Policy: Kontrolliert Referer-Informationen
+
+    Die Header-Werte sind statisch und werden beim Erzeugen der Middleware
+    einmalig anhand von ENVIRONMENT berechnet. Reine ASGI-Middleware: die Header
+    werden in die http.response.start-Nachricht geschrieben.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._headers = _build_security_headers(config.ENVIRONMENT == "production")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in self._headers.items():
+                    headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
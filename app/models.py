@@ -10,18 +10,41 @@ Dieses Modul definiert alle SQLModel-Models für die Datenbank:
 - Session (Session-Tokens für persistente Authentifizierung)
 """
 
+import os
+import time
 from datetime import date, datetime, timezone
 from enum import Enum
+from functools import partial
 from typing import Optional, Dict, Any
 from uuid import UUID, uuid4
 
-from sqlalchemy import Enum as SAEnum, Text
+from pydantic import ConfigDict
+from sqlalchemy import CheckConstraint, Enum as SAEnum, Index, Text
 from sqlmodel import SQLModel, Field, JSON, Column
 
 
-def _utc_now() -> datetime:
-    """Gibt die aktuelle UTC-Zeit zurück (zeitzone-aware)."""
-    return datetime.now(timezone.utc)
+def uuid7() -> UUID:
+    """
+    Erzeugt eine zeitlich geordnete UUID Version 7 (RFC 9562).
+
+    48 Bit Unix-Zeit in Millisekunden, danach 74 Zufallsbits. Neue Zeilen landen
+    dadurch am rechten Rand des Primärschlüssel-Index statt zufällig verteilt
+    (weniger Page-Splits und WAL-Seiten bei Insert-lastigen Tabellen).
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    # Version (0111) und Variant (10) setzen
+    value = (value & ~(0xF << 76)) | (0x7 << 76)
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)
+    return UUID(int=value)
+
+
+# Aktuelle UTC-Zeit (zeitzone-aware). Vorgebunden statt Wrapper-Funktion: wird als
+# default_factory bei jedem Insert aufgerufen, partial spart Frame und Attribut-Lookups.
+_utc_now = partial(datetime.now, timezone.utc)
+
+# Pydantic-Schema der Table-Models erst bei der ersten Validierung bauen statt beim
+# Import; die SQLAlchemy-Tabellen werden davon unabhängig sofort registriert.
+_DEFERRED_SCHEMA = ConfigDict(defer_build=True)
 
 
 class RunStatus(str, Enum):
@@ -68,6 +91,7 @@ class Pipeline(SQLModel, table=True):
     Speichert Metadaten über verfügbare Pipelines, inklusive
     Statistiken und Cache-Status.
     """
+    model_config = _DEFERRED_SCHEMA
     __tablename__ = "pipelines"
     
     pipeline_name: str = Field(primary_key=True, description="Name der Pipeline")
@@ -102,6 +126,7 @@ class PipelineDailyStat(SQLModel, table=True):
     Tägliche Run-Statistiken pro Pipeline (persistent, wird beim Cleanup nicht gelöscht).
     Wird beim Run-Ende erhöht; Kalender liest daraus, sodass Anzahlen nach Flush erhalten bleiben.
     """
+    model_config = _DEFERRED_SCHEMA
     __tablename__ = "pipeline_daily_stats"
 
     pipeline_name: str = Field(foreign_key="pipelines.pipeline_name", primary_key=True)
@@ -118,15 +143,25 @@ class PipelineRun(SQLModel, table=True):
     Speichert Informationen über jeden Pipeline-Ausführung,
     inklusive Status, Logs, Metrics und Environment-Variablen.
     """
+    model_config = _DEFERRED_SCHEMA
     __tablename__ = "pipeline_runs"
+    # Run-Historie pro Pipeline (WHERE pipeline_name = ? ORDER BY started_at DESC):
+    # Composite-Index deckt auch reine pipeline_name-Filter als Präfix ab
+    __table_args__ = (
+        Index(
+            "ix_pipeline_runs_pipeline_name_started_at",
+            "pipeline_name",
+            "started_at",
+            postgresql_ops={"started_at": "DESC"},
+        ),
+    )
     
     id: UUID = Field(
-        default_factory=uuid4,
+        default_factory=uuid7,
         primary_key=True,
         description="Eindeutige Run-ID"
     )
     pipeline_name: str = Field(
-        index=True,
         description="Name der Pipeline"
     )
     status: RunStatus = Field(
@@ -201,6 +236,7 @@ class RunCellLog(SQLModel, table=True):
     
     Pro Run und Code-Zelle eine Zeile: Status, stdout, stderr, optionale Ausgaben (z. B. Bilder).
     """
+    model_config = _DEFERRED_SCHEMA
     __tablename__ = "run_cell_logs"
     __table_args__ = ({"sqlite_autoincrement": False})
 
@@ -212,7 +248,7 @@ class RunCellLog(SQLModel, table=True):
     outputs: Optional[Dict[str, Any]] = Field(
         default=None,
         sa_column=Column(JSON),
-        description="Optionale Ausgaben (z. B. Bilder als Base64)",
+        description="Optionale Ausgaben; Bilder als Manifest {mime, path, size}, Dateien unter LOGS_DIR/cell_outputs",
     )
 
 
@@ -223,6 +259,7 @@ class ScheduledJob(SQLModel, table=True):
     Speichert geplante Pipeline-Ausführungen mit Cron- oder
     Interval-Triggers.
     """
+    model_config = _DEFERRED_SCHEMA
     __tablename__ = "scheduled_jobs"
     
     id: UUID = Field(
@@ -275,7 +312,12 @@ class DownstreamTrigger(SQLModel, table=True):
     abhängig von on_success/on_failure. Überschneidet sich mit pipeline.json
     downstream_triggers – beide Quellen werden beim Trigger-Vorgang zusammengeführt.
     """
+    model_config = _DEFERRED_SCHEMA
     __tablename__ = "downstream_triggers"
+    # Lookup beim Run-Ende: WHERE upstream_pipeline = ? AND enabled
+    __table_args__ = (
+        Index("ix_downstream_triggers_upstream_pipeline_enabled", "upstream_pipeline", "enabled"),
+    )
 
     id: UUID = Field(
         default_factory=uuid4,
@@ -283,7 +325,6 @@ class DownstreamTrigger(SQLModel, table=True):
         description="Eindeutige Trigger-ID",
     )
     upstream_pipeline: str = Field(
-        index=True,
         description="Name der Upstream-Pipeline (A)",
     )
     downstream_pipeline: str = Field(
@@ -325,6 +366,7 @@ class Secret(SQLModel, table=True):
     Secrets werden mit Fernet verschlüsselt gespeichert.
     Parameter (is_parameter=True) werden nicht verschlüsselt gespeichert.
     """
+    model_config = _DEFERRED_SCHEMA
     __tablename__ = "secrets"
     
     id: UUID = Field(
@@ -354,10 +396,16 @@ class Secret(SQLModel, table=True):
     )
 
 
+# OAuth-Subject-IDs: OIDC begrenzt "sub" auf 255 ASCII-Zeichen; GitHub/Google/Microsoft
+# liefern deutlich kürzere IDs. Begrenzte Länge hält die Unique-Indizes schmal.
+OAUTH_ID_MAX_LENGTH = 255
+
+
 class User(SQLModel, table=True):
     """
     User-Model. Authentifizierung via GitHub OAuth, Google OAuth (und Einladung).
     """
+    model_config = _DEFERRED_SCHEMA
     __tablename__ = "users"
 
     id: UUID = Field(
@@ -394,12 +442,14 @@ class User(SQLModel, table=True):
     )
     microsoft_id: Optional[str] = Field(
         default=None,
+        max_length=OAUTH_ID_MAX_LENGTH,
         unique=True,
         index=True,
         description="Microsoft OAuth ID (optional, für zukünftige Microsoft-Auth)"
     )
     github_id: Optional[str] = Field(
         default=None,
+        max_length=OAUTH_ID_MAX_LENGTH,
         unique=True,
         index=True,
         description="GitHub OAuth ID (optional, für GitHub-Login)"
@@ -410,12 +460,14 @@ class User(SQLModel, table=True):
     )
     google_id: Optional[str] = Field(
         default=None,
+        max_length=OAUTH_ID_MAX_LENGTH,
         unique=True,
         index=True,
         description="Google OAuth ID (optional, für Google-Login)"
     )
     custom_oauth_id: Optional[str] = Field(
         default=None,
+        max_length=OAUTH_ID_MAX_LENGTH,
         unique=True,
         index=True,
         description="Custom OAuth subject ID (optional, für Custom IdP)"
@@ -439,6 +491,7 @@ class Invitation(SQLModel, table=True):
     Einladung für neuen User (Token-Einladung via GitHub OAuth).
     Token wird an /invite?token=... übergeben; state im OAuth = token.
     """
+    model_config = _DEFERRED_SCHEMA
     __tablename__ = "invitations"
 
     id: UUID = Field(default_factory=uuid4, primary_key=True)
@@ -456,7 +509,10 @@ class SystemSettings(SQLModel, table=True):
 
     Steuert First-Run-Wizard, Dependency-Audit und UI-Anzeige-Optionen.
     """
+    model_config = _DEFERRED_SCHEMA
     __tablename__ = "system_settings"
+    # Singleton auf DB-Ebene erzwingen, nicht nur per Konvention
+    __table_args__ = (CheckConstraint("id = 1", name="ck_system_settings_singleton"),)
 
     id: int = Field(primary_key=True, default=1, description="Singleton (immer 1)")
     is_setup_completed: bool = Field(default=False, description="Wizard abgeschlossen?")
@@ -518,7 +574,10 @@ class OrchestratorSettings(SQLModel, table=True):
     überschreiben beim Start die Environment-Variablen (config).
     None = kein Override, config-Wert bleibt.
     """
+    model_config = _DEFERRED_SCHEMA
     __tablename__ = "orchestrator_settings"
+    # Singleton auf DB-Ebene erzwingen, nicht nur per Konvention
+    __table_args__ = (CheckConstraint("id = 1", name="ck_orchestrator_settings_singleton"),)
 
     id: int = Field(primary_key=True, default=1, description="Singleton (immer 1)")
     # Log & Cleanup
@@ -574,6 +633,7 @@ class NotificationApiKey(SQLModel, table=True):
     API-Keys für die Benachrichtigungs-API (Skripte).
     Key wird gehashed gespeichert; Klartext nur einmal bei Erzeugung zurückgegeben.
     """
+    model_config = _DEFERRED_SCHEMA
     __tablename__ = "notification_api_keys"
 
     id: int = Field(primary_key=True)
@@ -586,9 +646,10 @@ class AuditLogEntry(SQLModel, table=True):
     """
     Audit-Log: Wer hat wann welche Aktion ausgeführt (Compliance, Nachvollziehbarkeit).
     """
+    model_config = _DEFERRED_SCHEMA
     __tablename__ = "audit_log"
 
-    id: UUID = Field(default_factory=uuid4, primary_key=True, description="Eindeutige Eintrags-ID")
+    id: UUID = Field(default_factory=uuid7, primary_key=True, description="Eindeutige Eintrags-ID")
     created_at: datetime = Field(default_factory=_utc_now, index=True, description="Zeitpunkt der Aktion (UTC)")
     user_id: Optional[UUID] = Field(default=None, foreign_key="users.id", index=True, description="User der die Aktion ausgeführt hat")
     username: str = Field(default="", description="Benutzername zum Zeitpunkt der Aktion (Snapshot)")
@@ -606,17 +667,19 @@ class Session(SQLModel, table=True):
     Speichert Session-Tokens in der Datenbank für persistente
     Authentifizierung. Verhindert Session-Verlust bei App-Neustart.
     """
+    model_config = _DEFERRED_SCHEMA
     __tablename__ = "sessions"
     
     id: UUID = Field(
-        default_factory=uuid4,
+        default_factory=uuid7,
         primary_key=True,
         description="Eindeutige Session-ID"
     )
-    token: str = Field(
+    token_hash: str = Field(
         unique=True,
         index=True,
-        description="JWT-Token (eindeutig)"
+        max_length=64,
+        description="SHA-256-Digest (hex) des JWT; das Token selbst wird nicht gespeichert"
     )
     user_id: UUID = Field(
         foreign_key="users.id",
@@ -624,7 +687,8 @@ class Session(SQLModel, table=True):
         description="Verknüpfte User-ID"
     )
     expires_at: datetime = Field(
-        description="Ablauf-Zeitpunkt (UTC)"
+        index=True,
+        description="Ablauf-Zeitpunkt (UTC); indiziert für den Cleanup abgelaufener Einträge"
     )
     created_at: datetime = Field(
         default_factory=_utc_now,
@@ -644,10 +708,11 @@ class EphemeralToken(SQLModel, table=True):
     ist (siehe TE-11 Finding 2): die Zeile wird serverseitig pro Request erzeugt
     und lässt sich nicht allein aus dem Secret rekonstruieren.
     """
+    model_config = _DEFERRED_SCHEMA
     __tablename__ = "ephemeral_tokens"
 
     id: UUID = Field(
-        default_factory=uuid4,
+        default_factory=uuid7,
         primary_key=True,
         description="Eindeutige Token-ID"
     )
@@ -668,7 +733,8 @@ class EphemeralToken(SQLModel, table=True):
         description="Bezugsobjekt als String: user_id (account_link) oder run_id (log_download)"
     )
     expires_at: datetime = Field(
-        description="Ablauf-Zeitpunkt (UTC)"
+        index=True,
+        description="Ablauf-Zeitpunkt (UTC); indiziert für den Cleanup abgelaufener Einträge"
     )
     consumed_at: Optional[datetime] = Field(
         default=None,
@@ -8,6 +8,7 @@ from app.resilience.resilience import (
     circuit_docker,
     circuit_oauth,
     circuit_s3,
+    circuit_teams,
     with_retry_async,
 )
 from app.resilience.retry_strategy import wait_for_retry
@@ -18,6 +19,7 @@ __all__ = [
     "circuit_docker",
     "circuit_oauth",
     "circuit_s3",
+    "circuit_teams",
     "with_retry_async",
     "wait_for_retry",
 ]
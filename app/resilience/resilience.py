@@ -152,6 +152,7 @@ async def call_async_with_circuit_breaker(
 circuit_docker = CircuitBreaker("docker", failure_threshold=5, recovery_timeout=60.0)
 circuit_s3 = CircuitBreaker("s3", failure_threshold=5, recovery_timeout=60.0)
 circuit_oauth = CircuitBreaker("oauth", failure_threshold=3, recovery_timeout=120.0)
+circuit_teams = CircuitBreaker("teams", failure_threshold=5, recovery_timeout=60.0)
 
 
 # =============================================================================
@@ -0,0 +1,94 @@
+"""
+Ablage von Notebook-Zellen-Ausgaben (Bilder) außerhalb der Datenbank.
+
+Bilder aus Notebook-Zellen kommen Base64-kodiert vom Runner. Statt sie in
+RunCellLog.outputs (JSON) zu speichern, werden sie einmal dekodiert und als
+Datei unter LOGS_DIR/cell_outputs/<run_id>/ abgelegt; in der Datenbank bleibt
+nur ein kleines Manifest ({"mime", "path", "size"}). Das hält die Zeilen klein
+und erspart jedem Lesezugriff das Parsen mehrerer MB JSON.
+
+Die API liefert Bilder weiterhin als {"mime", "data"} (Base64) aus, damit das
+Frontend unverändert bleibt; Altdaten mit eingebettetem "data" funktionieren weiter.
+"""
+
+import base64
+import binascii
+import logging
+import mimetypes
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from app.core.config import config
+
+logger = logging.getLogger(__name__)
+
+CELL_OUTPUTS_DIRNAME = "cell_outputs"
+
+
+def _cell_outputs_root() -> Path:
+    return config.LOGS_DIR / CELL_OUTPUTS_DIRNAME
+
+
+def store_cell_image(
+    run_id: UUID, cell_index: int, image_index: int, mime: str, payload: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Dekodiert ein Base64-Bild und schreibt es als Datei.
+
+    Args:
+        run_id: Run-ID
+        cell_index: Index der Code-Zelle
+        image_index: Laufende Nummer des Bildes innerhalb der Zelle
+        mime: MIME-Typ (z. B. image/png)
+        payload: Base64-kodierte Bilddaten
+
+    Returns:
+        Optional[Dict[str, Any]]: Manifest-Eintrag für RunCellLog.outputs,
+        None wenn payload kein gültiges Base64 ist
+    """
+    try:
+        data = base64.b64decode(payload, validate=True)
+    except (binascii.Error, ValueError):
+        logger.warning("Ungültige Bilddaten für Run %s, Zelle %s", run_id, cell_index)
+        return None
+    extension = mimetypes.guess_extension(mime) or ".bin"
+    relative_path = f"{run_id}/cell_{cell_index}_{image_index}{extension}"
+    target = _cell_outputs_root() / relative_path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(data)
+    return {"mime": mime, "path": relative_path, "size": len(data)}
+
+
+def inline_cell_outputs(outputs: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Ersetzt Datei-Verweise im Manifest durch Base64-Daten (API-Format {"mime", "data"}).
+
+    Einträge mit bereits eingebettetem "data" (Altdaten) bleiben unverändert;
+    fehlende Dateien (z. B. nach Cleanup) werden ausgelassen.
+    """
+    if not outputs or not outputs.get("images"):
+        return outputs
+    root = _cell_outputs_root().resolve()
+    images = []
+    for image in outputs["images"]:
+        if "path" not in image:
+            images.append(image)
+            continue
+        path = (root / image["path"]).resolve()
+        if not path.is_relative_to(root):
+            continue
+        try:
+            data = path.read_bytes()
+        except OSError:
+            continue
+        images.append({"mime": image["mime"], "data": base64.b64encode(data).decode("ascii")})
+    return {**outputs, "images": images}
+
+
+def delete_cell_outputs(run_id: UUID) -> None:
+    """Löscht alle abgelegten Zellen-Ausgaben eines Runs."""
+    run_dir = _cell_outputs_root() / str(run_id)
+    if run_dir.exists():
+        shutil.rmtree(run_dir, ignore_errors=True)
@@ -18,16 +18,25 @@ from uuid import UUID
 
 import docker
 from docker.errors import DockerException, APIError
-from sqlmodel import Session, select, update, func
+from sqlalchemy.orm import defer
+from sqlmodel import Session, delete, select, update, func
 
 from app.core.config import config
 from app.core.database import get_session
-from app.models import PipelineRun, Pipeline, RunStatus
+from app.metrics_prometheus import invalidate_log_metrics
+from app.models import PipelineRun, Pipeline, RunCellLog, RunStatus
+from app.services.cell_outputs import delete_cell_outputs
 from app.services.s3_backup import _s3_backup, append_backup_failure
 from app.services.notifications import notify_s3_backup_failed
 
 logger = logging.getLogger(__name__)
 
+# Für das Löschen alter Runs werden env_vars/parameters nie gelesen: nicht laden/parsen
+_DEFER_RUN_JSON = (defer(PipelineRun.env_vars), defer(PipelineRun.parameters))
+
+# Run-IDs pro Bulk-DELETE (unter dem SQLite-Limit für gebundene Parameter älterer Versionen)
+_DELETE_BATCH_SIZE = 500
+
 # Docker Client (wird beim App-Start initialisiert)
 _docker_client: Optional[docker.DockerClient] = None
 
@@ -99,6 +108,8 @@ async def cleanup_logs(session: Session) -> Dict[str, Any]:
             f"{stats['deleted_metrics']} Metrics-Dateien gelöscht, "
             f"{stats['truncated_logs']} Log-Dateien gekürzt"
         )
+        if stats["deleted_logs"] or stats["truncated_logs"]:
+            invalidate_log_metrics()
         
         return stats
         
@@ -141,6 +152,7 @@ async def _cleanup_by_retention_runs(session: Session, max_runs: int) -> int:
             # Aktive Runs (PENDING/RUNNING, z. B. Dauerläufer) nie löschen
             old_runs = session.exec(
                 select(PipelineRun)
+                .options(*_DEFER_RUN_JSON)
                 .where(PipelineRun.pipeline_name == pipeline.pipeline_name)
                 .where(PipelineRun.status.not_in([RunStatus.PENDING, RunStatus.RUNNING]))
                 .order_by(PipelineRun.started_at.asc())
@@ -149,6 +161,7 @@ async def _cleanup_by_retention_runs(session: Session, max_runs: int) -> int:
             
             # Runs löschen (Logs, Metrics und DB-Einträge)
             skipped_backup_failures = 0
+            deletable_ids: List[UUID] = []
             for run in old_runs:
                 ok, err = await _s3_backup.upload_run_logs(run)
                 if not ok:
@@ -157,9 +170,10 @@ async def _cleanup_by_retention_runs(session: Session, max_runs: int) -> int:
                     skipped_backup_failures += 1
                     continue
                 await _delete_run_files(run)
-                # Datenbank-Eintrag löschen
-                session.delete(run)
-                deleted_count += 1
+                deletable_ids.append(run.id)
+            # Datenbank-Einträge löschen
+            _delete_run_rows(session, deletable_ids)
+            deleted_count += len(deletable_ids)
 
             if skipped_backup_failures > 0:
                 logger.warning(
@@ -203,12 +217,14 @@ async def _cleanup_by_retention_days(session: Session, max_days: int) -> int:
         # Aktive Runs (PENDING/RUNNING, z. B. Dauerläufer) nie löschen
         old_runs = session.exec(
             select(PipelineRun)
+            .options(*_DEFER_RUN_JSON)
             .where(PipelineRun.started_at < cutoff_date)
             .where(PipelineRun.status.not_in([RunStatus.PENDING, RunStatus.RUNNING]))
         ).all()
         
         # Runs löschen (Logs, Metrics und DB-Einträge)
         skipped_backup_failures = 0
+        deletable_ids: List[UUID] = []
         for run in old_runs:
             ok, err = await _s3_backup.upload_run_logs(run)
             if not ok:
@@ -217,9 +233,10 @@ async def _cleanup_by_retention_days(session: Session, max_days: int) -> int:
                 skipped_backup_failures += 1
                 continue
             await _delete_run_files(run)
-            # Datenbank-Eintrag löschen
-            session.delete(run)
-            deleted_count += 1
+            deletable_ids.append(run.id)
+        # Datenbank-Einträge löschen
+        _delete_run_rows(session, deletable_ids)
+        deleted_count = len(deletable_ids)
 
         if skipped_backup_failures > 0:
             logger.warning(
@@ -339,6 +356,24 @@ async def _truncate_log_file(log_file_path: Path, max_size_bytes: int) -> None:
         raise
 
 
+def _delete_run_rows(session: Session, run_ids: List[UUID]) -> None:
+    """
+    Löscht Runs samt Zellen-Logs per Bulk-DELETE in Batches (ohne Commit).
+
+    Ein DELETE ... WHERE id IN (...) pro Batch statt eines ORM-DELETE pro Objekt;
+    run_cell_logs werden mitgelöscht, damit keine verwaisten Zeilen zurückbleiben
+    (bzw. der Foreign Key unter PostgreSQL nicht verletzt wird).
+
+    Args:
+        session: SQLModel Session
+        run_ids: IDs der zu löschenden Runs
+    """
+    for start in range(0, len(run_ids), _DELETE_BATCH_SIZE):
+        batch = run_ids[start:start + _DELETE_BATCH_SIZE]
+        session.execute(delete(RunCellLog).where(RunCellLog.run_id.in_(batch)))
+        session.execute(delete(PipelineRun).where(PipelineRun.id.in_(batch)))
+
+
 async def _delete_run_files(run: PipelineRun) -> None:
     """
     Löscht Log- und Metrics-Dateien für einen Run.
@@ -369,6 +404,9 @@ async def _delete_run_files(run: PipelineRun) -> None:
             except Exception as e:
                 logger.warning(f"Fehler beim Löschen von Metrics-Datei {run.metrics_file}: {e}")
     
+    # Abgelegte Notebook-Zellen-Ausgaben (Bilder) löschen
+    delete_cell_outputs(run.id)
+    
     if deleted_logs > 0 or deleted_metrics > 0:
         logger.debug(
             f"Dateien gelöscht für Run {run.id}: "
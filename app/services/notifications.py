@@ -9,19 +9,29 @@ import asyncio
 import ipaddress
 import logging
 import socket
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional, List
+from functools import lru_cache
+from typing import Awaitable, Optional, List
 from urllib.parse import urlparse
 from uuid import UUID
 
 import aiosmtplib
+from email import policy as email_policy
+from email.message import EmailMessage, Message
 from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 import httpx
 
+from app.core import json_codec
 from app.core.config import config
 from app.models import PipelineRun, RunStatus, User
-from app.resilience.resilience import with_retry_async
+from app.resilience.resilience import (
+    CircuitBreakerOpenError,
+    call_async_with_circuit_breaker,
+    circuit_teams,
+    with_retry_async,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +79,43 @@ def _validate_webhook_url(url: str) -> None:
         raise ValueError(f"Webhook-Host '{hostname}' kann nicht aufgelöst werden")
 
 
+# Geteilter HTTP-Client für Teams-Webhooks: Keep-Alive spart TCP- und TLS-Handshake
+# pro Nachricht. Gebunden an den Event-Loop, in dem er erzeugt wurde.
+_TEAMS_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+_TEAMS_LIMITS = httpx.Limits(max_keepalive_connections=5, max_connections=10, keepalive_expiry=30.0)
+_teams_client: Optional[httpx.AsyncClient] = None
+_teams_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_teams_client() -> Optional[httpx.AsyncClient]:
+    """
+    Liefert den geteilten Teams-Client für den laufenden Event-Loop.
+
+    None, wenn der Client zu einem anderen, noch laufenden Loop gehört (z. B.
+    asyncio.run aus Scheduler-Threads); dann nutzt der Aufrufer einen Einmal-Client.
+    """
+    global _teams_client, _teams_client_loop
+    loop = asyncio.get_running_loop()
+    if _teams_client is not None and _teams_client_loop is not loop:
+        if _teams_client_loop is not None and not _teams_client_loop.is_closed():
+            return None
+        # Loop des alten Clients ist beendet: Client unbrauchbar, neu anlegen
+        _teams_client = None
+    if _teams_client is None or _teams_client.is_closed:
+        _teams_client = httpx.AsyncClient(timeout=_TEAMS_TIMEOUT, limits=_TEAMS_LIMITS)
+        _teams_client_loop = loop
+    return _teams_client
+
+
+async def close_notification_clients() -> None:
+    """Schließt den geteilten Teams-HTTP-Client und die SMTP-Verbindung (beim Shutdown)."""
+    global _teams_client, _teams_client_loop
+    client, _teams_client, _teams_client_loop = _teams_client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+    await _close_shared_smtp()
+
+
 async def _post_teams_webhook(card: dict, *, headers: Optional[dict] = None) -> None:
     """Posts a card payload to the configured Teams webhook after validation."""
     url = config.TEAMS_WEBHOOK_URL
@@ -76,30 +123,277 @@ async def _post_teams_webhook(card: dict, *, headers: Optional[dict] = None) ->
         return
     _validate_webhook_url(url)
     hdrs = headers or {"Content-Type": "application/json"}
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        response = await client.post(url, json=card, headers=hdrs)
+    # Body selbst per orjson serialisieren statt httpx' json= (stdlib json)
+    body = json_codec.dumps_bytes(card)
+
+    async def _post() -> None:
+        client = _get_teams_client()
+        if client is None:
+            async with httpx.AsyncClient(timeout=_TEAMS_TIMEOUT) as one_shot_client:
+                response = await one_shot_client.post(url, content=body, headers=hdrs)
+        else:
+            response = await client.post(url, content=body, headers=hdrs)
         response.raise_for_status()
 
+    # Bei ausgefallenem Webhook nicht jede Meldung das volle Timeout abwarten lassen
+    await call_async_with_circuit_breaker(circuit_teams, _post)
+
 
 def _create_smtp_client() -> aiosmtplib.SMTP:
     """Erzeugt einen korrekt konfigurierten SMTP-Client.
 
     Port 465 = implizites TLS (use_tls), Port 587 = STARTTLS (start_tls).
+    Andere Ports (z. B. interne Relays auf 25/2525) bleiben unverschlüsselt, auch
+    wenn der Server STARTTLS anbietet (oft mit selbstsigniertem Zertifikat).
     """
+    port = config.SMTP_PORT
     return aiosmtplib.SMTP(
         hostname=config.SMTP_HOST,
-        port=config.SMTP_PORT,
-        use_tls=(config.SMTP_PORT == 465),
-        start_tls=(config.SMTP_PORT == 587),
+        port=port,
+        use_tls=(port == 465),
+        start_tls=(port == 587),
     )
 
 
+# Geteilte SMTP-Verbindung: Connect, TLS und Login nur einmal statt pro E-Mail.
+# Wie der Teams-Client an den Event-Loop gebunden; neu aufgebaut, wenn sich die
+# SMTP-Einstellungen ändern oder der Server die Verbindung getrennt hat.
+_smtp_client: Optional[aiosmtplib.SMTP] = None
+_smtp_client_key: Optional[tuple] = None
+_smtp_loop: Optional[asyncio.AbstractEventLoop] = None
+_smtp_lock: Optional[asyncio.Lock] = None
+
+
+def _smtp_settings_key() -> tuple:
+    return (config.SMTP_HOST, config.SMTP_PORT, config.SMTP_USER, config.SMTP_PASSWORD)
+
+
+async def _connect_smtp() -> aiosmtplib.SMTP:
+    smtp = _create_smtp_client()
+    await smtp.connect()
+    if config.SMTP_USER and config.SMTP_PASSWORD:
+        if smtp.get_transport_info("sslcontext") is None:
+            logger.warning(
+                "SMTP-Login bei %s:%s ohne TLS: Zugangsdaten werden im Klartext übertragen",
+                config.SMTP_HOST, config.SMTP_PORT,
+            )
+        await smtp.login(config.SMTP_USER, config.SMTP_PASSWORD)
+    return smtp
+
+
+async def _quit_smtp(smtp: aiosmtplib.SMTP) -> None:
+    try:
+        if smtp.is_connected:
+            await smtp.quit()
+    except aiosmtplib.SMTPException:
+        smtp.close()
+
+
+async def _get_shared_smtp() -> aiosmtplib.SMTP:
+    """Liefert die verbundene geteilte SMTP-Verbindung (nur unter _smtp_lock aufrufen)."""
+    global _smtp_client, _smtp_client_key
+    key = _smtp_settings_key()
+    if _smtp_client is not None and (_smtp_client_key != key or not _smtp_client.is_connected):
+        await _quit_smtp(_smtp_client)
+        _smtp_client = None
+    if _smtp_client is None:
+        _smtp_client = await _connect_smtp()
+        _smtp_client_key = key
+    return _smtp_client
+
+
+async def _send_smtp_message(message: Message) -> None:
+    """
+    Sendet eine E-Mail über die geteilte SMTP-Verbindung.
+
+    Hat der Server die Verbindung inzwischen getrennt (Idle-Timeout), wird einmal
+    neu verbunden. Läuft die geteilte Verbindung in einem anderen, noch aktiven
+    Event-Loop (asyncio.run aus Threads), wird eine Einmal-Verbindung genutzt.
+    """
+    global _smtp_client, _smtp_loop, _smtp_lock
+    loop = asyncio.get_running_loop()
+    if _smtp_loop is not loop:
+        if _smtp_loop is not None and not _smtp_loop.is_closed():
+            smtp = await _connect_smtp()
+            try:
+                await smtp.send_message(message)
+            finally:
+                await _quit_smtp(smtp)
+            return
+        # Loop der alten Verbindung ist beendet: Verbindung und Lock sind unbrauchbar
+        _smtp_client, _smtp_loop, _smtp_lock = None, loop, asyncio.Lock()
+    async with _smtp_lock:
+        smtp = await _get_shared_smtp()
+        try:
+            await smtp.send_message(message)
+        except aiosmtplib.SMTPServerDisconnected:
+            _smtp_client = None
+            smtp = await _get_shared_smtp()
+            await smtp.send_message(message)
+
+
+async def _close_shared_smtp() -> None:
+    global _smtp_client, _smtp_loop, _smtp_lock
+    smtp, _smtp_client = _smtp_client, None
+    if smtp is not None and _smtp_loop is asyncio.get_running_loop():
+        await _quit_smtp(smtp)
+    _smtp_loop, _smtp_lock = None, None
+
+
+def _plain_text_message(subject: str, body: str, recipients: List[str]) -> MIMEText:
+    """
+    Baut eine reine Text-E-Mail als einzelnes MIMEText-Objekt.
+
+    Ohne multipart/alternative-Hülle: kein Boundary, nur ein Part zu serialisieren.
+    """
+    message = MIMEText(body, "plain", "utf-8")
+    message["From"] = config.SMTP_FROM
+    message["To"] = ", ".join(recipients)
+    message["Subject"] = subject
+    return message
+
+
 # Retry-Konfiguration für Benachrichtigungen
 _NOTIFY_RETRY_ATTEMPTS = 3
 _NOTIFY_RETRY_MIN_WAIT = 2.0
 _NOTIFY_RETRY_MAX_WAIT = 15.0
 
 
+async def _send_smtp_with_retry(message: Message) -> None:
+    """_send_smtp_message mit Retry bei Netzwerk-/Transportfehlern (Hintergrund-Alerts)."""
+    await with_retry_async(
+        _send_smtp_message,
+        message,
+        stop_attempts=_NOTIFY_RETRY_ATTEMPTS,
+        min_wait=_NOTIFY_RETRY_MIN_WAIT,
+        max_wait=_NOTIFY_RETRY_MAX_WAIT,
+    )
+
+
+async def _post_teams_with_retry(card: dict) -> None:
+    """_post_teams_webhook mit Retry; bei offenem Circuit Breaker sofortiger Abbruch."""
+    await with_retry_async(
+        _post_teams_webhook,
+        card,
+        stop_attempts=_NOTIFY_RETRY_ATTEMPTS,
+        min_wait=_NOTIFY_RETRY_MIN_WAIT,
+        max_wait=_NOTIFY_RETRY_MAX_WAIT,
+    )
+
+# Duplikat-Unterdrückung: dieselbe (Run-ID, Status)-Meldung innerhalb des Fensters
+# nur einmal senden (z. B. wenn Executor und Recovery denselben Run melden)
+_NOTIFY_DEDUP_TTL_SECONDS = 60.0
+_NOTIFY_DEDUP_MAX_ENTRIES = 1024
+_recent_notifications: "OrderedDict[tuple[UUID, RunStatus], float]" = OrderedDict()
+
+
+# Run-Benachrichtigungen laufen über eine begrenzte Queue mit festen Worker-Tasks:
+# keine unbegrenzte Zahl paralleler Sende-Tasks bei Bursts, Tasks bleiben referenziert
+_NOTIFY_QUEUE_MAXSIZE = 512
+_NOTIFY_WORKERS = 2
+_NOTIFY_DRAIN_TIMEOUT_SECONDS = 5.0
+_notify_queue: Optional["asyncio.Queue[tuple[PipelineRun, RunStatus]]"] = None
+_notify_loop: Optional[asyncio.AbstractEventLoop] = None
+_notify_tasks: set[asyncio.Task] = set()
+_notify_fallback_tasks: set[asyncio.Task] = set()
+
+
+async def _notification_worker(queue: "asyncio.Queue[tuple[PipelineRun, RunStatus]]") -> None:
+    while True:
+        run, status = await queue.get()
+        try:
+            await _send_notifications_async(run, status)
+        finally:
+            queue.task_done()
+
+
+def start_notification_workers() -> None:
+    """Startet die Notification-Worker im laufenden Event-Loop (beim App-Start)."""
+    global _notify_queue, _notify_loop
+    if _notify_tasks:
+        return
+    _notify_queue = asyncio.Queue(maxsize=_NOTIFY_QUEUE_MAXSIZE)
+    _notify_loop = asyncio.get_running_loop()
+    for i in range(_NOTIFY_WORKERS):
+        _notify_tasks.add(
+            asyncio.create_task(_notification_worker(_notify_queue), name=f"notification-worker-{i}")
+        )
+
+
+async def stop_notification_workers() -> None:
+    """Arbeitet ausstehende Benachrichtigungen kurz ab und beendet die Worker (Shutdown)."""
+    global _notify_queue, _notify_loop
+    queue = _notify_queue
+    if queue is not None:
+        try:
+            await asyncio.wait_for(queue.join(), timeout=_NOTIFY_DRAIN_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.warning("%d Benachrichtigung(en) beim Shutdown verworfen", queue.qsize())
+    tasks = list(_notify_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _notify_tasks.clear()
+    _notify_queue, _notify_loop = None, None
+
+
+def _put_notification(
+    queue: "asyncio.Queue[tuple[PipelineRun, RunStatus]]", run: PipelineRun, status: RunStatus
+) -> None:
+    """Legt eine Meldung in die Queue (im Worker-Loop); bei voller Queue fällt die älteste weg."""
+    if queue.full():
+        dropped_run, _ = queue.get_nowait()
+        queue.task_done()
+        logger.warning("Notification-Queue voll, Benachrichtigung für Run %s verworfen", dropped_run.id)
+    queue.put_nowait((run, status))
+
+
+def _enqueue_notification(run: PipelineRun, status: RunStatus) -> None:
+    """Reiht eine Run-Benachrichtigung ein; bei voller Queue fällt die älteste weg."""
+    queue, loop = _notify_queue, _notify_loop
+    try:
+        current = asyncio.get_running_loop()
+    except RuntimeError:
+        current = None
+    if queue is not None and loop is not None:
+        if loop is current:
+            _put_notification(queue, run, status)
+            return
+        # Aufruf aus einem anderen Thread/Loop (z. B. asyncio.run im Scheduler):
+        # an den Worker-Loop übergeben, statt einen Task zu starten, den asyncio.run
+        # beim Beenden abbrechen würde
+        try:
+            loop.call_soon_threadsafe(_put_notification, queue, run, status)
+            return
+        except RuntimeError:
+            pass  # Worker-Loop bereits geschlossen
+    if current is None:
+        logger.warning("Kein Event-Loop aktiv, Benachrichtigung für Run %s verworfen", run.id)
+        return
+    # Ohne Worker (Tests, Skripte): eigener Task, stark referenziert
+    task = current.create_task(_send_notifications_async(run, status))
+    _notify_fallback_tasks.add(task)
+    task.add_done_callback(_notify_fallback_tasks.discard)
+
+
+def _is_duplicate_notification(run_id: UUID, status: RunStatus) -> bool:
+    """Prüft und merkt (run_id, status); True, wenn kürzlich schon gemeldet."""
+    now = time.monotonic()
+    # Einträge sind nach Zeit sortiert: abgelaufene liegen vorne
+    while _recent_notifications:
+        oldest_key, sent_at = next(iter(_recent_notifications.items()))
+        if now - sent_at <= _NOTIFY_DEDUP_TTL_SECONDS:
+            break
+        del _recent_notifications[oldest_key]
+    key = (run_id, status)
+    if key in _recent_notifications:
+        return True
+    _recent_notifications[key] = now
+    if len(_recent_notifications) > _NOTIFY_DEDUP_MAX_ENTRIES:
+        _recent_notifications.popitem(last=False)
+    return False
+
+
 async def notify_s3_backup_failed(run: PipelineRun, error_message: str) -> None:
     """
     Benachrichtigt bei S3-Backup-Fehler: E-Mail an EMAIL_RECIPIENTS und
@@ -124,43 +418,27 @@ Fehler: {error_message}
 
 Bitte S3/MinIO-Konfiguration und -Erreichbarkeit prüfen. Der Run und die Dateien bleiben lokal erhalten; ein erneuter Backup-Versuch erfolgt beim nächsten Cleanup.
 """
-            message = MIMEMultipart("alternative")
-            message["From"] = config.SMTP_FROM
-            message["To"] = ", ".join(config.EMAIL_RECIPIENTS)
-            message["Subject"] = subject
-            message.attach(MIMEText(body, "plain"))
-            smtp = _create_smtp_client()
-            await smtp.connect()
-            if config.SMTP_USER and config.SMTP_PASSWORD:
-                await smtp.login(config.SMTP_USER, config.SMTP_PASSWORD)
-            await smtp.send_message(message)
-            await smtp.quit()
+            message = _plain_text_message(subject, body, config.EMAIL_RECIPIENTS)
+            await _send_smtp_with_retry(message)
             logger.info("E-Mail (S3-Backup-Fehler) an EMAIL_RECIPIENTS gesendet, Run %s", run.id)
         except Exception as e:
             logger.error("Fehler beim Senden der S3-Backup-Fehler-E-Mail für Run %s: %s", run.id, e, exc_info=True)
     # Microsoft Teams (wenn TEAMS_ENABLED und TEAMS_WEBHOOK_URL gesetzt)
     if config.TEAMS_ENABLED and config.TEAMS_WEBHOOK_URL:
         try:
-            frontend_url = getattr(config, "FRONTEND_URL", None) or config.BASE_URL or ""
-            run_url = f"{frontend_url.rstrip('/')}/runs/{run.id}" if frontend_url else None
-            card = {
-                "@type": "MessageCard",
-                "@context": "https://schema.org/extensions",
-                "summary": f"S3 Log-Backup fehlgeschlagen: {run.pipeline_name}",
-                "themeColor": "F44336",
-                "title": "S3 Log-Backup fehlgeschlagen",
-                "sections": [{
-                    "activityTitle": f"Pipeline: {run.pipeline_name}",
-                    "facts": [
-                        {"title": "Run-ID", "value": str(run.id)},
-                        {"title": "Fehler", "value": error_message[:500]},
-                    ],
-                    "markdown": True,
-                }],
-            }
-            if run_url:
-                card["potentialAction"] = [{"@type": "OpenUri", "name": "Run anzeigen", "targets": [{"os": "default", "uri": run_url}]}]
-            await _post_teams_webhook(card)
+            run_url = _frontend_link(f"/runs/{run.id}")
+            card = _message_card(
+                summary=f"S3 Log-Backup fehlgeschlagen: {run.pipeline_name}",
+                title="S3 Log-Backup fehlgeschlagen",
+                theme_color="F44336",
+                activity_title=f"Pipeline: {run.pipeline_name}",
+                facts=[
+                    {"title": "Run-ID", "value": str(run.id)},
+                    {"title": "Fehler", "value": error_message[:500]},
+                ],
+                action=("Run anzeigen", run_url) if run_url else None,
+            )
+            await _post_teams_with_retry(card)
             logger.info("Teams (S3-Backup-Fehler) gesendet, Run %s", run.id)
         except Exception as e:
             logger.error("Fehler beim Senden der S3-Backup-Fehler-Teams-Nachricht für Run %s: %s", run.id, e, exc_info=True)
@@ -196,17 +474,8 @@ Provider: {provider}
 
 Bitte prüfen Sie die Beitrittsanfragen unter: Users – Beitrittsanfragen.
 """
-        message = MIMEMultipart("alternative")
-        message["From"] = config.SMTP_FROM
-        message["To"] = ", ".join(config.EMAIL_RECIPIENTS)
-        message["Subject"] = subject
-        message.attach(MIMEText(body, "plain"))
-        smtp = _create_smtp_client()
-        await smtp.connect()
-        if config.SMTP_USER and config.SMTP_PASSWORD:
-            await smtp.login(config.SMTP_USER, config.SMTP_PASSWORD)
-        await smtp.send_message(message)
-        await smtp.quit()
+        message = _plain_text_message(subject, body, config.EMAIL_RECIPIENTS)
+        await _send_smtp_message(message)
         logger.info("E-Mail-Benachrichtigung für Beitrittsanfrage %s gesendet", user.username)
     except Exception as e:
         logger.error("Fehler beim Senden der E-Mail für Beitrittsanfrage %s: %s", user.username, e, exc_info=True)
@@ -216,8 +485,7 @@ async def notify_user_approved(user: User) -> None:
     """Sendet E-Mail an Nutzer: Sie wurden freigegeben, bitte unter {FRONTEND_URL}/login anmelden."""
     if not config.EMAIL_ENABLED or not user.email or not config.SMTP_HOST or not config.SMTP_FROM:
         return
-    frontend = (config.FRONTEND_URL or config.BASE_URL or "http://localhost:8000").rstrip("/")
-    login_url = f"{frontend}/login"
+    login_url = _frontend_link("/login") or "http://localhost:8000/login"
     subject = "[FastFlow] Sie wurden freigegeben"
     body = f"""Hallo {user.username},
 
@@ -226,17 +494,8 @@ Ihre Beitrittsanfrage wurde freigegeben. Sie können sich jetzt anmelden:
 {login_url}
 """
     try:
-        message = MIMEMultipart("alternative")
-        message["From"] = config.SMTP_FROM
-        message["To"] = user.email
-        message["Subject"] = subject
-        message.attach(MIMEText(body, "plain"))
-        smtp = _create_smtp_client()
-        await smtp.connect()
-        if config.SMTP_USER and config.SMTP_PASSWORD:
-            await smtp.login(config.SMTP_USER, config.SMTP_PASSWORD)
-        await smtp.send_message(message)
-        await smtp.quit()
+        message = _plain_text_message(subject, body, [user.email])
+        await _send_smtp_message(message)
     except Exception as e:
         logger.warning("E-Mail an Nutzer bei Freigabe fehlgeschlagen (user=%s): %s", user.username, e)
 
@@ -255,9 +514,17 @@ async def send_notifications(run: PipelineRun, status: RunStatus) -> None:
     # Nur bei Fehlern benachrichtigen
     if status not in (RunStatus.FAILED, RunStatus.INTERRUPTED):
         return
+
+    # Ohne aktiven Kanal weder Dedup-Eintrag noch Queue-Job anlegen
+    if not config.EMAIL_ENABLED and not config.TEAMS_ENABLED:
+        return
+
+    if _is_duplicate_notification(run.id, status):
+        logger.debug("Benachrichtigung für Run %s (%s) bereits gesendet, übersprungen", run.id, status.value)
+        return
     
     # Asynchron im Hintergrund senden (nicht blockierend)
-    asyncio.create_task(_send_notifications_async(run, status))
+    _enqueue_notification(run, status)
 
 
 async def _send_notifications_async(run: PipelineRun, status: RunStatus) -> None:
@@ -268,22 +535,22 @@ async def _send_notifications_async(run: PipelineRun, status: RunStatus) -> None
         run: PipelineRun-Objekt
         status: RunStatus
     """
-    try:
-        # E-Mail-Benachrichtigung senden
-        if config.EMAIL_ENABLED:
-            try:
-                await send_email_notification(run, status)
-            except Exception as e:
-                logger.error(f"Fehler beim Senden der E-Mail-Benachrichtigung für Run {run.id}: {e}", exc_info=True)
-        
-        # Teams-Benachrichtigung senden
-        if config.TEAMS_ENABLED:
-            try:
-                await send_teams_notification(run, status)
-            except Exception as e:
-                logger.error(f"Fehler beim Senden der Teams-Benachrichtigung für Run {run.id}: {e}", exc_info=True)
-    except Exception as e:
-        logger.error(f"Unerwarteter Fehler beim Senden von Benachrichtigungen für Run {run.id}: {e}", exc_info=True)
+    # E-Mail (SMTP) und Teams (Webhook) sind unabhängig voneinander und laufen parallel
+    channels: List[tuple[str, Awaitable[None]]] = []
+    if config.EMAIL_ENABLED:
+        channels.append(("E-Mail", send_email_notification(run, status)))
+    if config.TEAMS_ENABLED:
+        channels.append(("Teams", send_teams_notification(run, status)))
+    if not channels:
+        return
+
+    results = await asyncio.gather(*(coro for _, coro in channels), return_exceptions=True)
+    for (channel, _), result in zip(channels, results):
+        if isinstance(result, Exception):
+            logger.error(
+                f"Fehler beim Senden der {channel}-Benachrichtigung für Run {run.id}: {result}",
+                exc_info=result,
+            )
 
 
 async def send_email_notification(run: PipelineRun, status: RunStatus) -> None:
@@ -307,31 +574,22 @@ async def send_email_notification(run: PipelineRun, status: RunStatus) -> None:
     
     try:
         # E-Mail-Template erstellen
-        subject, html_body, text_body = _render_email_template(run, status)
-        
-        # E-Mail-Nachricht erstellen
-        message = MIMEMultipart("alternative")
-        message["From"] = config.SMTP_FROM
-        message["To"] = ", ".join(config.EMAIL_RECIPIENTS)
-        message["Subject"] = subject
+        with_html = config.EMAIL_HTML_ENABLED
+        subject, html_body, text_body = _render_email_template(run, status, with_html=with_html)
         
-        # HTML und Text-Version hinzufügen
-        message.attach(MIMEText(text_body, "plain"))
-        message.attach(MIMEText(html_body, "html"))
+        if with_html:
+            # E-Mail-Nachricht erstellen (multipart/alternative mit Text- und HTML-Teil)
+            message = EmailMessage(policy=email_policy.SMTP)
+            message["From"] = config.SMTP_FROM
+            message["To"] = ", ".join(config.EMAIL_RECIPIENTS)
+            message["Subject"] = subject
+            message.set_content(text_body)
+            message.add_alternative(html_body, subtype="html")
+        else:
+            message = _plain_text_message(subject, text_body, config.EMAIL_RECIPIENTS)
         
         # E-Mail senden (mit Retry bei Netzwerkfehlern)
-        async def _send_smtp():
-            async with _create_smtp_client() as smtp:
-                if config.SMTP_USER and config.SMTP_PASSWORD:
-                    await smtp.login(config.SMTP_USER, config.SMTP_PASSWORD)
-                await smtp.send_message(message)
-
-        await with_retry_async(
-            _send_smtp,
-            stop_attempts=_NOTIFY_RETRY_ATTEMPTS,
-            min_wait=_NOTIFY_RETRY_MIN_WAIT,
-            max_wait=_NOTIFY_RETRY_MAX_WAIT,
-        )
+        await _send_smtp_with_retry(message)
         logger.info(f"E-Mail-Benachrichtigung für Run {run.id} erfolgreich gesendet")
         
     except Exception as e:
@@ -361,17 +619,11 @@ async def send_teams_notification(run: PipelineRun, status: RunStatus) -> None:
         # Teams Adaptive Card erstellen
         card = _create_teams_card(run, status)
         
-        async def _post_teams():
-            await _post_teams_webhook(card)
-
-        await with_retry_async(
-            _post_teams,
-            stop_attempts=_NOTIFY_RETRY_ATTEMPTS,
-            min_wait=_NOTIFY_RETRY_MIN_WAIT,
-            max_wait=_NOTIFY_RETRY_MAX_WAIT,
-        )
+        await _post_teams_with_retry(card)
         logger.info(f"Teams-Benachrichtigung für Run {run.id} erfolgreich gesendet")
         
+    except CircuitBreakerOpenError as e:
+        logger.warning(f"Teams-Benachrichtigung für Run {run.id} übersprungen: {e}")
     except httpx.HTTPError as e:
         logger.error(f"HTTP-Fehler beim Senden der Teams-Benachrichtigung für Run {run.id}: {e}", exc_info=True)
         raise
@@ -392,18 +644,9 @@ async def send_custom_email(subject: str, body: str, recipients: Optional[List[s
     if not to_list:
         logger.warning("E-Mail nicht gesendet: keine Empfänger")
         return
-    message = MIMEMultipart("alternative")
-    message["From"] = config.SMTP_FROM
-    message["To"] = ", ".join(to_list)
-    message["Subject"] = subject
-    message.attach(MIMEText(body, "plain"))
+    message = _plain_text_message(subject, body, to_list)
     try:
-        smtp = _create_smtp_client()
-        await smtp.connect()
-        if config.SMTP_USER and config.SMTP_PASSWORD:
-            await smtp.login(config.SMTP_USER, config.SMTP_PASSWORD)
-        await smtp.send_message(message)
-        await smtp.quit()
+        await _send_smtp_message(message)
         logger.info("Custom E-Mail gesendet an %s", ", ".join(to_list))
     except Exception as e:
         logger.error("Fehler beim Senden der Custom-E-Mail: %s", e, exc_info=True)
@@ -448,55 +691,47 @@ def _is_daemon_pipeline(run: PipelineRun) -> bool:
         return False
 
 
-def _render_email_template(run: PipelineRun, status: RunStatus) -> tuple[str, str, str]:
-    """
-    Erstellt E-Mail-Template für einen fehlgeschlagenen Run.
-    
-    Args:
-        run: PipelineRun-Objekt
-        status: RunStatus
-        
-    Returns:
-        Tuple von (subject, html_body, text_body)
-    """
-    status_text = "fehlgeschlagen" if status == RunStatus.FAILED else "abgebrochen"
-    status_color = "#F44336" if status == RunStatus.FAILED else "#FF9800"
-    daemon_hint = " (Dauerläufer)" if _is_daemon_pipeline(run) else ""
-    
-    # Dauer berechnen
-    duration = "N/A"
-    if run.started_at and run.finished_at:
-        delta = run.finished_at - run.started_at
-        total_seconds = int(delta.total_seconds())
-        if total_seconds < 60:
-            duration = f"{total_seconds}s"
-        elif total_seconds < 3600:
-            minutes = total_seconds // 60
-            seconds = total_seconds % 60
-            duration = f"{minutes}m {seconds}s"
-        else:
-            hours = total_seconds // 3600
-            minutes = (total_seconds % 3600) // 60
-            duration = f"{hours}h {minutes}m"
-    
-    # Frontend-URL (falls konfiguriert)
-    frontend_url = getattr(config, 'FRONTEND_URL', None)
-    run_url = f"{frontend_url}/runs/{run.id}" if frontend_url else None
-    
-    subject = f"[FastFlow] Pipeline {run.pipeline_name} {status_text}{daemon_hint}"
-    
-    # Exit-Code HTML erstellen (außerhalb des f-strings wegen Backslash-Problemen)
-    exit_code_html = ""
-    if run.exit_code is not None:
-        exit_code_html = f'<div class="info-row"><span class="label">Exit-Code:</span><span class="value">{run.exit_code}</span></div>'
-    
-    # Run-URL Button HTML erstellen
-    run_url_html = ""
-    if run_url:
-        run_url_html = f'<a href="{run_url}" class="button">Run-Details anzeigen</a>'
-    
-    # HTML-Body
-    html_body = f"""
+# Status-abhängige Texte/Farben: (Text, Text groß, E-Mail-Farbe, Teams-themeColor).
+# Rot für FAILED, Orange für INTERRUPTED (und alle übrigen Status)
+_STATUS_META = {
+    RunStatus.FAILED: ("fehlgeschlagen", "Fehlgeschlagen", "#F44336", "FF0000"),
+    RunStatus.INTERRUPTED: ("abgebrochen", "Abgebrochen", "#FF9800", "FF9800"),
+}
+
+
+def _status_meta(status: RunStatus) -> tuple[str, str, str, str]:
+    return _STATUS_META.get(status, _STATUS_META[RunStatus.INTERRUPTED])
+
+
+# E-Mail und Teams formatieren für denselben Run dieselben Zeitpunkte: gecacht
+@lru_cache(maxsize=256)
+def _format_duration(started: Optional[datetime], finished: Optional[datetime]) -> str:
+    """Formatiert die Run-Dauer als "42s", "5m 3s" oder "2h 10m" ("N/A" ohne Start/Ende)."""
+    if not started or not finished:
+        return "N/A"
+    total_seconds = int((finished - started).total_seconds())
+    if total_seconds < 60:
+        return f"{total_seconds}s"
+    if total_seconds < 3600:
+        return f"{total_seconds // 60}m {total_seconds % 60}s"
+    return f"{total_seconds // 3600}h {(total_seconds % 3600) // 60}m"
+
+
+@lru_cache(maxsize=256)
+def _format_ts(value: Optional[datetime]) -> str:
+    """Formatiert einen Zeitpunkt für Benachrichtigungen ("N/A" wenn nicht gesetzt)."""
+    return value.strftime('%Y-%m-%d %H:%M:%S UTC') if value else "N/A"
+
+
+def _frontend_link(path: str) -> Optional[str]:
+    """Absoluter Link ins Frontend (FRONTEND_URL, sonst BASE_URL); None ohne Basis-URL."""
+    base = (config.FRONTEND_URL or config.BASE_URL or "").rstrip("/")
+    return f"{base}{path}" if base else None
+
+
+# Statische Gerüste der Run-Benachrichtigung (einmal beim Import gebaut); pro Run
+# werden nur die Felder per format_map eingesetzt. CSS-Klammern sind verdoppelt.
+_EMAIL_HTML_TEMPLATE = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -515,28 +750,28 @@ def _render_email_template(run: PipelineRun, status: RunStatus) -> tuple[str, st
     <body>
         <div class="container">
             <div class="header">
-                <h2>Pipeline {status_text.capitalize()}</h2>
+                <h2>Pipeline {status_text_cap}</h2>
             </div>
             <div class="content">
                 <div class="info-row">
                     <span class="label">Pipeline:</span>
-                    <span class="value">{run.pipeline_name}{daemon_hint}</span>
+                    <span class="value">{pipeline_name}{daemon_hint}</span>
                 </div>
                 <div class="info-row">
                     <span class="label">Run-ID:</span>
-                    <span class="value">{run.id}</span>
+                    <span class="value">{run_id}</span>
                 </div>
                 <div class="info-row">
                     <span class="label">Status:</span>
-                    <span class="value">{status.value}</span>
+                    <span class="value">{status_value}</span>
                 </div>
                 <div class="info-row">
                     <span class="label">Start-Zeit:</span>
-                    <span class="value">{run.started_at.strftime('%Y-%m-%d %H:%M:%S UTC') if run.started_at else 'N/A'}</span>
+                    <span class="value">{started}</span>
                 </div>
                 <div class="info-row">
                     <span class="label">End-Zeit:</span>
-                    <span class="value">{run.finished_at.strftime('%Y-%m-%d %H:%M:%S UTC') if run.finished_at else 'N/A'}</span>
+                    <span class="value">{finished}</span>
                 </div>
                 <div class="info-row">
                     <span class="label">Dauer:</span>
@@ -549,24 +784,116 @@ def _render_email_template(run: PipelineRun, status: RunStatus) -> tuple[str, st
     </body>
     </html>
     """
-    
-    # Text-Body (Fallback)
-    text_body = f"""
-Pipeline {status_text.capitalize()}{daemon_hint}
 
-Pipeline: {run.pipeline_name}
-Run-ID: {run.id}
-Status: {status.value}
-Start-Zeit: {run.started_at.strftime('%Y-%m-%d %H:%M:%S UTC') if run.started_at else 'N/A'}
-End-Zeit: {run.finished_at.strftime('%Y-%m-%d %H:%M:%S UTC') if run.finished_at else 'N/A'}
+# Entspricht html.escape(quote=True), aber als eine einzige C-Schleife pro Wert
+_HTML_TRANS = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"})
+
+_EMAIL_TEXT_TEMPLATE = """
+Pipeline {status_text_cap}{daemon_hint}
+
+Pipeline: {pipeline_name}
+Run-ID: {run_id}
+Status: {status_value}
+Start-Zeit: {started}
+End-Zeit: {finished}
 Dauer: {duration}
-{f'Exit-Code: {run.exit_code}' if run.exit_code is not None else ''}
-{f'Run-Details: {run_url}' if run_url else ''}
-    """.strip()
+{exit_code_line}
+{run_url_line}
+    """
+
+
+def _render_email_template(
+    run: PipelineRun, status: RunStatus, *, with_html: bool = True
+) -> tuple[str, str, str]:
+    """
+    Erstellt E-Mail-Template für einen fehlgeschlagenen Run.
+    
+    Args:
+        run: PipelineRun-Objekt
+        status: RunStatus
+        with_html: False = HTML-Body nicht rendern (leerer String)
+        
+    Returns:
+        Tuple von (subject, html_body, text_body)
+    """
+    status_text, status_text_cap, status_color, _ = _status_meta(status)
+    daemon_hint = " (Dauerläufer)" if _is_daemon_pipeline(run) else ""
+    
+    duration = _format_duration(run.started_at, run.finished_at)
+    
+    run_url = _frontend_link(f"/runs/{run.id}")
+    
+    subject = f"[FastFlow] Pipeline {run.pipeline_name} {status_text}{daemon_hint}"
+    
+    # Exit-Code HTML erstellen (außerhalb des f-strings wegen Backslash-Problemen)
+    exit_code_html = ""
+    if run.exit_code is not None:
+        exit_code_html = f'<div class="info-row"><span class="label">Exit-Code:</span><span class="value">{run.exit_code}</span></div>'
+    
+    # Run-URL Button HTML erstellen
+    run_url_html = ""
+    if run_url:
+        run_url_html = f'<a href="{run_url.translate(_HTML_TRANS)}" class="button">Run-Details anzeigen</a>'
+    
+    started = _format_ts(run.started_at)
+    finished = _format_ts(run.finished_at)
+    fields = {
+        "status_color": status_color,
+        "status_text_cap": status_text_cap,
+        "pipeline_name": run.pipeline_name,
+        "daemon_hint": daemon_hint,
+        "run_id": run.id,
+        "status_value": status.value,
+        "started": started,
+        "finished": finished,
+        "duration": duration,
+        "exit_code_html": exit_code_html,
+        "run_url_html": run_url_html,
+        "exit_code_line": f"Exit-Code: {run.exit_code}" if run.exit_code is not None else "",
+        "run_url_line": f"Run-Details: {run_url}" if run_url else "",
+    }
+    # Nutzerkontrollierte Werte nur im HTML-Teil escapen; der Text-Teil bleibt roh
+    html_body = ""
+    if with_html:
+        html_body = _EMAIL_HTML_TEMPLATE.format_map(
+            {**fields, "pipeline_name": run.pipeline_name.translate(_HTML_TRANS)}
+        )
+    # Text-Body (Fallback)
+    text_body = _EMAIL_TEXT_TEMPLATE.format_map(fields).strip()
     
     return subject, html_body, text_body
 
 
+def _message_card(
+    summary: str,
+    title: str,
+    theme_color: str,
+    activity_title: str,
+    facts: List[dict],
+    action: Optional[tuple[str, str]] = None,
+) -> dict:
+    """
+    Baut eine Teams-MessageCard mit einer Fakten-Sektion.
+
+    Args:
+        action: Optional (Button-Text, URL) für einen OpenUri-Button
+    """
+    card = {
+        "@type": "MessageCard",
+        "@context": "https://schema.org/extensions",
+        "summary": summary,
+        "themeColor": theme_color,
+        "title": title,
+        "sections": [{"activityTitle": activity_title, "facts": facts, "markdown": True}],
+    }
+    if action is not None:
+        name, uri = action
+        card["potentialAction"] = [
+            {"@type": "OpenUri", "name": name, "targets": [{"os": "default", "uri": uri}]}
+        ]
+    return card
+
+
 def _create_teams_card(run: PipelineRun, status: RunStatus) -> dict:
     """
     Erstellt eine Microsoft Teams Adaptive Card für einen fehlgeschlagenen Run.
@@ -578,36 +905,19 @@ def _create_teams_card(run: PipelineRun, status: RunStatus) -> dict:
     Returns:
         Dictionary mit Adaptive Card JSON
     """
-    status_text = "Fehlgeschlagen" if status == RunStatus.FAILED else "Abgebrochen"
-    status_color = "attention" if status == RunStatus.FAILED else "warning"
+    _, status_text, _, theme_color = _status_meta(status)
     daemon_hint = " (Dauerläufer)" if _is_daemon_pipeline(run) else ""
     
-    # Dauer berechnen
-    duration = "N/A"
-    if run.started_at and run.finished_at:
-        delta = run.finished_at - run.started_at
-        total_seconds = int(delta.total_seconds())
-        if total_seconds < 60:
-            duration = f"{total_seconds}s"
-        elif total_seconds < 3600:
-            minutes = total_seconds // 60
-            seconds = total_seconds % 60
-            duration = f"{minutes}m {seconds}s"
-        else:
-            hours = total_seconds // 3600
-            minutes = (total_seconds % 3600) // 60
-            duration = f"{hours}h {minutes}m"
+    duration = _format_duration(run.started_at, run.finished_at)
     
-    # Frontend-URL (falls konfiguriert)
-    frontend_url = getattr(config, 'FRONTEND_URL', None)
-    run_url = f"{frontend_url}/runs/{run.id}" if frontend_url else None
+    run_url = _frontend_link(f"/runs/{run.id}")
     
     facts = [
         {"title": "Pipeline", "value": run.pipeline_name},
         {"title": "Run-ID", "value": str(run.id)[:8] + "..."},
         {"title": "Status", "value": status.value},
-        {"title": "Start-Zeit", "value": run.started_at.strftime('%Y-%m-%d %H:%M:%S UTC') if run.started_at else "N/A"},
-        {"title": "End-Zeit", "value": run.finished_at.strftime('%Y-%m-%d %H:%M:%S UTC') if run.finished_at else "N/A"},
+        {"title": "Start-Zeit", "value": _format_ts(run.started_at)},
+        {"title": "End-Zeit", "value": _format_ts(run.finished_at)},
         {"title": "Dauer", "value": duration},
     ]
     
@@ -615,37 +925,14 @@ def _create_teams_card(run: PipelineRun, status: RunStatus) -> dict:
         facts.append({"title": "Exit-Code", "value": str(run.exit_code)})
     
     # Microsoft Teams MessageCard Format (kompatibel mit Webhooks)
-    card = {
-        "@type": "MessageCard",
-        "@context": "https://schema.org/extensions",
-        "summary": f"Pipeline {run.pipeline_name} {status_text}{daemon_hint}",
-        "themeColor": "FF0000" if status == RunStatus.FAILED else "FF9800",  # Rot für FAILED, Orange für INTERRUPTED
-        "title": f"Pipeline {status_text}{daemon_hint}",
-        "sections": [
-            {
-                "activityTitle": f"Pipeline: {run.pipeline_name}{daemon_hint}",
-                "facts": facts,
-                "markdown": True
-            }
-        ]
-    }
-    
-    # Action-Button hinzufügen, falls URL vorhanden
-    if run_url:
-        card["potentialAction"] = [
-            {
-                "@type": "OpenUri",
-                "name": "Run-Details anzeigen",
-                "targets": [
-                    {
-                        "os": "default",
-                        "uri": run_url
-                    }
-                ]
-            }
-        ]
-    
-    return card
+    return _message_card(
+        summary=f"Pipeline {run.pipeline_name} {status_text}{daemon_hint}",
+        title=f"Pipeline {status_text}{daemon_hint}",
+        theme_color=theme_color,
+        activity_title=f"Pipeline: {run.pipeline_name}{daemon_hint}",
+        facts=facts,
+        action=("Run-Details anzeigen", run_url) if run_url else None,
+    )
 
 
 async def send_soft_limit_notification(run: PipelineRun, resource_type: str, current_value: float, limit_value: float) -> None:
@@ -668,47 +955,27 @@ async def send_soft_limit_notification(run: PipelineRun, resource_type: str, cur
         # E-Mail senden
         if config.EMAIL_ENABLED:
             try:
-                from email.mime.text import MIMEText
-                from email.mime.multipart import MIMEMultipart
-                import aiosmtplib
-                
-                msg = MIMEMultipart("alternative")
-                msg["From"] = config.SMTP_FROM
-                msg["To"] = ", ".join(config.EMAIL_RECIPIENTS)
-                msg["Subject"] = subject
-                msg.attach(MIMEText(message, "plain"))
-                
-                smtp = _create_smtp_client()
-                await smtp.connect()
-                if config.SMTP_USER and config.SMTP_PASSWORD:
-                    await smtp.login(config.SMTP_USER, config.SMTP_PASSWORD)
-                await smtp.send_message(msg)
-                await smtp.quit()
+                msg = _plain_text_message(subject, message, config.EMAIL_RECIPIENTS)
+                await _send_smtp_with_retry(msg)
             except Exception as e:
                 logger.error(f"Fehler beim Senden der Soft-Limit-E-Mail: {e}")
         
         # Teams senden (falls aktiviert)
         if config.TEAMS_ENABLED:
             try:
-                import httpx
-                card = {
-                    "@type": "MessageCard",
-                    "@context": "https://schema.org/extensions",
-                    "summary": subject,
-                    "themeColor": "FF9800",
-                    "title": "Soft-Limit überschritten",
-                    "sections": [{
-                        "activityTitle": f"Pipeline: {run.pipeline_name}",
-                        "facts": [
-                            {"title": "Run-ID", "value": str(run.id)[:8] + "..."},
-                            {"title": "Ressource", "value": resource_type},
-                            {"title": "Aktueller Wert", "value": f"{current_value:.1f}"},
-                            {"title": "Soft-Limit", "value": f"{limit_value:.1f}"},
-                        ],
-                        "markdown": True
-                    }]
-                }
-                await _post_teams_webhook(card)
+                card = _message_card(
+                    summary=subject,
+                    title="Soft-Limit überschritten",
+                    theme_color="FF9800",
+                    activity_title=f"Pipeline: {run.pipeline_name}",
+                    facts=[
+                        {"title": "Run-ID", "value": str(run.id)[:8] + "..."},
+                        {"title": "Ressource", "value": resource_type},
+                        {"title": "Aktueller Wert", "value": f"{current_value:.1f}"},
+                        {"title": "Soft-Limit", "value": f"{limit_value:.1f}"},
+                    ],
+                )
+                await _post_teams_with_retry(card)
             except Exception as e:
                 logger.error(f"Fehler beim Senden der Soft-Limit-Teams-Nachricht: {e}")
     except Exception as e:
@@ -733,44 +1000,22 @@ async def send_scheduler_error_notification(pipeline_name: str, error_message: s
         # E-Mail senden
         if config.EMAIL_ENABLED:
             try:
-                from email.mime.text import MIMEText
-                from email.mime.multipart import MIMEMultipart
-                import aiosmtplib
-                
-                msg = MIMEMultipart("alternative")
-                msg["From"] = config.SMTP_FROM
-                msg["To"] = ", ".join(config.EMAIL_RECIPIENTS)
-                msg["Subject"] = subject
-                msg.attach(MIMEText(message, "plain"))
-                
-                smtp = _create_smtp_client()
-                await smtp.connect()
-                if config.SMTP_USER and config.SMTP_PASSWORD:
-                    await smtp.login(config.SMTP_USER, config.SMTP_PASSWORD)
-                await smtp.send_message(msg)
-                await smtp.quit()
+                msg = _plain_text_message(subject, message, config.EMAIL_RECIPIENTS)
+                await _send_smtp_with_retry(msg)
             except Exception as e:
                 logger.error(f"Fehler beim Senden der Scheduler-Error-E-Mail: {e}")
         
         # Teams senden
         if config.TEAMS_ENABLED:
             try:
-                import httpx
-                card = {
-                    "@type": "MessageCard",
-                    "@context": "https://schema.org/extensions",
-                    "summary": subject,
-                    "themeColor": "F44336",
-                    "title": "Scheduler-Fehler",
-                    "sections": [{
-                        "activityTitle": f"Pipeline: {pipeline_name}",
-                        "facts": [
-                            {"title": "Fehler", "value": error_message},
-                        ],
-                        "markdown": True
-                    }]
-                }
-                await _post_teams_webhook(card)
+                card = _message_card(
+                    summary=subject,
+                    title="Scheduler-Fehler",
+                    theme_color="F44336",
+                    activity_title=f"Pipeline: {pipeline_name}",
+                    facts=[{"title": "Fehler", "value": error_message}],
+                )
+                await _post_teams_with_retry(card)
             except Exception as e:
                 logger.error(f"Fehler beim Senden der Scheduler-Error-Teams-Nachricht: {e}")
     except Exception as e:
@@ -811,43 +1056,27 @@ async def send_dependency_vuln_notification(
 
     if config.EMAIL_ENABLED and config.SMTP_HOST and config.SMTP_FROM and config.EMAIL_RECIPIENTS:
         try:
-            message = MIMEMultipart("alternative")
-            message["From"] = config.SMTP_FROM
-            message["To"] = ", ".join(config.EMAIL_RECIPIENTS)
-            message["Subject"] = subject
-            message.attach(MIMEText(body_text, "plain"))
-            smtp = _create_smtp_client()
-            await smtp.connect()
-            if config.SMTP_USER and config.SMTP_PASSWORD:
-                await smtp.login(config.SMTP_USER, config.SMTP_PASSWORD)
-            await smtp.send_message(message)
-            await smtp.quit()
+            message = _plain_text_message(subject, body_text, config.EMAIL_RECIPIENTS)
+            await _send_smtp_with_retry(message)
             logger.info("E-Mail (Dependency-Audit Schwachstellen) an EMAIL_RECIPIENTS gesendet")
         except Exception as e:
             logger.error("Fehler beim Senden der Dependency-Audit-E-Mail: %s", e, exc_info=True)
 
     if config.TEAMS_ENABLED and config.TEAMS_WEBHOOK_URL:
         try:
-            frontend_url = getattr(config, "FRONTEND_URL", None) or config.BASE_URL or ""
-            deps_url = f"{frontend_url.rstrip('/')}/dependencies" if frontend_url else None
+            deps_url = _frontend_link("/dependencies")
             facts = [{"title": "Pipelines mit Schwachstellen", "value": str(len(vuln_entries))}]
             for r in vuln_entries[:5]:
                 facts.append({"title": r.get("pipeline", "?"), "value": f"{len(r.get('vulnerabilities') or [])} CVE(s)"})
-            card = {
-                "@type": "MessageCard",
-                "@context": "https://schema.org/extensions",
-                "summary": subject,
-                "themeColor": "F44336",
-                "title": "Sicherheitsprüfung: Schwachstellen gefunden",
-                "sections": [{
-                    "activityTitle": "pip-audit hat Schwachstellen in Pipeline-Abhängigkeiten gefunden",
-                    "facts": facts,
-                    "markdown": True,
-                }],
-            }
-            if deps_url:
-                card["potentialAction"] = [{"@type": "OpenUri", "name": "Abhängigkeiten anzeigen", "targets": [{"os": "default", "uri": deps_url}]}]
-            await _post_teams_webhook(card)
+            card = _message_card(
+                summary=subject,
+                title="Sicherheitsprüfung: Schwachstellen gefunden",
+                theme_color="F44336",
+                activity_title="pip-audit hat Schwachstellen in Pipeline-Abhängigkeiten gefunden",
+                facts=facts,
+                action=("Abhängigkeiten anzeigen", deps_url) if deps_url else None,
+            )
+            await _post_teams_with_retry(card)
             logger.info("Teams (Dependency-Audit Schwachstellen) gesendet")
         except Exception as e:
             logger.error("Fehler beim Senden der Dependency-Audit-Teams-Nachricht: %s", e, exc_info=True)
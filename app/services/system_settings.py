@@ -1,9 +1,15 @@
 """SystemSettings singleton helpers."""
 
+from typing import Optional
+
 from sqlmodel import Session
 
 from app.models import SystemSettings
 
+# Losgelöste Kopie des Singletons für lesende Hot-Paths (/ui-display, /auth/me,
+# Login-Provider); wird beim Update über invalidate_system_settings_cache verworfen
+_cached_settings: Optional[SystemSettings] = None
+
 
 def get_system_settings(session: Session) -> SystemSettings:
     """Read SystemSettings singleton (id=1). Creates with defaults if missing."""
@@ -25,3 +31,24 @@ def get_system_settings(session: Session) -> SystemSettings:
         session.commit()
         session.refresh(ss)
     return ss
+
+
+def get_system_settings_cached(session: Session) -> SystemSettings:
+    """
+    Read-only SystemSettings aus dem Prozess-Cache (nur beim ersten Aufruf ein SELECT).
+
+    Das Ergebnis ist an keine Session gebunden und darf nicht verändert werden;
+    zum Schreiben get_system_settings verwenden und danach
+    invalidate_system_settings_cache aufrufen.
+    """
+    global _cached_settings
+    if _cached_settings is None:
+        ss = get_system_settings(session)
+        _cached_settings = SystemSettings.model_validate(ss.model_dump())
+    return _cached_settings
+
+
+def invalidate_system_settings_cache() -> None:
+    """Verwirft den gecachten SystemSettings-Snapshot (nach jedem Update aufrufen)."""
+    global _cached_settings
+    _cached_settings = None
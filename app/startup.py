@@ -407,6 +407,11 @@ async def run_startup_tasks() -> None:
     if not config.TESTING:
         await _run_step("Cleanup-Service", False, init_cleanup, "Cleanup-Service initialisiert")
 
+    def start_notifications():
+        from app.services.notifications import start_notification_workers
+        start_notification_workers()
+    await _run_step("Notification-Worker", False, start_notifications, None)
+
     def schedule_wal_checkpoint():
         from app.core.database import schedule_wal_checkpoint_job
         schedule_wal_checkpoint_job()
@@ -482,4 +487,10 @@ async def run_shutdown_tasks() -> None:
             session.close()
     await _run_step("Graceful Shutdown", False, graceful, "Graceful Shutdown abgeschlossen")
 
+    async def close_clients():
+        from app.services.notifications import close_notification_clients, stop_notification_workers
+        await stop_notification_workers()
+        await close_notification_clients()
+    await _run_step("Notifications beenden", False, close_clients, None)
+
     logger.info("Fast-Flow Orchestrator heruntergefahren")
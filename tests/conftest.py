@@ -70,6 +70,10 @@ def test_db():
     
     # Tabellen erstellen
     SQLModel.metadata.create_all(test_engine)
+
+    # Prozess-Caches, die DB-Zeilen spiegeln, gehören zur vorherigen Test-DB
+    from app.services.system_settings import invalidate_system_settings_cache
+    invalidate_system_settings_cache()
     
     # WAL-Mode aktivieren (für SQLite)
     with Session(test_engine) as session:
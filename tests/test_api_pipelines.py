@@ -75,3 +75,28 @@ def test_list_pipelines(temp_pipelines_dir):
     # Pipeline sollte gefunden werden
     assert len(pipelines) >= 1
     assert any(p.name == "test_pipeline" for p in pipelines)
+
+
+def test_get_pipeline_runs_returns_latest_first(authenticated_client, temp_pipelines_dir, test_session):
+    """GET /api/pipelines/{name}/runs liefert die Runs der Pipeline, neueste zuerst."""
+    pipeline_dir = temp_pipelines_dir / "history_pipeline"
+    pipeline_dir.mkdir()
+    (pipeline_dir / "main.py").write_text("print('x')")
+    discover_pipelines(force_refresh=True)
+
+    for minutes, status in ((5, RunStatus.SUCCESS), (1, RunStatus.FAILED)):
+        test_session.add(PipelineRun(
+            pipeline_name="history_pipeline",
+            status=status,
+            log_file=f"logs/history_{minutes}.log",
+            started_at=datetime(2026, 1, 1, 12, 60 - minutes, tzinfo=timezone.utc),
+            env_vars={"SECRET": "x"},
+        ))
+    test_session.commit()
+
+    response = authenticated_client.get("/api/pipelines/history_pipeline/runs")
+    assert response.status_code == 200
+    runs = response.json()
+    assert [r["status"] for r in runs] == ["FAILED", "SUCCESS"]
+    assert runs[0]["log_file"] == "logs/history_1.log"
+    assert "env_vars" not in runs[0]
@@ -45,3 +45,20 @@ def test_recent_per_pipeline_empty(authenticated_client):
     response = authenticated_client.get("/api/runs/recent-per-pipeline")
     assert response.status_code == 200
     assert response.json() == {"pipelines": {}}
+
+
+def test_runs_list_reads_error_type_with_deferred_parameters(authenticated_client, test_session):
+    """GET /api/runs liefert error_type aus env_vars, obwohl parameters nicht geladen wird."""
+    run = _make_run("c", minutes_ago=1, status=RunStatus.FAILED)
+    run.env_vars = {"_fastflow_error_type": "pipeline_error"}
+    run.parameters = {"p": "1"}
+    test_session.add(run)
+    test_session.commit()
+    test_session.expunge_all()
+
+    response = authenticated_client.get("/api/runs?pipeline_name=c")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 1
+    assert body["runs"][0]["error_type"] == "pipeline_error"
+    assert "parameters" not in body["runs"][0]
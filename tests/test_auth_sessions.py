@@ -0,0 +1,39 @@
+"""
+Tests für die persistente Session-Verwaltung (app.auth.auth).
+"""
+
+from app.auth.auth import (
+    create_access_token,
+    create_session,
+    delete_session,
+    digest_session_token,
+    get_current_user,
+    get_session_by_token,
+)
+
+
+def test_session_stores_only_token_digest(test_session, test_user):
+    """In sessions landet nur der SHA-256-Digest; Lookup und Löschen laufen über das JWT."""
+    token = create_access_token(test_user.username)
+
+    db_session = create_session(test_session, test_user, token)
+
+    assert db_session.token_hash == digest_session_token(token)
+    assert len(db_session.token_hash) == 64
+    assert token not in db_session.token_hash
+    assert get_session_by_token(test_session, token).id == db_session.id
+    assert get_session_by_token(test_session, token + "x") is None
+
+    delete_session(test_session, token)
+    assert get_session_by_token(test_session, token) is None
+
+
+def test_get_current_user_accepts_hashed_session(test_session, test_user):
+    """get_current_user findet die Session über den Digest des Bearer-Tokens."""
+    from fastapi.security import HTTPAuthorizationCredentials
+
+    token = create_access_token(test_user.username)
+    create_session(test_session, test_user, token)
+
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    assert get_current_user(credentials, test_session).id == test_user.id
@@ -0,0 +1,164 @@
+"""
+Tests für die Ablage von Notebook-Zellen-Bildern (app.services.cell_outputs).
+"""
+
+import base64
+from uuid import uuid4
+
+from app.services import cell_outputs
+
+
+def test_store_and_inline_cell_image(temp_logs_dir):
+    """Bild wird als Datei abgelegt; die API-Ausgabe enthält wieder Base64-Daten."""
+    run_id = uuid4()
+    raw = b"\x89PNG\r\n\x1a\nfake"
+    payload = base64.b64encode(raw).decode("ascii")
+
+    entry = cell_outputs.store_cell_image(run_id, 2, 0, "image/png", payload)
+
+    assert entry == {"mime": "image/png", "path": f"{run_id}/cell_2_0.png", "size": len(raw)}
+    assert (temp_logs_dir / "cell_outputs" / entry["path"]).read_bytes() == raw
+
+    legacy = {"mime": "image/jpeg", "data": "abc"}
+    inlined = cell_outputs.inline_cell_outputs({"images": [entry, legacy]})
+    assert inlined == {"images": [{"mime": "image/png", "data": payload}, legacy]}
+
+    cell_outputs.delete_cell_outputs(run_id)
+    assert cell_outputs.inline_cell_outputs({"images": [entry]}) == {"images": []}
+
+
+def test_store_cell_image_rejects_invalid_base64(temp_logs_dir):
+    """Ungültiges Base64 wird verworfen statt eine kaputte Datei zu schreiben."""
+    assert cell_outputs.store_cell_image(uuid4(), 0, 0, "image/png", "not base64!") is None
+
+
+def test_inline_cell_outputs_ignores_paths_outside_root(temp_logs_dir):
+    """Manifest-Pfade können nicht aus LOGS_DIR/cell_outputs herausführen."""
+    (temp_logs_dir / "secret.png").write_bytes(b"x")
+    outputs = {"images": [{"mime": "image/png", "path": "../secret.png", "size": 1}]}
+    assert cell_outputs.inline_cell_outputs(outputs) == {"images": []}
+
+
+def test_persist_cell_lines_applies_batch_in_one_session(test_db, temp_logs_dir, monkeypatch):
+    """Mehrere Zellen-Zeilen eines Chunks landen gemeinsam in RunCellLog."""
+    from sqlmodel import Session
+
+    from app.executor import core
+    from app.models import PipelineRun, RunCellLog
+
+    with Session(test_db) as session:
+        run = PipelineRun(pipeline_name="nb", log_file="/tmp/nb.log")
+        session.add(run)
+        session.commit()
+        run_id = run.id
+
+    def session_gen():
+        with Session(test_db) as session:
+            yield session
+
+    monkeypatch.setattr(core, "get_session", session_gen)
+    image = base64.b64encode(b"img").decode("ascii")
+    core._persist_cell_lines(run_id, [
+        core.PREFIX_CELL_START + "0",
+        core.PREFIX_CELL_OUTPUT + "0\tstdout\tplain\thallo",
+        core.PREFIX_CELL_OUTPUT + f"0\timage\timage/png\t{image}",
+        core.PREFIX_CELL_OUTPUT + f"0\timage\timage/png\t{image}",
+        core.PREFIX_CELL_END + "0\tSUCCESS",
+    ])
+
+    with Session(test_db) as session:
+        cell = session.get(RunCellLog, (run_id, 0))
+        assert cell.status == "SUCCESS"
+        assert cell.stdout == "hallo\n"
+        assert [img["path"] for img in cell.outputs["images"]] == [
+            f"{run_id}/cell_0_0.png",
+            f"{run_id}/cell_0_1.png",
+        ]
+
+
+def _cell_test_run(test_db, monkeypatch):
+    from sqlmodel import Session
+
+    from app.executor import core
+    from app.models import PipelineRun
+
+    with Session(test_db) as session:
+        run = PipelineRun(pipeline_name="nb", log_file="/tmp/nb.log")
+        session.add(run)
+        session.commit()
+        run_id = run.id
+
+    def session_gen():
+        with Session(test_db) as session:
+            yield session
+
+    monkeypatch.setattr(core, "get_session", session_gen)
+    return run_id
+
+
+def test_stream_logs_persists_cell_lines_when_cancelled_mid_chunk(test_db, temp_logs_dir, monkeypatch):
+    """Wird das Log-Streaming mitten im Chunk abgebrochen, landen die Zellen-Zeilen trotzdem in RunCellLog."""
+    import asyncio
+
+    from sqlmodel import Session
+
+    from app.executor import core
+    from app.models import RunCellLog
+
+    run_id = _cell_test_run(test_db, monkeypatch)
+    chunk = (
+        f"{core.PREFIX_CELL_START}0\n"
+        f"{core.PREFIX_CELL_END}0\tSUCCESS\n"
+        "normale Zeile\n"
+    ).encode()
+
+    class _Container:
+        id = "c1"
+
+        def logs(self, **kwargs):
+            return iter([chunk])
+
+    class _CancellingQueue(asyncio.Queue):
+        """Bricht den Streaming-Task beim ersten SSE-Eintrag ab (wie log_task.cancel())."""
+
+        def put_nowait(self, item):
+            asyncio.current_task().cancel()
+            super().put_nowait(item)
+
+    async def scenario():
+        await core._stream_logs(_Container(), temp_logs_dir / "run.log", _CancellingQueue(), run_id)
+
+    asyncio.run(scenario())
+
+    with Session(test_db) as session:
+        cell = session.get(RunCellLog, (run_id, 0))
+        assert cell is not None
+        assert cell.status == "SUCCESS"
+
+
+def test_persist_cell_lines_keeps_good_lines_when_one_fails(test_db, temp_logs_dir, monkeypatch):
+    """Ein DB-Fehler in einer Zeile verwirft nicht den Rest des Batches."""
+    from sqlalchemy.exc import OperationalError
+    from sqlmodel import Session
+
+    from app.executor import core
+    from app.models import RunCellLog
+
+    run_id = _cell_test_run(test_db, monkeypatch)
+    apply_cell_line = core._apply_cell_line
+
+    def flaky_apply(session, rid, line):
+        if line.startswith(core.PREFIX_CELL_START + "1"):
+            raise OperationalError("UPDATE run_cell_logs", {}, Exception("database is locked"))
+        apply_cell_line(session, rid, line)
+
+    monkeypatch.setattr(core, "_apply_cell_line", flaky_apply)
+    core._persist_cell_lines(run_id, [
+        core.PREFIX_CELL_START + "0",
+        core.PREFIX_CELL_START + "1",
+        core.PREFIX_CELL_END + "0\tSUCCESS",
+    ])
+
+    with Session(test_db) as session:
+        assert session.get(RunCellLog, (run_id, 0)).status == "SUCCESS"
+        assert session.get(RunCellLog, (run_id, 1)) is None
@@ -0,0 +1,50 @@
+"""
+Tests für das Löschen alter Runs (app.services.cleanup).
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from sqlmodel import select
+
+from app.models import Pipeline, PipelineRun, RunCellLog, RunStatus
+from app.services import cleanup
+
+
+def _add_run(session, name, started_at, status=RunStatus.SUCCESS):
+    run = PipelineRun(pipeline_name=name, log_file="missing.log", status=status, started_at=started_at)
+    session.add(run)
+    session.flush()
+    session.add(RunCellLog(run_id=run.id, cell_index=0, status="SUCCESS"))
+    return run
+
+
+def test_retention_runs_deletes_oldest_runs_with_cell_logs(test_session, monkeypatch):
+    """Überzählige Runs werden per Bulk-DELETE gelöscht, inklusive ihrer Zellen-Logs."""
+    monkeypatch.setattr(cleanup, "_DELETE_BATCH_SIZE", 2)
+    now = datetime.now(timezone.utc)
+    test_session.add(Pipeline(pipeline_name="p"))
+    runs = [_add_run(test_session, "p", now - timedelta(hours=i)) for i in range(5)]
+    active = _add_run(test_session, "p", now - timedelta(days=1), status=RunStatus.RUNNING)
+    test_session.commit()
+
+    deleted = asyncio.run(cleanup._cleanup_by_retention_runs(test_session, 2))
+
+    assert deleted == 4
+    remaining = set(test_session.exec(select(PipelineRun.id)).all())
+    assert remaining == {runs[0].id, active.id}
+    assert set(test_session.exec(select(RunCellLog.run_id)).all()) == remaining
+
+
+def test_retention_days_keeps_recent_runs(test_session):
+    """Nur Runs vor dem Cutoff werden gelöscht."""
+    now = datetime.now(timezone.utc)
+    old = _add_run(test_session, "p", now - timedelta(days=10))
+    recent = _add_run(test_session, "p", now)
+    test_session.commit()
+
+    deleted = asyncio.run(cleanup._cleanup_by_retention_days(test_session, 7))
+
+    assert deleted == 1
+    assert test_session.exec(select(PipelineRun.id)).all() == [recent.id]
+    assert test_session.get(RunCellLog, (old.id, 0)) is None
@@ -0,0 +1,44 @@
+"""
+Tests für den JSON-Codec der Datenbank-Spalten (app.core.json_codec).
+"""
+
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core import json_codec
+from app.models import PipelineRun
+
+
+def test_dumps_matches_stdlib_semantics():
+    """Kompakte Ausgabe; Nicht-String-Keys werden wie bei json.dumps zu Strings."""
+    assert json_codec.dumps({"a": [1, 2], 3: None}) == '{"a":[1,2],"3":null}'
+    assert json_codec.dumps_bytes({"ä": "ö"}) == '{"ä":"ö"}'.encode("utf-8")
+    assert json_codec.loads(b'{"x": 1}') == {"x": 1}
+
+
+def test_engine_roundtrips_json_columns_with_codec():
+    """env_vars/parameters überstehen Schreiben und Lesen über die Engine-Hooks."""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+        json_serializer=json_codec.dumps,
+        json_deserializer=json_codec.loads,
+    )
+    SQLModel.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        run = PipelineRun(
+            pipeline_name="json_test",
+            log_file="/tmp/x.log",
+            env_vars={"KEY": "wert mit ümlaut"},
+            parameters={"n": "1"},
+        )
+        session.add(run)
+        session.commit()
+        run_id = run.id
+
+    with Session(engine) as session:
+        loaded = session.get(PipelineRun, run_id)
+        assert loaded.env_vars == {"KEY": "wert mit ümlaut"}
+        assert loaded.parameters == {"n": "1"}
@@ -0,0 +1,243 @@
+"""
+Unit-Tests für benutzerdefinierte Prometheus-Metriken (app.metrics_prometheus).
+"""
+
+from app import metrics_prometheus as mp
+from app.core.config import config
+
+
+def test_update_log_metrics_counts_nested_log_files(temp_logs_dir):
+    """Log-Metriken zählen *.log rekursiv und ignorieren andere Dateien."""
+    (temp_logs_dir / "a.log").write_text("12345")
+    (temp_logs_dir / "routes").mkdir()
+    (temp_logs_dir / "routes" / "b.log").write_text("123")
+    (temp_logs_dir / "run_metrics.jsonl").write_text("ignored")
+
+    mp.invalidate_log_metrics()
+    mp.update_log_metrics()
+
+    assert mp.log_files_count._value.get() == 2
+    assert mp.log_files_size_bytes._value.get() == 8
+
+
+def test_update_log_metrics_is_cached_until_invalidated(temp_logs_dir, monkeypatch):
+    """Innerhalb des Scan-Intervalls wird LOGS_DIR nicht erneut gescannt."""
+    monkeypatch.setattr(config, "METRICS_LOG_SCAN_INTERVAL_SECONDS", 3600.0)
+    (temp_logs_dir / "a.log").write_text("x")
+
+    mp.invalidate_log_metrics()
+    mp.update_log_metrics()
+    assert mp.log_files_count._value.get() == 1
+
+    (temp_logs_dir / "b.log").write_text("y")
+    mp.update_log_metrics()
+    assert mp.log_files_count._value.get() == 1
+
+    mp.invalidate_log_metrics()
+    mp.update_log_metrics()
+    assert mp.log_files_count._value.get() == 2
+
+
+def test_iter_metrics_matches_generate_latest():
+    """Gestreamte Ausgabe ist byte-identisch zu generate_latest."""
+    from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+    from prometheus_client.exposition import generate_latest
+
+    registry = CollectorRegistry()
+    Counter("t_runs", "Runs", ["pipeline_name"], registry=registry).labels("p1").inc()
+    Gauge("t_active", "Aktiv", registry=registry).set(3)
+    Histogram("t_duration", "Dauer", buckets=(1, 10), registry=registry).observe(5)
+
+    chunks = list(mp.iter_metrics(registry))
+
+    assert len(chunks) == 3
+    assert b"".join(chunks) == generate_latest(registry)
+
+
+def test_metrics_endpoint_streams_prometheus_text(client):
+    """GET /metrics liefert das Prometheus-Textformat."""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "fastflow_log_files_total" in response.text
+
+
+def test_update_docker_metrics_backs_off_after_failure(monkeypatch):
+    """Nach einem Docker-Fehler wird bis zum Backoff-Ende nicht erneut gepingt."""
+    calls = []
+
+    def failing_client():
+        calls.append(1)
+        return None
+
+    monkeypatch.setattr(mp, "_docker_client_getter", failing_client)
+    monkeypatch.setattr(config, "METRICS_DOCKER_ERROR_BACKOFF_SECONDS", 30.0)
+    monkeypatch.setattr(mp, "_docker_unavailable_until", 0.0)
+    monkeypatch.setattr(mp, "_docker_backoff_seconds", 0.0)
+
+    mp.update_docker_metrics()
+    mp.update_docker_metrics()
+
+    assert len(calls) == 1
+    assert mp.docker_available._value.get() == 0
+    assert mp._docker_backoff_seconds == 30.0
+
+    # Backoff abgelaufen: erneuter Versuch, Backoff verdoppelt sich
+    monkeypatch.setattr(mp, "_docker_unavailable_until", 0.0)
+    mp.update_docker_metrics()
+    assert len(calls) == 2
+    assert mp._docker_backoff_seconds == 60.0
+
+
+def test_pipeline_label_sanitizes_and_caps_cardinality(monkeypatch):
+    """pipeline_name wird bereinigt; über dem Limit landen neue Pipelines unter _other."""
+    monkeypatch.setattr(mp, "_pipeline_labels", {})
+    monkeypatch.setattr(config, "METRICS_MAX_PIPELINE_LABELS", 2)
+
+    assert mp._pipeline_label("etl job/1") == "etl_job_1"
+    assert mp._pipeline_label("x" * 100) == "x" * 64
+    assert mp._pipeline_label("third") == mp.OTHER_PIPELINE_LABEL
+    # Bereits bekannte Pipelines behalten ihr Label
+    assert mp._pipeline_label("etl job/1") == "etl_job_1"
+
+
+def test_track_run_uses_same_label_for_start_and_finish(monkeypatch):
+    """Start und Ende eines Runs treffen dasselbe Label (Gauge zurück auf 0)."""
+    monkeypatch.setattr(mp, "_pipeline_labels", {})
+    monkeypatch.setattr(mp, "_active_runs", set())
+    monkeypatch.setattr(config, "METRICS_MAX_PIPELINE_LABELS", 500)
+
+    mp.track_run_started("label test", "run-1")
+    gauge = mp.pipeline_runs_active.labels(pipeline_name="label_test")
+    assert gauge._value.get() == 1
+
+    mp.track_run_finished("label test", "completed", 12.0, "run-1")
+    assert gauge._value.get() == 0
+
+
+def test_concurrency_utilization_follows_tracked_runs(monkeypatch):
+    """Utilization basiert auf den per track_run_started/finished erfassten Runs."""
+    monkeypatch.setattr(mp, "_active_runs", set())
+    monkeypatch.setattr(config, "MAX_CONCURRENT_RUNS", 4)
+
+    mp.track_run_started("util-a", "run-a")
+    mp.track_run_started("util-b", "run-b")
+    mp.update_pipeline_metrics()
+    assert mp.get_active_run_count() == 2
+    assert mp.concurrency_utilization._value.get() == 0.5
+
+    mp.track_run_finished("util-b", "failed", 1.0, "run-b")
+    mp.update_pipeline_metrics()
+    assert mp.get_active_run_count() == 1
+    assert mp.concurrency_utilization._value.get() == 0.25
+
+
+def test_unstarted_failure_leaves_running_runs_untouched(monkeypatch):
+    """Fehler vor dem Container-Start zählen nur als failed, nicht gegen aktive Runs."""
+    monkeypatch.setattr(mp, "_pipeline_labels", {})
+    monkeypatch.setattr(mp, "_active_runs", set())
+    monkeypatch.setattr(config, "METRICS_MAX_PIPELINE_LABELS", 500)
+    monkeypatch.setattr(config, "MAX_CONCURRENT_RUNS", 4)
+
+    mp.track_run_started("early fail", "run-a")
+    gauge = mp.pipeline_runs_active.labels(pipeline_name="early_fail")
+    failed = mp.pipeline_runs_total.labels(pipeline_name="early_fail", status="failed")
+    failed_before = failed._value.get()
+
+    # Run B derselben Pipeline scheitert vor dem Start (z. B. Image-Pull-Fehler)
+    mp.track_run_finished("early fail", "failed", 0.5, "run-b")
+    mp.update_pipeline_metrics()
+
+    assert mp.get_active_run_count() == 1
+    assert gauge._value.get() == 1
+    assert mp.concurrency_utilization._value.get() == 0.25
+    assert failed._value.get() == failed_before + 1
+
+    mp.track_run_finished("early fail", "completed", 3.0, "run-a")
+    assert mp.get_active_run_count() == 0
+    assert gauge._value.get() == 0
+
+
+class _FakeContainer:
+    def __init__(self, status):
+        self.status = status
+
+
+class _FakeDockerClient:
+    def __init__(self, statuses):
+        self.statuses = statuses
+        self.containers = self
+
+    def ping(self):
+        return True
+
+    def list(self, all=False):
+        return [_FakeContainer(s) for s in self.statuses]
+
+
+def test_update_docker_metrics_zeroes_vanished_statuses(monkeypatch):
+    """Status, die im aktuellen Scrape fehlen, werden auf 0 gesetzt."""
+    fake = _FakeDockerClient(["running", "exited", "exited"])
+    monkeypatch.setattr(mp, "_docker_client_getter", lambda: fake)
+    monkeypatch.setattr(mp, "_docker_unavailable_until", 0.0)
+    monkeypatch.setattr(mp, "_docker_status_misses", {})
+
+    mp.update_docker_metrics()
+    assert mp.docker_containers_total.labels(status="exited")._value.get() == 2
+
+    fake.statuses = ["running"]
+    mp.update_docker_metrics()
+    assert mp.docker_containers_total.labels(status="running")._value.get() == 1
+    assert mp.docker_containers_total.labels(status="exited")._value.get() == 0
+
+
+def test_update_docker_metrics_removes_long_vanished_statuses(monkeypatch):
+    """Nach _DOCKER_STATUS_STALE_SCRAPES Scrapes ohne Container verschwindet das Label."""
+    fake = _FakeDockerClient(["running", "paused"])
+    monkeypatch.setattr(mp, "_docker_client_getter", lambda: fake)
+    monkeypatch.setattr(mp, "_docker_unavailable_until", 0.0)
+    monkeypatch.setattr(mp, "_docker_status_misses", {})
+    mp.update_docker_metrics()
+
+    fake.statuses = ["running"]
+    for _ in range(mp._DOCKER_STATUS_STALE_SCRAPES):
+        mp.update_docker_metrics()
+
+    exported = {
+        sample.labels["status"]
+        for family in mp.docker_containers_total.collect()
+        for sample in family.samples
+    }
+    assert "paused" not in exported
+    assert "running" in exported
+
+
+def test_metrics_endpoint_cache_serves_etag_and_304(client, monkeypatch):
+    """Mit METRICS_CACHE_TTL_SECONDS liefert /metrics einen ETag und 304 bei If-None-Match."""
+    monkeypatch.setattr(config, "METRICS_CACHE_TTL_SECONDS", 3600.0)
+    monkeypatch.setattr(mp, "_metrics_cache", None)
+
+    first = client.get("/metrics")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    second = client.get("/metrics")
+    assert second.content == first.content
+
+    not_modified = client.get("/metrics", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+
+def test_update_database_metrics_includes_wal(temp_data_dir, monkeypatch):
+    """SQLite-Größe umfasst fastflow.db und fastflow.db-wal."""
+    monkeypatch.setattr(config, "DATABASE_URL", None)
+    monkeypatch.setattr(mp, "_db_stat_key", None)
+    (temp_data_dir / "fastflow.db").write_bytes(b"d" * 100)
+
+    mp.update_database_metrics()
+    assert mp.database_size_bytes._value.get() == 100
+
+    (temp_data_dir / "fastflow.db-wal").write_bytes(b"w" * 20)
+    mp.update_database_metrics()
+    assert mp.database_size_bytes._value.get() == 120
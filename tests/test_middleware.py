@@ -0,0 +1,191 @@
+"""
+Tests für die HTTP-Middlewares (app.middleware).
+"""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.config import config
+from app.middleware.security_headers import SecurityHeadersMiddleware
+
+
+def _app_with(middleware_cls, **options) -> FastAPI:
+    test_app = FastAPI()
+    test_app.add_middleware(middleware_cls, **options)
+
+    @test_app.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    @test_app.post("/echo")
+    async def echo(payload: dict):
+        return payload
+
+    return test_app
+
+
+def test_security_headers_development(monkeypatch):
+    """Development: lockere CSP (eval/ws erlaubt), kein HSTS."""
+    monkeypatch.setattr(config, "ENVIRONMENT", "development")
+    response = TestClient(_app_with(SecurityHeadersMiddleware)).get("/ping")
+
+    assert "'unsafe-eval'" in response.headers["Content-Security-Policy"]
+    assert "ws: wss:" in response.headers["Content-Security-Policy"]
+    assert response.headers["X-Frame-Options"] == "DENY"
+    assert "Strict-Transport-Security" not in response.headers
+
+
+def test_security_headers_production(monkeypatch):
+    """Produktion: restriktive CSP und HSTS."""
+    monkeypatch.setattr(config, "ENVIRONMENT", "production")
+    response = TestClient(_app_with(SecurityHeadersMiddleware)).get("/ping")
+
+    assert "script-src 'self';" in response.headers["Content-Security-Policy"]
+    assert "'unsafe-eval'" not in response.headers["Content-Security-Policy"]
+    assert response.headers["Strict-Transport-Security"] == "max-age=31536000; includeSubDomains"
+    assert response.headers["Cross-Origin-Embedder-Policy"] == "credentialless"
+
+
+def test_performance_middleware_skips_health_paths_with_trailing_slash():
+    """SKIP_PATHS deckt Pfade mit und ohne abschließenden Slash ab."""
+    from app.middleware.performance import PerformanceTrackingMiddleware
+
+    assert "/health" in PerformanceTrackingMiddleware.SKIP_PATHS
+    assert "/health/" in PerformanceTrackingMiddleware.SKIP_PATHS
+    assert "/metrics/" in PerformanceTrackingMiddleware.SKIP_PATHS
+    assert "/api/pipelines" not in PerformanceTrackingMiddleware.SKIP_PATHS
+
+
+def test_performance_middleware_logs_slow_requests(monkeypatch, caplog):
+    """Requests über dem Schwellwert werden als WARNING geloggt."""
+    from app.middleware.performance import PerformanceTrackingMiddleware
+
+    monkeypatch.setattr(config, "SLOW_REQUEST_THRESHOLD_SECONDS", 0.0)
+    monkeypatch.setattr(config, "LOG_JSON", False)
+    with caplog.at_level("INFO", logger="app.middleware.performance"):
+        response = TestClient(_app_with(PerformanceTrackingMiddleware)).get("/ping")
+
+    assert response.status_code == 200
+    assert any(r.levelname == "WARNING" and "Slow request" in r.getMessage() for r in caplog.records)
+
+
+def test_body_limit_rejects_oversized_content_length(monkeypatch):
+    """Content-Length über dem Limit ergibt 413, kleinere Bodies passieren."""
+    from app.middleware.body_limit import BodyLimitMiddleware
+
+    monkeypatch.setattr(config, "MAX_REQUEST_BODY_MB", 1)
+    test_client = TestClient(_app_with(BodyLimitMiddleware))
+
+    ok = test_client.post("/echo", json={"a": 1})
+    assert ok.status_code == 200
+
+    too_large = test_client.post(
+        "/echo",
+        content=b"x" * 10,
+        headers={"content-length": str(2 * 1024 * 1024), "content-type": "application/json"},
+    )
+    assert too_large.status_code == 413
+    assert "1 MB" in too_large.json()["detail"]
+
+
+def test_body_limit_chunked_body_is_replayed_to_app(monkeypatch):
+    """Chunked Bodies unter dem Limit werden gepuffert und unverändert weitergereicht."""
+    from app.middleware.body_limit import BodyLimitMiddleware
+
+    monkeypatch.setattr(config, "MAX_REQUEST_BODY_MB", 1)
+    test_client = TestClient(_app_with(BodyLimitMiddleware))
+
+    def chunks(payload: bytes, size: int):
+        for i in range(0, len(payload), size):
+            yield payload[i:i + size]
+
+    ok = test_client.post(
+        "/echo", content=chunks(b'{"a": 1}', 3), headers={"content-type": "application/json"}
+    )
+    assert ok.status_code == 200
+    assert ok.json() == {"a": 1}
+
+    too_large = test_client.post(
+        "/echo",
+        content=chunks(b"x" * (1024 * 1024 + 1), 64 * 1024),
+        headers={"content-type": "application/json"},
+    )
+    assert too_large.status_code == 413
+
+
+def test_request_id_is_generated_or_propagated():
+    """X-Request-ID wird übernommen oder neu erzeugt und steht in request.state."""
+    from fastapi import Request
+
+    from app.middleware.request_id import REQUEST_ID_HEADER, RequestIDMiddleware
+
+    test_app = _app_with(RequestIDMiddleware)
+
+    @test_app.get("/state")
+    def state(request: Request):
+        return {"request_id": request.state.request_id}
+
+    test_client = TestClient(test_app)
+
+    response = test_client.get("/state", headers={REQUEST_ID_HEADER: "abc-123"})
+    assert response.headers[REQUEST_ID_HEADER] == "abc-123"
+    assert response.json()["request_id"] == "abc-123"
+
+    generated = test_client.get("/state")
+    assert len(generated.headers[REQUEST_ID_HEADER]) == 32
+    assert generated.json()["request_id"] == generated.headers[REQUEST_ID_HEADER]
+
+
+def test_client_identifier_uses_first_forwarded_hop_only_when_trusted(monkeypatch):
+    """X-Forwarded-For zählt nur bei PROXY_HEADERS_TRUSTED; genutzt wird der erste Hop."""
+    from starlette.requests import Request
+
+    from app.middleware import rate_limiting
+
+    def make_request(xff: str) -> Request:
+        return Request({
+            "type": "http",
+            "headers": [(b"x-forwarded-for", xff.encode())],
+            "client": ("10.0.0.1", 1234),
+        })
+
+    monkeypatch.setattr(rate_limiting, "_PROXY_TRUSTED", True)
+    assert rate_limiting.get_client_identifier(make_request(" 1.2.3.4 , 5.6.7.8")) == "1.2.3.4"
+    assert rate_limiting.get_client_identifier(make_request("9.9.9.9")) == "9.9.9.9"
+
+    monkeypatch.setattr(rate_limiting, "_PROXY_TRUSTED", False)
+    assert rate_limiting.get_client_identifier(make_request("1.2.3.4")) == "10.0.0.1"
+
+
+def test_body_limit_ignores_non_ascii_digit_content_length(monkeypatch):
+    """Unicode-Ziffern wie '²' im Content-Length führen nicht zu einem 500."""
+    import asyncio
+
+    from app.middleware.body_limit import BodyLimitMiddleware
+
+    monkeypatch.setattr(config, "MAX_REQUEST_BODY_MB", 1)
+    received = []
+
+    async def app(scope, receive, send):
+        received.append(scope["path"])
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/echo",
+        "headers": [(b"content-length", "²".encode("latin-1"))],
+    }
+    asyncio.run(BodyLimitMiddleware(app)(scope, receive, send))
+
+    assert received == ["/echo"]
+    assert sent[0]["status"] == 204
@@ -0,0 +1,36 @@
+"""
+Tests für Hilfsfunktionen der Models (app.models).
+"""
+
+from app.models import PipelineRun, uuid7
+
+
+def test_uuid7_is_version_7_and_time_ordered(monkeypatch):
+    """uuid7 setzt Version/Variant und sortiert nach Erzeugungszeitpunkt."""
+    import app.models as models
+
+    timestamps = iter([1_700_000_000_000_000_000, 1_700_000_000_001_000_000])
+    monkeypatch.setattr(models.time, "time_ns", lambda: next(timestamps))
+
+    first, second = uuid7(), uuid7()
+
+    assert first.version == 7 and second.version == 7
+    assert first.variant == "specified in RFC 4122"
+    assert first < second
+    assert first.int >> 80 == 1_700_000_000_000
+
+
+def test_pipeline_run_ids_default_to_uuid7():
+    """Neue Runs bekommen zeitlich geordnete IDs."""
+    assert PipelineRun(pipeline_name="p", log_file="x.log").id.version == 7
+
+
+def test_table_models_defer_schema_build():
+    """Alle Table-Models bauen ihr Pydantic-Schema lazy; Validierung funktioniert trotzdem."""
+    from sqlmodel import SQLModel
+
+    for mapper in SQLModel._sa_registry.mappers:
+        assert mapper.class_.model_config.get("defer_build") is True, mapper.class_.__name__
+
+    run = PipelineRun.model_validate({"pipeline_name": "p", "log_file": "x.log"})
+    assert run.status == "PENDING"
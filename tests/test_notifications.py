@@ -0,0 +1,526 @@
+"""
+Tests für Run-Benachrichtigungen (app.services.notifications).
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from email.mime.multipart import MIMEMultipart
+from types import SimpleNamespace
+from uuid import UUID
+
+import aiosmtplib
+import httpx
+import pytest
+
+from app.core.config import config
+from app.models import PipelineRun, RunStatus
+from app.services import notifications
+
+
+@pytest.fixture
+def failed_run(monkeypatch):
+    monkeypatch.setattr(notifications, "_is_daemon_pipeline", lambda run: False)
+    started = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    return PipelineRun(
+        id=UUID(int=7),
+        pipeline_name="etl",
+        log_file="x.log",
+        status=RunStatus.FAILED,
+        started_at=started,
+        finished_at=started + timedelta(seconds=125),
+        exit_code=1,
+    )
+
+
+def test_render_email_template_fills_all_fields(failed_run, monkeypatch):
+    """Das statische Gerüst wird vollständig befüllt, ohne übrig gebliebene Platzhalter."""
+    monkeypatch.setattr(config, "FRONTEND_URL", "https://ff.example")
+
+    subject, html_body, text_body = notifications._render_email_template(failed_run, RunStatus.FAILED)
+
+    assert subject == "[FastFlow] Pipeline etl fehlgeschlagen"
+    assert "background-color: #F44336;" in html_body
+    assert "<h2>Pipeline Fehlgeschlagen</h2>" in html_body
+    assert "2026-01-02 03:04:05 UTC" in html_body
+    assert "2m 5s" in html_body
+    assert 'href="https://ff.example/runs/00000000-0000-0000-0000-000000000007"' in html_body
+    assert "{" not in html_body.split("</style>")[1]
+    assert text_body.startswith("Pipeline Fehlgeschlagen")
+    assert "Exit-Code: 1" in text_body
+    assert text_body.endswith("Run-Details: https://ff.example/runs/00000000-0000-0000-0000-000000000007")
+
+
+def test_teams_client_is_reused_within_loop_and_rebuilt_after_loop_closed(monkeypatch):
+    """Ein Client pro Event-Loop; nach asyncio.run (Loop geschlossen) wird neu angelegt."""
+    monkeypatch.setattr(notifications, "_teams_client", None)
+    monkeypatch.setattr(notifications, "_teams_client_loop", None)
+
+    async def get_twice():
+        first = notifications._get_teams_client()
+        assert notifications._get_teams_client() is first
+        return first
+
+    first = asyncio.run(get_twice())
+    second = asyncio.run(get_twice())
+    assert second is not first
+    asyncio.run(notifications.close_notification_clients())
+
+
+def test_post_teams_webhook_uses_shared_client(monkeypatch):
+    """Teams-POSTs laufen über den geteilten Client (Keep-Alive statt neuer Verbindung)."""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200)
+
+    monkeypatch.setattr(config, "TEAMS_WEBHOOK_URL", "https://example.webhook.office.com/hook")
+    monkeypatch.setattr(notifications, "_validate_webhook_url", lambda url: None)
+
+    async def post_twice():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(notifications, "_teams_client", client)
+        monkeypatch.setattr(notifications, "_teams_client_loop", asyncio.get_running_loop())
+        await notifications._post_teams_webhook({"title": "a"})
+        await notifications._post_teams_webhook({"title": "b"})
+        await notifications.close_notification_clients()
+        assert client.is_closed
+
+    asyncio.run(post_twice())
+    assert [json.loads(r.content)["title"] for r in requests] == ["a", "b"]
+    assert all(r.headers["content-type"] == "application/json" for r in requests)
+
+
+class _FakeSMTP:
+    """Minimaler aiosmtplib.SMTP-Ersatz, zählt Verbindungen und gesendete Nachrichten."""
+
+    connects = 0
+
+    def __init__(self):
+        self.is_connected = False
+        self.sent = []
+        self.disconnect_next_send = False
+
+    async def connect(self):
+        type(self).connects += 1
+        self.is_connected = True
+
+    async def login(self, user, password):
+        pass
+
+    async def send_message(self, message):
+        if self.disconnect_next_send:
+            self.disconnect_next_send = False
+            self.is_connected = False
+            raise aiosmtplib.SMTPServerDisconnected("idle timeout")
+        self.sent.append(message["Subject"])
+
+    async def quit(self):
+        self.is_connected = False
+
+    def close(self):
+        self.is_connected = False
+
+
+@pytest.fixture
+def fake_smtp(monkeypatch):
+    clients = []
+
+    def create():
+        clients.append(_FakeSMTP())
+        return clients[-1]
+
+    _FakeSMTP.connects = 0
+    monkeypatch.setattr(notifications, "_create_smtp_client", create)
+    monkeypatch.setattr(notifications, "_smtp_client", None)
+    monkeypatch.setattr(notifications, "_smtp_loop", None)
+    monkeypatch.setattr(notifications, "_smtp_lock", None)
+    monkeypatch.setattr(config, "SMTP_HOST", "smtp.example")
+    monkeypatch.setattr(config, "SMTP_USER", None)
+    return clients
+
+
+def _mail(subject):
+    message = MIMEMultipart("alternative")
+    message["Subject"] = subject
+    return message
+
+
+def test_smtp_connection_is_shared_across_messages(fake_smtp):
+    """Mehrere E-Mails nutzen eine Verbindung; nach Disconnect wird einmal neu verbunden."""
+
+    async def send_all():
+        await notifications._send_smtp_message(_mail("a"))
+        await notifications._send_smtp_message(_mail("b"))
+        fake_smtp[0].disconnect_next_send = True
+        await notifications._send_smtp_message(_mail("c"))
+        await notifications.close_notification_clients()
+
+    asyncio.run(send_all())
+
+    assert _FakeSMTP.connects == 2
+    assert fake_smtp[0].sent == ["a", "b"]
+    assert fake_smtp[1].sent == ["c"]
+    assert not fake_smtp[1].is_connected
+
+
+def test_smtp_reconnects_when_settings_change(fake_smtp, monkeypatch):
+    """Geänderte SMTP-Einstellungen (Settings-UI) erzwingen eine neue Verbindung."""
+
+    async def send_all():
+        await notifications._send_smtp_message(_mail("a"))
+        monkeypatch.setattr(config, "SMTP_HOST", "other.example")
+        await notifications._send_smtp_message(_mail("b"))
+
+    asyncio.run(send_all())
+
+    assert _FakeSMTP.connects == 2
+    assert not fake_smtp[0].is_connected
+
+
+def test_send_notifications_drops_duplicates_within_ttl(monkeypatch, failed_run):
+    """Dieselbe (Run, Status)-Meldung wird im TTL-Fenster nur einmal verschickt."""
+    sent = []
+
+    async def fake_send(run, status):
+        sent.append((run.id, status))
+
+    monkeypatch.setattr(notifications, "_send_notifications_async", fake_send)
+    monkeypatch.setattr(notifications, "_recent_notifications", notifications.OrderedDict())
+    monkeypatch.setattr(config, "EMAIL_ENABLED", True)
+    clock = [1000.0]
+    monkeypatch.setattr(notifications, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+
+    async def notify_burst():
+        await notifications.send_notifications(failed_run, RunStatus.FAILED)
+        await notifications.send_notifications(failed_run, RunStatus.FAILED)
+        await notifications.send_notifications(failed_run, RunStatus.INTERRUPTED)
+        clock[0] += notifications._NOTIFY_DEDUP_TTL_SECONDS + 1
+        await notifications.send_notifications(failed_run, RunStatus.FAILED)
+        await asyncio.sleep(0)
+
+    asyncio.run(notify_burst())
+
+    assert sent == [
+        (failed_run.id, RunStatus.FAILED),
+        (failed_run.id, RunStatus.INTERRUPTED),
+        (failed_run.id, RunStatus.FAILED),
+    ]
+
+
+def test_plain_text_message_is_single_part(monkeypatch):
+    """Reine Text-Mails kommen ohne multipart-Hülle aus und bleiben UTF-8-sicher."""
+    monkeypatch.setattr(config, "SMTP_FROM", "ff@example.com")
+
+    message = notifications._plain_text_message("Soft-Limit überschritten", "RAM > 90 %", ["a@x", "b@x"])
+
+    assert not message.is_multipart()
+    assert message["To"] == "a@x, b@x"
+    assert message.get_content_charset() == "utf-8"
+    assert message.get_payload(decode=True).decode("utf-8") == "RAM > 90 %"
+    assert b"Subject: =?utf-8?" in message.as_bytes()
+
+
+def test_format_duration_and_timestamp():
+    """Gemeinsame Formatierung für E-Mail und Teams."""
+    start = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+    assert notifications._format_duration(start, None) == "N/A"
+    assert notifications._format_duration(start, start + timedelta(seconds=42)) == "42s"
+    assert notifications._format_duration(start, start + timedelta(seconds=303)) == "5m 3s"
+    assert notifications._format_duration(start, start + timedelta(hours=2, minutes=10, seconds=9)) == "2h 10m"
+    assert notifications._format_ts(start) == "2026-01-02 03:04:05 UTC"
+    assert notifications._format_ts(None) == "N/A"
+
+
+def test_notification_workers_process_queue_and_drain_on_stop(monkeypatch, failed_run):
+    """Worker arbeiten die Queue ab; bei voller Queue fällt die älteste Meldung weg."""
+    sent = []
+
+    async def fake_send(run, status):
+        sent.append(status)
+
+    monkeypatch.setattr(notifications, "_send_notifications_async", fake_send)
+    monkeypatch.setattr(notifications, "_NOTIFY_QUEUE_MAXSIZE", 2)
+
+    async def scenario():
+        notifications.start_notification_workers()
+        assert len(notifications._notify_tasks) == notifications._NOTIFY_WORKERS
+        # Ohne await dazwischen kommen die Worker nicht zum Zug: Queue läuft voll
+        notifications._enqueue_notification(failed_run, RunStatus.FAILED)
+        notifications._enqueue_notification(failed_run, RunStatus.INTERRUPTED)
+        notifications._enqueue_notification(failed_run, RunStatus.FAILED)
+        await notifications.stop_notification_workers()
+
+    asyncio.run(scenario())
+
+    assert sent == [RunStatus.INTERRUPTED, RunStatus.FAILED]
+    assert not notifications._notify_tasks
+    assert notifications._notify_queue is None
+
+
+def test_send_notifications_async_runs_channels_concurrently(monkeypatch, failed_run, caplog):
+    """E-Mail und Teams laufen parallel; ein Kanalfehler hält den anderen nicht auf."""
+    monkeypatch.setattr(config, "EMAIL_ENABLED", True)
+    monkeypatch.setattr(config, "TEAMS_ENABLED", True)
+    events = []
+
+    async def slow_email(run, status):
+        events.append("email-start")
+        await asyncio.sleep(0)
+        raise aiosmtplib.SMTPException("down")
+
+    async def teams(run, status):
+        events.append("teams-start")
+        await asyncio.sleep(0)
+        events.append("teams-done")
+
+    monkeypatch.setattr(notifications, "send_email_notification", slow_email)
+    monkeypatch.setattr(notifications, "send_teams_notification", teams)
+
+    with caplog.at_level("ERROR", logger="app.services.notifications"):
+        asyncio.run(notifications._send_notifications_async(failed_run, RunStatus.FAILED))
+
+    assert events == ["email-start", "teams-start", "teams-done"]
+    assert any("E-Mail-Benachrichtigung" in r.getMessage() for r in caplog.records)
+
+
+def test_send_email_notification_builds_text_and_html_alternative(monkeypatch, failed_run):
+    """Run-Fehler-Mails sind multipart/alternative mit Text- und HTML-Teil (UTF-8)."""
+    monkeypatch.setattr(config, "EMAIL_ENABLED", True)
+    monkeypatch.setattr(config, "SMTP_HOST", "smtp.example")
+    monkeypatch.setattr(config, "SMTP_FROM", "ff@example.com")
+    monkeypatch.setattr(config, "EMAIL_RECIPIENTS", ["a@x", "b@x"])
+    failed_run.pipeline_name = "ätl"
+    sent = []
+
+    async def fake_send(message):
+        sent.append(message)
+
+    monkeypatch.setattr(notifications, "_send_smtp_message", fake_send)
+
+    asyncio.run(notifications.send_email_notification(failed_run, RunStatus.FAILED))
+
+    message = sent[0]
+    assert message.get_content_type() == "multipart/alternative"
+    assert [part.get_content_type() for part in message.iter_parts()] == ["text/plain", "text/html"]
+    assert "Pipeline: ätl" in message.get_body(("plain",)).get_content()
+    assert message["To"] == "a@x, b@x"
+    assert b"\r\n" in message.as_bytes()
+
+
+def test_send_notifications_skips_everything_without_channels(monkeypatch, failed_run):
+    """Sind E-Mail und Teams aus, wird weder eingereiht noch ein Dedup-Eintrag angelegt."""
+    monkeypatch.setattr(config, "EMAIL_ENABLED", False)
+    monkeypatch.setattr(config, "TEAMS_ENABLED", False)
+    monkeypatch.setattr(notifications, "_recent_notifications", notifications.OrderedDict())
+    enqueued = []
+    monkeypatch.setattr(notifications, "_enqueue_notification", lambda run, status: enqueued.append(status))
+
+    asyncio.run(notifications.send_notifications(failed_run, RunStatus.FAILED))
+
+    assert enqueued == []
+    assert not notifications._recent_notifications
+
+
+def test_render_email_template_escapes_html_only(failed_run, monkeypatch):
+    """Pipeline-Name und Run-URL werden im HTML-Teil escaped, im Text-Teil nicht."""
+    monkeypatch.setattr(config, "FRONTEND_URL", 'https://ff.example/"x')
+    failed_run.pipeline_name = "<b>a&b</b>"
+
+    _, html_body, text_body = notifications._render_email_template(failed_run, RunStatus.FAILED)
+
+    assert "&lt;b&gt;a&amp;b&lt;/b&gt;" in html_body
+    assert "<b>a&b</b>" not in html_body
+    assert 'href="https://ff.example/&quot;x/runs/' in html_body
+    assert "Pipeline: <b>a&b</b>" in text_body
+
+
+def test_enqueue_from_foreign_loop_hands_off_to_worker_loop(monkeypatch, failed_run):
+    """Aus einem anderen Thread/Loop landet die Meldung in der Queue des Worker-Loops."""
+    import threading
+
+    handled = []
+
+    async def fake_send(run, status):
+        handled.append(threading.current_thread().name)
+
+    monkeypatch.setattr(notifications, "_send_notifications_async", fake_send)
+    ready, done = threading.Event(), threading.Event()
+
+    async def main_loop():
+        notifications.start_notification_workers()
+        ready.set()
+        while not done.is_set():
+            await asyncio.sleep(0.01)
+        await notifications.stop_notification_workers()
+
+    main = threading.Thread(target=asyncio.run, args=(main_loop(),), name="main-loop")
+    main.start()
+    ready.wait(5)
+
+    async def from_scheduler_thread():
+        notifications._enqueue_notification(failed_run, RunStatus.FAILED)
+
+    asyncio.run(from_scheduler_thread())
+    done.set()
+    main.join(5)
+
+    assert handled == ["main-loop"]
+
+
+@pytest.mark.parametrize(
+    "port, use_tls, start_tls",
+    [(465, True, False), (587, False, True), (25, False, False)],
+)
+def test_smtp_client_tls_mode_follows_port(monkeypatch, port, use_tls, start_tls):
+    """465 = implizites TLS, 587 = STARTTLS, andere Ports unverschlüsselt."""
+    monkeypatch.setattr(config, "SMTP_HOST", "smtp.example")
+    monkeypatch.setattr(config, "SMTP_PORT", port)
+
+    smtp = notifications._create_smtp_client()
+
+    assert smtp.use_tls is use_tls
+    assert smtp._start_tls_on_connect is start_tls
+
+
+def test_smtp_port_25_skips_offered_starttls(monkeypatch):
+    """Ein Relay auf Port 25, das STARTTLS anbietet, wird nicht auf TLS umgestellt."""
+    monkeypatch.setattr(config, "SMTP_HOST", "relay.internal")
+    monkeypatch.setattr(config, "SMTP_PORT", 25)
+    smtp = notifications._create_smtp_client()
+    upgrades = []
+
+    async def starttls(*args, **kwargs):
+        upgrades.append(True)
+
+    async def ehlo_if_needed():
+        pass
+
+    monkeypatch.setattr(smtp, "supports_extension", lambda name: name.lower() == "starttls")
+    monkeypatch.setattr(smtp, "starttls", starttls)
+    monkeypatch.setattr(smtp, "_ehlo_or_helo_if_needed", ehlo_if_needed)
+
+    asyncio.run(smtp._maybe_start_tls_on_connect())
+
+    assert upgrades == []
+
+
+def test_smtp_login_without_tls_is_logged(fake_smtp, monkeypatch, caplog):
+    """Login über eine unverschlüsselte Verbindung fällt nicht still auf Klartext zurück."""
+    monkeypatch.setattr(config, "SMTP_USER", "user")
+    monkeypatch.setattr(config, "SMTP_PASSWORD", "secret")
+    monkeypatch.setattr(_FakeSMTP, "get_transport_info", lambda self, key: None, raising=False)
+
+    with caplog.at_level("WARNING", logger="app.services.notifications"):
+        asyncio.run(notifications._connect_smtp())
+
+    assert any("ohne TLS" in r.getMessage() for r in caplog.records)
+
+
+def test_post_teams_webhook_short_circuits_after_repeated_failures(monkeypatch):
+    """Nach failure_threshold Fehlern wird der Webhook bis zum Recovery nicht mehr aufgerufen."""
+    from app.resilience.resilience import CircuitBreaker, CircuitBreakerOpenError
+
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(503)
+
+    monkeypatch.setattr(config, "TEAMS_WEBHOOK_URL", "https://example.webhook.office.com/hook")
+    monkeypatch.setattr(notifications, "_validate_webhook_url", lambda url: None)
+    monkeypatch.setattr(
+        notifications, "circuit_teams", CircuitBreaker("teams-test", failure_threshold=2, recovery_timeout=60.0)
+    )
+
+    async def post_until_open():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(notifications, "_teams_client", client)
+        monkeypatch.setattr(notifications, "_teams_client_loop", asyncio.get_running_loop())
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await notifications._post_teams_webhook({"title": "x"})
+        with pytest.raises(CircuitBreakerOpenError):
+            await notifications._post_teams_webhook({"title": "x"})
+        await notifications.close_notification_clients()
+
+    asyncio.run(post_until_open())
+    assert len(requests) == 2
+
+
+def test_background_alerts_retry_transient_smtp_errors(monkeypatch, failed_run):
+    """Soft-Limit-Alerts werden bei Verbindungsfehlern erneut versucht statt verworfen."""
+    monkeypatch.setattr(config, "EMAIL_ENABLED", True)
+    monkeypatch.setattr(config, "TEAMS_ENABLED", False)
+    monkeypatch.setattr(config, "SMTP_FROM", "ff@example.com")
+    monkeypatch.setattr(config, "EMAIL_RECIPIENTS", ["a@x"])
+    monkeypatch.setattr(notifications, "_NOTIFY_RETRY_MIN_WAIT", 0.0)
+    attempts = []
+
+    async def flaky_send(message):
+        attempts.append(message["Subject"])
+        if len(attempts) == 1:
+            raise aiosmtplib.SMTPServerDisconnected("reset")
+
+    monkeypatch.setattr(notifications, "_send_smtp_message", flaky_send)
+
+    asyncio.run(notifications.send_soft_limit_notification(failed_run, "RAM", 900.0, 512.0))
+
+    assert len(attempts) == 2
+
+
+def test_message_card_layout():
+    """Alle Teams-Karten teilen ein Gerüst; der OpenUri-Button ist optional."""
+    facts = [{"title": "Fehler", "value": "boom"}]
+
+    card = notifications._message_card("s", "t", "F44336", "Pipeline: etl", facts)
+    assert card == {
+        "@type": "MessageCard",
+        "@context": "https://schema.org/extensions",
+        "summary": "s",
+        "themeColor": "F44336",
+        "title": "t",
+        "sections": [{"activityTitle": "Pipeline: etl", "facts": facts, "markdown": True}],
+    }
+
+    with_action = notifications._message_card("s", "t", "F44336", "a", facts, action=("Öffnen", "https://x/runs/1"))
+    assert with_action["potentialAction"] == [
+        {"@type": "OpenUri", "name": "Öffnen", "targets": [{"os": "default", "uri": "https://x/runs/1"}]}
+    ]
+
+
+def test_send_email_notification_plain_text_only_when_html_disabled(monkeypatch, failed_run):
+    """Mit EMAIL_HTML_ENABLED=false geht nur der Text-Teil als einfache Mail raus."""
+    monkeypatch.setattr(config, "EMAIL_ENABLED", True)
+    monkeypatch.setattr(config, "EMAIL_HTML_ENABLED", False)
+    monkeypatch.setattr(config, "SMTP_HOST", "smtp.example")
+    monkeypatch.setattr(config, "SMTP_FROM", "ff@example.com")
+    monkeypatch.setattr(config, "EMAIL_RECIPIENTS", ["a@x"])
+    sent = []
+
+    async def fake_send(message):
+        sent.append(message)
+
+    monkeypatch.setattr(notifications, "_send_smtp_message", fake_send)
+
+    asyncio.run(notifications.send_email_notification(failed_run, RunStatus.FAILED))
+
+    message = sent[0]
+    assert not message.is_multipart()
+    assert message.get_content_type() == "text/plain"
+    assert "Pipeline: etl" in message.get_payload(decode=True).decode("utf-8")
+
+
+def test_frontend_link_prefers_frontend_url_and_strips_slash(monkeypatch):
+    """Links nutzen FRONTEND_URL, sonst BASE_URL, ohne doppelten Slash."""
+    monkeypatch.setattr(config, "FRONTEND_URL", "https://ff.example/")
+    monkeypatch.setattr(config, "BASE_URL", "https://api.example")
+    assert notifications._frontend_link("/runs/1") == "https://ff.example/runs/1"
+
+    monkeypatch.setattr(config, "FRONTEND_URL", None)
+    assert notifications._frontend_link("/dependencies") == "https://api.example/dependencies"
+
+    monkeypatch.setattr(config, "BASE_URL", "")
+    assert notifications._frontend_link("/runs/1") is None
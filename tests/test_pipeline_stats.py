@@ -0,0 +1,32 @@
+"""
+Tests für die Zähler-Updates beim Run-Ende (app.executor.core._update_pipeline_stats).
+"""
+
+import asyncio
+from datetime import date
+
+from app.executor.core import _update_pipeline_stats
+from app.models import Pipeline, PipelineDailyStat
+
+
+def test_update_pipeline_stats_increments_counters_and_daily_upsert(test_session):
+    """Pipeline-Zähler und Tagesstatistik werden atomar erhöht (Upsert bei zweitem Run)."""
+    test_session.add(Pipeline(pipeline_name="stats"))
+    test_session.commit()
+    day = date(2026, 1, 2)
+
+    asyncio.run(_update_pipeline_stats("stats", True, test_session, triggered_by="webhook", run_date=day))
+    asyncio.run(_update_pipeline_stats("stats", False, test_session, triggered_by="manual", run_date=day))
+
+    test_session.expire_all()
+    pipeline = test_session.get(Pipeline, "stats")
+    assert (pipeline.total_runs, pipeline.successful_runs, pipeline.failed_runs) == (2, 1, 1)
+    assert pipeline.webhook_runs == 1
+    daily = test_session.get(PipelineDailyStat, ("stats", day))
+    assert (daily.total_runs, daily.successful_runs, daily.failed_runs) == (2, 1, 1)
+
+
+def test_update_pipeline_stats_without_pipeline_row_is_noop(test_session):
+    """Fehlt die Pipeline-Zeile, trifft das UPDATE keine Zeile und wirft nicht."""
+    asyncio.run(_update_pipeline_stats("missing", True, test_session))
+    assert test_session.get(Pipeline, "missing") is None
@@ -0,0 +1,56 @@
+"""
+Tests für den SystemSettings-Cache (app.services.system_settings).
+"""
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.models import OrchestratorSettings, SystemSettings
+from app.services.system_settings import (
+    get_system_settings,
+    get_system_settings_cached,
+    invalidate_system_settings_cache,
+)
+
+
+def test_cached_settings_are_read_once_until_invalidated(test_session):
+    """Der Cache liefert einen losgelösten Snapshot; erst nach Invalidierung neu gelesen."""
+    ss = get_system_settings(test_session)
+    ss.ui_show_version = True
+    test_session.commit()
+
+    cached = get_system_settings_cached(test_session)
+    assert cached.ui_show_version is True
+    assert cached not in test_session
+
+    ss.ui_show_version = False
+    test_session.commit()
+    assert get_system_settings_cached(test_session) is cached
+
+    invalidate_system_settings_cache()
+    assert get_system_settings_cached(test_session).ui_show_version is False
+
+
+def test_ui_display_reflects_system_settings_update(
+    authenticated_client, test_session, test_user, monkeypatch
+):
+    """PUT /settings/system invalidiert den Cache, /ui-display zeigt sofort den neuen Wert."""
+    from app.api import settings as settings_api
+    from app.auth import require_admin
+    from app.main import app
+
+    monkeypatch.setattr(settings_api, "log_audit", lambda *args, **kwargs: None)
+    monkeypatch.setitem(app.dependency_overrides, require_admin, lambda: test_user)
+    assert authenticated_client.get("/api/settings/ui-display").json()["ui_show_version"] is True
+
+    response = authenticated_client.put("/api/settings/system", json={"ui_show_version": False})
+    assert response.status_code == 200
+    assert authenticated_client.get("/api/settings/ui-display").json()["ui_show_version"] is False
+    assert test_session.get(SystemSettings, 1).ui_show_version is False
+
+
+def test_settings_tables_reject_second_row(test_session):
+    """CHECK(id = 1) erzwingt das Singleton auf DB-Ebene."""
+    test_session.add(OrchestratorSettings(id=2))
+    with pytest.raises(IntegrityError):
+        test_session.commit()